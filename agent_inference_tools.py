@@ -7,9 +7,19 @@ from manim import (
 )
 import numpy as np  # needed for vector math
 
+from render_sections import SectionCacheMixin
+from frame_profiler import FrameProfilerMixin
+from dependency_updaters import DependencyTrackingMixin
+from scene_layout import tool_label, tool_offsets
+
 
 # 3D scene: token flow -> pause -> tool calls -> results -> resume
-class InceptionToolUse3D(ThreeDScene):
+class InceptionToolUse3D(DependencyTrackingMixin, FrameProfilerMixin, SectionCacheMixin, ThreeDScene):
+    # Scene knobs (bench_agent_scenes.py overrides them in subclasses)
+    n_blocks = 6
+    n_tokens = 15
+    n_tools = 3
+
     def construct(self):
         self.camera.background_color = "#0b0f14"
         self.set_camera_orientation(phi=70 * DEGREES, theta=60 * DEGREES, zoom=1.0)
@@ -73,7 +83,8 @@ class InceptionToolUse3D(ThreeDScene):
             )
 
         # ------------ Layout ------------
-        n_blocks = 6
+        self.cached_section("layout")
+        n_blocks = self.n_blocks
         x0 = -5.0
         dx = 2.0
         blocks = VGroup()
@@ -92,7 +103,7 @@ class InceptionToolUse3D(ThreeDScene):
         rail.move_to(np.array([(x0 + (n_blocks - 1) * dx) / 2, -0.25, 0.0]))
         self.play(FadeIn(rail), run_time=0.5)
 
-        n_tokens = 15
+        n_tokens = self.n_tokens
         token_spacing = 0.35
         tokens = VGroup(*[sphere_pulse("#34d399", r=0.06) for _ in range(n_tokens)])
         for k, s in enumerate(tokens):
@@ -102,22 +113,24 @@ class InceptionToolUse3D(ThreeDScene):
         center_block_idx = n_blocks // 2
         center_pos = blocks[center_block_idx].get_center()
 
-        tools = VGroup(
-            make_tool_node("Search API", center_pos + np.array([-1.8, -1.2, -1.6]), color="#0c4a3e"),
-            make_tool_node("DB Query", center_pos + np.array([0.0, -1.8, -2.0]), color="#12395b"),
-            make_tool_node("Code Exec", center_pos + np.array([1.8, -1.2, -1.6]), color="#44235b"),
-        )
+        tool_colors = ["#0c4a3e", "#12395b", "#44235b"]
+        tools = VGroup(*[
+            make_tool_node(tool_label(i), center_pos + offset, color=tool_colors[i % 3])
+            for i, offset in enumerate(tool_offsets(self.n_tools))
+        ])
 
         # Make the labels billboard to the camera (no flipping/inversion)
         for t in tools:
             # t[1] is the tag VGroup (Text + background), t[2] is the connector
             self.add_fixed_orientation_mobjects(t[1])
-            # Keep connector re-anchored if camera moves
-            t[2].add_updater(
+            # Keep connector re-anchored when the ring or the label moves
+            self.add_dependent_updater(
+                t[2],
                 lambda m, t=t: m.put_start_and_end_on(
                     t[1].get_center() + 0.1 * DOWN,  # start near label
                     t[0].get_center(),  # end at ring center
-                )
+                ),
+                t[0], t[1],
             )
 
         self.play(*[FadeIn(t, shift=DOWN * 0.2) for t in tools], run_time=0.8)
@@ -136,11 +149,10 @@ class InceptionToolUse3D(ThreeDScene):
             cyl.move_to((p1 + p2) / 2)
             return cyl
 
-        link_lines = VGroup(
-            connector(center_pos + np.array([0, -0.25, 0]), tools[0][0].get_center(), color="#1b2a35"),
-            connector(center_pos + np.array([0, -0.25, 0]), tools[1][0].get_center(), color="#1b2a35"),
-            connector(center_pos + np.array([0, -0.25, 0]), tools[2][0].get_center(), color="#1b2a35"),
-        ).set_opacity(0.35)
+        link_lines = VGroup(*[
+            connector(center_pos + np.array([0, -0.25, 0]), t[0].get_center(), color="#1b2a35")
+            for t in tools
+        ]).set_opacity(0.35)
         self.play(FadeIn(link_lines), run_time=0.5)
 
         # Token motion (attach updater to tokens, not the Scene)
@@ -154,6 +166,7 @@ class InceptionToolUse3D(ThreeDScene):
         self.wait(1.6)
 
         # Pause
+        self.cached_section("pause_ui")
         tokens.remove_updater(shift_tokens)
         pause_plate = RoundedRectangle(
             width=1.1,
@@ -175,6 +188,7 @@ class InceptionToolUse3D(ThreeDScene):
         self.play(FadeIn(caption1), run_time=0.4)
 
         # Outgoing pulses
+        self.cached_section("outgoing_pulses")
         def make_pulse_anim(p1, p2, color):
             dot = Sphere(radius=0.06, fill_opacity=1, fill_color=color, stroke_width=0.5, stroke_color=WHITE)
             dot.move_to(p1)
@@ -187,51 +201,51 @@ class InceptionToolUse3D(ThreeDScene):
         c_origin = center_pos + np.array([0, -0.25, 0])
         p_out = []
         for i, tool in enumerate(tools):
-            color = ["#34d399", "#60a5fa", "#c084fc"][i]
+            color = ["#34d399", "#60a5fa", "#c084fc"][i % 3]
             dot, up = make_pulse_anim(c_origin, tool[0].get_center(), color)
             p_out.append((dot, up))
             self.add(dot)
 
         self.play(
-            UpdateFromAlphaFunc(p_out[0][0], p_out[0][1]),
-            UpdateFromAlphaFunc(p_out[1][0], p_out[1][1]),
-            UpdateFromAlphaFunc(p_out[2][0], p_out[2][1]),
+            *[UpdateFromAlphaFunc(dot, up) for dot, up in p_out],
             run_time=1.2,
             rate_func=smooth,
         )
 
         # Tool glows
+        self.cached_section("tool_glows")
         glows = VGroup(
             *[
                 SurroundingRectangle(t[0], color=c, buff=0.08).set_stroke(width=3).set_fill(opacity=0)
-                for t, c in zip(tools, ["#2dd4bf", "#93c5fd", "#e9d5ff"])
+                for t, c in zip(tools, ["#2dd4bf", "#93c5fd", "#e9d5ff"] * len(tools))
             ]
         )
         self.play(*[Create(g) for g in glows], run_time=0.5)
         self.play(*[FadeOut(g) for g in glows], run_time=0.4)
 
         # Incoming pulses
+        self.cached_section("incoming_pulses")
         p_in = []
         for i, tool in enumerate(tools):
-            color = ["#10b981", "#3b82f6", "#a855f7"][i]
+            color = ["#10b981", "#3b82f6", "#a855f7"][i % 3]
             dot, up = make_pulse_anim(tool[0].get_center(), c_origin, color)
             p_in.append((dot, up))
             self.add(dot)
 
         self.play(
-            UpdateFromAlphaFunc(p_in[0][0], p_in[0][1]),
-            UpdateFromAlphaFunc(p_in[1][0], p_in[1][1]),
-            UpdateFromAlphaFunc(p_in[2][0], p_in[2][1]),
+            *[UpdateFromAlphaFunc(dot, up) for dot, up in p_in],
             run_time=1.4,
             rate_func=smooth,
         )
 
         # Integrate pulse
+        self.cached_section("halo")
         halo = SurroundingRectangle(blocks[center_block_idx][0], color=YELLOW_C, buff=0.15).set_stroke(width=5).set_fill(opacity=0)
         self.play(Create(halo), FadeOut(pause_icon), FadeOut(caption1), run_time=0.6)
         self.play(FadeOut(halo), run_time=0.4)
 
         # Resume
+        self.cached_section("resume")
         tokens.add_updater(shift_tokens)
         caption2 = Text(
             "Tool outputs integrated → inference resumes (token stream continues)",
@@ -3,57 +3,77 @@
 # Passes implemented: A) fake depth/shadows, B) curved routed paths, C) livelier token stream
 
 from manim import (
-    ThreeDScene, Prism, Square, VGroup, Rectangle, Torus, Text, Sphere, Cylinder,
+    ThreeDScene, Prism, Square, VGroup, Rectangle, Torus, Cylinder,
     RoundedRectangle, SurroundingRectangle, FadeIn, FadeOut, Create, UpdateFromAlphaFunc,
-    DEGREES, TAU, BLUE_E, WHITE, GREY_A, YELLOW_B, YELLOW_C,
-    RIGHT, LEFT, UP, DOWN, IN, OUT, smooth, BackgroundRectangle, Line, Circle, CubicBezier, always_redraw
+    DEGREES, YELLOW_B, YELLOW_C,
+    RIGHT, LEFT, UP, DOWN, IN, OUT, smooth, BackgroundRectangle, Line,
+    interpolate_color, ManimColor, logger,
 )
 import numpy as np
 import random
 
+from token_stream import TokenStream
+from shadow_layer import ShadowLayer
+from geometry_cache import GEOMETRY_CACHE
+from text_cache import TEXT_CACHE
+from pulses import FanOutPulses
+from render_sections import SectionCacheMixin
+from frame_profiler import FrameProfilerMixin
+from fast_camera import IncrementalDepthCamera
+from dependency_updaters import DependencyTrackingMixin
+from static_batch import StaticBatchMixin
+from billboards import BillboardMixin
+from lod import LevelOfDetail
+from scene_layout import THEME, tool_label, tool_offsets
+
+
+class InceptionToolUse3D(BillboardMixin, StaticBatchMixin, DependencyTrackingMixin, FrameProfilerMixin, SectionCacheMixin, ThreeDScene):
+    # Scene knobs (bench_agent_scenes.py overrides them in subclasses)
+    n_blocks = 6
+    n_tokens = 15
+    n_tools = 3
+    lod_budget = None   # faces per frame; None = quality-tier default, 0 = no decorative layers
+
+    # ======================= THEME =======================
+    # every color the scene uses by name; theme_batch.py renders colorways of it in one pass
+    theme = dict(THEME)
+
+    def __init__(self, camera_class=IncrementalDepthCamera, **kwargs):
+        # slow ambient rotation: keep the painter's order between frames instead of re-sorting
+        super().__init__(camera_class=camera_class, **kwargs)
 
-class InceptionToolUse3D(ThreeDScene):
     def construct(self):
-        # ======================= THEME & TOGGLES =======================
-        DETAIL_LEVEL = 1   # 0 = minimal (fast), 1 = default
-        THEME = dict(
-            bg="#0b0f14",
-            block_fill="#16324d",
-            block_edge=BLUE_E,
-            block_face="#102331",
-            rail="#0e2233",
-            link="#1b2a35",
-            label_text=GREY_A,
-            label_bg="#0c1218",
-            token="#34d399",          # normal token
-            token_hot="#22d3ee",      # emphasized token color used briefly
-            tool_colors=["#0c4a3e", "#12395b", "#44235b"],
-            tool_glow=["#2dd4bf", "#93c5fd", "#e9d5ff"],
-            pulse_out=["#34d399", "#60a5fa", "#c084fc"],
-            pulse_in=["#10b981", "#3b82f6", "#a855f7"],
-            caption=GREY_A,
-            shadow="#000000",
-        )
+        THEME = self.theme
+
+        TEXT_CACHE.reset_stats()  # report time saved for this render only
 
         # World & camera
         self.camera.background_color = THEME["bg"]
         self.set_camera_orientation(phi=70 * DEGREES, theta=60 * DEGREES, zoom=1.0)
         self.begin_ambient_camera_rotation(rate=0.05)
 
+        # Level of detail (replaces the old DETAIL_LEVEL toggle): tessellation follows each
+        # object's size on screen, decorative layers are drawn while the frame budget allows
+        lod = LevelOfDetail(self.camera, frame_budget=self.lod_budget)
+
         # ======================= HELPERS =======================
-        def make_block(pos, w=1.6, h=1.0, d=1.0, color=THEME["block_fill"]):
-            block = Prism(
+        def make_block(pos, w=1.6, h=1.0, d=1.0, color=THEME["block_fill"], stroke_width=1.5):
+            block = GEOMETRY_CACHE.get(
+                Prism,
                 dimensions=(w, h, d),
                 fill_opacity=1.0,
                 fill_color=color,
                 stroke_color=THEME["block_edge"],
-                stroke_width=1.5,
+                stroke_width=stroke_width,
             ).move_to(pos)
 
             # Faux front face panel
             face = Square(side_length=0.95 * w, stroke_width=0).set_fill(THEME["block_face"], opacity=0.9)
             face.move_to(block.get_center() + OUT * (d / 2 + 0.001))
 
+            if not lod.enabled("face_bars"):
+                return VGroup(block, face)
+
             # Little "bar chart" on the face
             bars = VGroup(
                 Rectangle(width=0.08 * w, height=0.5 * h, fill_opacity=1, fill_color="#26a69a", stroke_width=0),
@@ -63,26 +83,12 @@ class InceptionToolUse3D(ThreeDScene):
 
             return VGroup(block, face, bars)
 
-        def make_shadow(target_getter, kind="rect", base_opacity=0.18, scale=1.0, y_offset=-0.32):
-            """
-            Returns an always_redraw Circle used as a soft "ground shadow".
-            target_getter(): function with no args that returns a point (x,y,z) to follow.
-            kind kept for future (all use Circle scaled to an ellipse).
-            """
-            def _factory():
-                p = target_getter()
-                s = Circle(radius=0.35 * scale, stroke_width=0).set_fill(THEME["shadow"], opacity=base_opacity)
-                s.stretch(1.8 * scale, 0)   # widen in x
-                s.stretch(0.6 * scale, 1)   # flatten in y
-                s.move_to(np.array([p[0], y_offset, 0.0]))
-                return s
-
-            return always_redraw(_factory)
-
-        def make_tool_node(label, pos, radius=0.5, color="#14532d"):
-            ring = Torus(
+        def make_tool_node(label, pos, radius=0.5, color="#14532d", resolution=(24, 24)):
+            ring = GEOMETRY_CACHE.get(
+                Torus,
                 major_radius=radius,
                 minor_radius=0.12,
+                resolution=resolution,
                 fill_opacity=1,
                 fill_color=color,
                 stroke_color="#1a9e67",
@@ -90,7 +96,7 @@ class InceptionToolUse3D(ThreeDScene):
             ).move_to(pos)
 
             # Label that always faces camera (billboarding later)
-            tag_text = Text(label, font="DejaVu Sans").scale(0.35).set_color(THEME["label_text"])
+            tag_text = TEXT_CACHE.text(label, font="DejaVu Sans", scale=0.35).set_color(THEME["label_text"])
             tag_bg = BackgroundRectangle(tag_text, fill_opacity=0.6, fill_color=THEME["label_bg"], buff=0.06)
             tag = VGroup(tag_text, tag_bg)
             tag.move_to(ring.get_center() + 0.25 * OUT + 0.18 * UP)
@@ -104,20 +110,13 @@ class InceptionToolUse3D(ThreeDScene):
 
             return VGroup(ring, tag, connector)
 
-        def sphere_token(color, r=0.08):
-            return Sphere(
-                radius=r,
-                resolution=(16, 16),
-                fill_opacity=1,
-                fill_color=color,
-                stroke_width=0.5,
-                stroke_color=WHITE,
-            )
-
-        def connector_cylinder(p1, p2, color=THEME["link"]):
+        def connector_cylinder(p1, p2, color=THEME["link"], resolution=(24, 24)):
             v = p2 - p1
             L = np.linalg.norm(v) or 1e-6
-            cyl = Cylinder(radius=0.025, height=L, fill_opacity=1, fill_color=color, stroke_width=0)
+            cyl = GEOMETRY_CACHE.get(
+                Cylinder, radius=0.025, height=L, resolution=resolution,
+                fill_opacity=1, fill_color=color, stroke_width=0,
+            )
             v_hat = v / L
             axis = np.cross([0, 0, 1], v_hat)
             n = np.linalg.norm(axis)
@@ -128,173 +127,147 @@ class InceptionToolUse3D(ThreeDScene):
             cyl.move_to((p1 + p2) / 2)
             return cyl
 
-        def curved_path(p_start, p_end, arch_out=0.8, arch_down=0.6):
-            """
-            A 3D cubic Bezier path arcing outwards and slightly down for depth.
-            Control points produce a clean S-curve that avoids straight lines.
-            """
-            p1 = np.array(p_start)
-            p4 = np.array(p_end)
-            mid = 0.5 * (p1 + p4)
-
-            # Vector perpendicular-ish to introduce an outward arch
-            v = p4 - p1
-            if np.linalg.norm(v) < 1e-6:
-                v = np.array([1.0, 0.0, 0.0])
-
-            # pick a sideways dir roughly vertical/OUT
-            side = np.cross(v, np.array([0.0, 0.0, 1.0]))
-            if np.linalg.norm(side) < 1e-6:
-                side = np.array([0.0, 1.0, 0.0])
-            side = side / np.linalg.norm(side)
-
-            c1 = p1 + 0.25 * v + arch_out * side + arch_down * DOWN
-            c2 = p4 - 0.25 * v + arch_out * side + arch_down * DOWN
-
-            return CubicBezier(p1, c1, c2, p4).set_stroke(width=1.5, color=THEME["link"]).set_opacity(0.25)
-
-        def make_pulse_along_bezier(bezier_mobj, color="#ffffff", r=0.06):
-            """
-            Returns (dot, updater) to move a small Sphere along a CubicBezier in [0,1].
-            """
-            dot = Sphere(radius=r, fill_opacity=1, fill_color=color, stroke_width=0.5, stroke_color=WHITE)
-
-            def updater(m, alpha):
-                # alpha in [0,1]; point_from_proportion works with VMobject
-                m.move_to(bezier_mobj.point_from_proportion(alpha))
-
-            return dot, updater
-
         # ======================= LAYOUT =======================
-        n_blocks = 6
+        self.cached_section("layout")
+        n_blocks = self.n_blocks
+        n_tools = self.n_tools
         x0 = -5.0
         dx = 2.0
         z_stagger = [0.15, 0.05, 0.0, -0.02, 0.04, 0.12]  # subtle depth offsets
+        n_tokens = self.n_tokens
 
-        blocks = VGroup()
-        for i in range(n_blocks):
-            p = np.array([x0 + i * dx, 0.0, 0.0 + z_stagger[i % len(z_stagger)]])
-            blocks.add(make_block(pos=p))
+        block_positions = [
+            np.array([x0 + i * dx, 0.0, 0.0 + z_stagger[i % len(z_stagger)]]) for i in range(n_blocks)
+        ]
+        center_block_idx = n_blocks // 2
+        center_pos = block_positions[center_block_idx]
+        tool_positions = [center_pos + offset for offset in tool_offsets(n_tools)]
+        c_origin = center_pos + np.array([0, -0.25, 0])
+        rail_center = np.array([(x0 + (n_blocks - 1) * dx) / 2, -0.25, 0.0])
+        rail_length = (n_blocks - 1) * dx + 1.2
+
+        # LOD choices for this quality tier and camera view
+        token_res = lod.sphere_resolution("tokens", [x0, -0.25, 0.0], 0.06, full=(16, 16), count=n_tokens)
+        ring_res = lod.torus_resolution("tool_rings", tool_positions[n_tools // 2], 0.5, 0.12, count=n_tools)
+        rail_res = lod.cylinder_resolution(
+            "rail", rail_center - rail_length / 2 * RIGHT, rail_center + rail_length / 2 * RIGHT, 0.05,
+        )
+        link_res = lod.cylinder_resolution(
+            "link_cylinders", c_origin, tool_positions[n_tools // 2], 0.025, count=n_tools, layer="link_cylinders",
+        )
+        block_stroke = lod.edge_stroke("block_edges", center_pos, 1.6, 1.5)
+        lod.decide_layers([               # priority order
+            ("block_shadows", n_blocks),
+            ("link_cylinders", 0),
+            ("face_bars", 3 * n_blocks),
+            ("token_shadows", n_tokens),
+        ])
+
+        blocks = VGroup(*[make_block(pos=p, stroke_width=block_stroke) for p in block_positions])
         self.play(*[FadeIn(b, shift=IN * 0.2) for b in blocks], run_time=1.4)
 
-        # Ground shadows for blocks
-        if DETAIL_LEVEL >= 1:
-            block_shadows = VGroup(
-                *[
-                    make_shadow(lambda b=b: b.get_center(), scale=1.2)
-                    for b in blocks
-                ]
+        # Ground shadows for blocks (one persistent layer, updated in place)
+        if lod.enabled("block_shadows"):
+            block_shadows = ShadowLayer(
+                lambda: np.array([b.get_center() for b in blocks]),
+                scale=1.2,
+                color=THEME["shadow"],
+                auto_update=False,
             )
+            self.add_dependent_updater(block_shadows, lambda m: m.refresh(), blocks)
             self.add(block_shadows)
 
         # Rail
-        rail = Cylinder(
+        rail = GEOMETRY_CACHE.get(
+            Cylinder,
             radius=0.05,
-            height=(n_blocks - 1) * dx + 1.2,
+            height=rail_length,
             direction=RIGHT,
+            resolution=rail_res,
             fill_opacity=1,
             fill_color=THEME["rail"],
             stroke_width=0,
         )
-        rail.move_to(np.array([(x0 + (n_blocks - 1) * dx) / 2, -0.25, 0.0]))
+        rail.move_to(rail_center)
         self.play(FadeIn(rail), run_time=0.5)
+        # blocks and rail don't move from here on: draw them from merged meshes (unfrozen if animated)
+        self.freeze(*blocks, rail)
 
-        # Tokens with micro-variation
-        n_tokens = 15
+        # Tokens with micro-variation (array-backed: positions/speeds/phases live in NumPy arrays)
         token_spacing = 0.35
-        tokens = VGroup()
-        token_meta = []  # per-token dicts: speed, yjit, zjit, scale
-
-        rng = random.Random(42)
-        for k in range(n_tokens):
-            s = sphere_token(THEME["token"], r=0.06 * rng.uniform(0.95, 1.05))
-            base_x = x0 - 0.8 - k * token_spacing
-            base_y = -0.25 + rng.uniform(-0.01, 0.01)  # tiny y jitter
-            base_z = rng.uniform(-0.02, 0.02)          # tiny z jitter
-            s.move_to(np.array([base_x, base_y, base_z]))
-            tokens.add(s)
-
-            token_meta.append(dict(
-                speed=rng.uniform(1.45, 1.75),   # slight velocity differences
-                yjit=rng.uniform(0.002, 0.006),
-                zjit=rng.uniform(0.002, 0.006),
-                phase=rng.uniform(0, TAU),
-                base_r=s.radius,
-            ))
+        x_wrap = x0 + (n_blocks - 1) * dx + 0.8
+        total_span = (n_blocks - 1) * dx + 2.0
+
+        self.rng = rng = random.Random(42)   # on the scene so checkpoints record its state
+        tokens = TokenStream(
+            n_tokens,
+            x_start=x0 - 0.8,
+            spacing=token_spacing,
+            x_wrap=x_wrap,
+            total_span=total_span,
+            y_base=-0.25,
+            radius=0.06,
+            color=THEME["token"],
+            resolution=token_res,
+            rng=rng,
+        )
 
         self.add(tokens)
 
-        # Token ground shadows
-        if DETAIL_LEVEL >= 1:
-            token_shadows = VGroup(
-                *[
-                    make_shadow(lambda s=s: s.get_center(), scale=0.35, base_opacity=0.15)
-                    for s in tokens
-                ]
+        # Token ground shadows (read straight from the stream's position array)
+        if lod.enabled("token_shadows"):
+            token_shadows = ShadowLayer(
+                lambda: tokens.positions,
+                scale=0.35,
+                base_opacity=0.15,
+                color=THEME["shadow"],
+                auto_update=False,
             )
+            self.add_dependent_updater(token_shadows, lambda m: m.refresh(), tokens)
             self.add(token_shadows)
 
-        center_block_idx = n_blocks // 2
-        center_pos = blocks[center_block_idx].get_center()
+        tools = VGroup(*[
+            make_tool_node(tool_label(i), pos, color=THEME["tool_colors"][i % 3], resolution=ring_res)
+            for i, pos in enumerate(tool_positions)
+        ])
 
-        tools = VGroup(
-            make_tool_node("Search API", center_pos + np.array([-1.8, -1.2, -1.6]), color=THEME["tool_colors"][0]),
-            make_tool_node("DB Query",   center_pos + np.array([ 0.0, -1.8, -2.0]), color=THEME["tool_colors"][1]),
-            make_tool_node("Code Exec",  center_pos + np.array([ 1.8, -1.2, -1.6]), color=THEME["tool_colors"][2]),
-        )
-
-        # Billboard labels; connectors update to follow
+        # Billboard labels; connectors follow the ring and label only when those move
         for t in tools:
             self.add_fixed_orientation_mobjects(t[1])  # tag group
-            t[2].add_updater(
+            self.add_dependent_updater(
+                t[2],
                 lambda m, t=t: m.put_start_and_end_on(
                     t[1].get_center() + 0.1 * DOWN, t[0].get_center()
-                )
+                ),
+                t[0], t[1],
             )
 
         self.play(*[FadeIn(t, shift=DOWN * 0.2) for t in tools], run_time=0.8)
 
         # Faint straight link lines (kept, but subtle)
-        c_origin = center_pos + np.array([0, -0.25, 0])
-        link_lines = VGroup(
-            connector_cylinder(c_origin, tools[0][0].get_center(), color=THEME["link"]),
-            connector_cylinder(c_origin, tools[1][0].get_center(), color=THEME["link"]),
-            connector_cylinder(c_origin, tools[2][0].get_center(), color=THEME["link"]),
-        ).set_opacity(0.22)
-        self.play(FadeIn(link_lines), run_time=0.5)
+        if lod.enabled("link_cylinders"):
+            link_lines = VGroup(*[
+                connector_cylinder(c_origin, t[0].get_center(), color=THEME["link"], resolution=link_res)
+                for t in tools
+            ]).set_opacity(0.22)
+            self.play(FadeIn(link_lines), run_time=0.5)
+            self.freeze(link_lines)
+        else:
+            self.wait(0.5)  # same timeline in every tier
 
         # ======================= TOKEN MOTION (UPDATER) =======================
-        x_wrap = x0 + (n_blocks - 1) * dx + 0.8
-        total_span = (n_blocks - 1) * dx + 2.0
-
-        def shift_tokens(mobj, dt):
-            # micro-jitter over time
-            t_now = self.time
-            for i, s in enumerate(mobj):
-                meta = token_meta[i]
-                base_speed = meta["speed"]
-                # slow sine jitter to speed (±4%)
-                speed = base_speed * (1.0 + 0.04 * np.sin(t_now * 0.9 + meta["phase"]))
-                s.shift(RIGHT * dt * speed)
-
-                # gentle y/z oscillation
-                y0 = s.get_center()[1]
-                z0 = s.get_center()[2]
-                s.move_to(np.array([
-                    s.get_center()[0],
-                    -0.25 + meta["yjit"] * np.sin(t_now * 2.0 + meta["phase"]),
-                    0.0 + meta["zjit"] * np.cos(t_now * 1.7 + meta["phase"])
-                ]))
-
-                # wrap-around
-                if s.get_center()[0] > x_wrap:
-                    s.shift(LEFT * total_span)
+        def shift_tokens(mobj):
+            # one vectorized seek for the whole stream (speed jitter, y/z oscillation, wrap-around)
+            mobj.seek(self.time)
 
+        tokens.start_motion(self.time)
         tokens.add_updater(shift_tokens)
         self.wait(1.6)
 
         # ======================= PAUSE UI =======================
+        self.cached_section("pause_ui")
         tokens.remove_updater(shift_tokens)
+        tokens.stop_motion(self.time)
         pause_plate = RoundedRectangle(
             width=1.1, height=0.7, corner_radius=0.08,
             fill_opacity=1, fill_color="#17212b", stroke_color=YELLOW_B, stroke_width=2,
@@ -304,90 +277,90 @@ class InceptionToolUse3D(ThreeDScene):
         pause_icon = VGroup(pause_plate, bar1, bar2).move_to(center_pos + np.array([0, 0.0, 0.6]))
         self.play(FadeIn(pause_icon, shift=OUT * 0.2), run_time=0.5)
 
-        caption1 = Text("Policy pauses to decide tools (inference-time)", font="DejaVu Sans").scale(0.35).set_color(THEME["caption"])
+        caption1 = TEXT_CACHE.text(
+            "Policy pauses to decide tools (inference-time)", font="DejaVu Sans", scale=0.35,
+        ).set_color(THEME["caption"])
         self.add_fixed_orientation_mobjects(caption1)
         caption1.move_to(center_pos + np.array([0, 0.9, 0.6]))
         self.play(FadeIn(caption1), run_time=0.4)
 
         # ======================= CURVED PULSES (OUTGOING) =======================
-        out_paths = [
-            curved_path(c_origin, tools[0][0].get_center(), arch_out=0.8, arch_down=0.5),
-            curved_path(c_origin, tools[1][0].get_center(), arch_out=0.9, arch_down=0.6),
-            curved_path(c_origin, tools[2][0].get_center(), arch_out=1.0, arch_down=0.5),
-        ]
-        for p in out_paths:
-            self.add(p)
-
-        out_pulses = []
-        for i, path in enumerate(out_paths):
-            dot, up = make_pulse_along_bezier(path, color=THEME["pulse_out"][i], r=0.06)
-            out_pulses.append((dot, up))
-            self.add(dot)
-
+        self.cached_section("outgoing_pulses")
+        # one batched animation for the whole fan-out: every pulse moves in one vectorized step
+        arches = np.array([(0.8, 0.5), (0.9, 0.6), (1.0, 0.5)])[np.arange(n_tools) % 3]   # (arch_out, arch_down)
+        ring_centers = np.array([t[0].get_center() for t in tools])
+        fan_out = dict(
+            arch_out=arches[:, 0], arch_down=arches[:, 1], radius=0.06, resolution=token_res,
+            path_color=THEME["link"], rate_func=smooth,
+        )
         self.play(
-            UpdateFromAlphaFunc(out_pulses[0][0], out_pulses[0][1]),
-            UpdateFromAlphaFunc(out_pulses[1][0], out_pulses[1][1]),
-            UpdateFromAlphaFunc(out_pulses[2][0], out_pulses[2][1]),
-            run_time=1.3, rate_func=smooth,
+            FanOutPulses(c_origin, ring_centers, [THEME["pulse_out"][i % 3] for i in range(n_tools)], **fan_out),
+            run_time=1.3,
         )
 
         # Tool glows
+        self.cached_section("tool_glows")
         glows = VGroup(
             *[
-                SurroundingRectangle(t[0], color=c, buff=0.08).set_stroke(width=3).set_fill(opacity=0)
-                for t, c in zip(tools, THEME["tool_glow"])
+                SurroundingRectangle(t[0], color=THEME["tool_glow"][i % 3], buff=0.08).set_stroke(width=3).set_fill(opacity=0)
+                for i, t in enumerate(tools)
             ]
         )
         self.play(*[Create(g) for g in glows], run_time=0.45)
         self.play(*[FadeOut(g) for g in glows], run_time=0.35)
 
         # ======================= CURVED PULSES (INCOMING) =======================
-        in_paths = [
-            curved_path(tools[0][0].get_center(), c_origin, arch_out=0.8, arch_down=0.5),
-            curved_path(tools[1][0].get_center(), c_origin, arch_out=0.9, arch_down=0.6),
-            curved_path(tools[2][0].get_center(), c_origin, arch_out=1.0, arch_down=0.5),
-        ]
-        for p in in_paths:
-            self.add(p)
-
-        in_pulses = []
-        for i, path in enumerate(in_paths):
-            dot, up = make_pulse_along_bezier(path, color=THEME["pulse_in"][i], r=0.06)
-            in_pulses.append((dot, up))
-            self.add(dot)
-
+        self.cached_section("incoming_pulses")
         self.play(
-            UpdateFromAlphaFunc(in_pulses[0][0], in_pulses[0][1]),
-            UpdateFromAlphaFunc(in_pulses[1][0], in_pulses[1][1]),
-            UpdateFromAlphaFunc(in_pulses[2][0], in_pulses[2][1]),
-            run_time=1.4, rate_func=smooth,
+            FanOutPulses(ring_centers, c_origin, [THEME["pulse_in"][i % 3] for i in range(n_tools)], **fan_out),
+            run_time=1.4,
         )
 
         # Integrate pulse (halo)
+        self.cached_section("halo")
         halo = SurroundingRectangle(blocks[center_block_idx][0], color=YELLOW_C, buff=0.15).set_stroke(width=5).set_fill(opacity=0)
         self.play(Create(halo), FadeOut(pause_icon), FadeOut(caption1), run_time=0.6)
         self.play(FadeOut(halo), run_time=0.4)
 
         # ======================= RESUME: livelier stream =======================
+        self.cached_section("resume")
+        tokens.start_motion(self.time)
         tokens.add_updater(shift_tokens)
 
-        caption2 = Text(
+        caption2 = TEXT_CACHE.text(
             "Tool outputs integrated → inference resumes (token stream continues)",
             font="DejaVu Sans",
-        ).scale(0.35).set_color(THEME["caption"]).to_edge(DOWN)
+            scale=0.35,
+        ).set_color(THEME["caption"]).to_edge(DOWN)
         self.add_fixed_orientation_mobjects(caption2)
         self.play(FadeIn(caption2), run_time=0.4)
         self.wait(0.3)
 
         # Brief “energized” burst for the first few tokens
         hot_N = 6
-        self.play(*[s.animate.set_fill(THEME["token_hot"]) for s in tokens[:hot_N]], run_time=0.35)
+        # (color-only updates: .animate would Transform the points and detach them from the stream)
+        def fade_fill(c_from, c_to):
+            c_from, c_to = ManimColor(c_from), ManimColor(c_to)
+            return [
+                UpdateFromAlphaFunc(s, lambda m, a: m.set_fill(interpolate_color(c_from, c_to, a)))
+                for s in tokens[:hot_N]
+            ]
+
+        self.play(*fade_fill(THEME["token"], THEME["token_hot"]), run_time=0.35)
         self.wait(0.4)
-        self.play(*[s.animate.set_fill(THEME["token"]) for s in tokens[:hot_N]], run_time=0.35)
+        self.play(*fade_fill(THEME["token_hot"], THEME["token"]), run_time=0.35)
         self.wait(0.6)
 
         # Cleanup
         tokens.remove_updater(shift_tokens)
+        tokens.stop_motion(self.time)
         for t in tools:
             t[2].clear_updaters()
         self.wait(0.25)
+        logger.info("Geometry cache: %s", GEOMETRY_CACHE.stats())
+        logger.info("Text cache: %s", TEXT_CACHE.report())
+        if isinstance(self.camera, IncrementalDepthCamera):
+            logger.info("Depth sort: %s", self.camera.sort_report())
+            logger.info("Billboards: %s", self.camera.billboards.report())
+        logger.info("Static batch: %s", self.static_batch_report())
+        lod.log(frames=round(self.renderer.time * self.camera.frame_rate))
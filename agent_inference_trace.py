@@ -0,0 +1,164 @@
+# agent_inference_trace.py
+# Manim CE 0.19.x compatible
+# Trace-driven variant of InceptionToolUse3D: token flow, pauses and tool pulses replay a real JSONL trace
+#
+#   AGENT_TRACE=trace.jsonl AGENT_TRACE_DURATION=20 manim -ql agent_inference_trace.py InceptionTraceReplay3D
+
+from manim import (
+    ThreeDScene, Prism, VGroup, Rectangle, RoundedRectangle, Torus, Cylinder,
+    BackgroundRectangle, CubicBezier, FadeIn, DEGREES, YELLOW_B, YELLOW_C, linear,
+    RIGHT, LEFT, UP, OUT, config, logger,
+)
+import numpy as np
+import os
+import random
+
+from token_stream import TokenStream
+from geometry_cache import GEOMETRY_CACHE
+from text_cache import TEXT_CACHE
+from bezier_paths import arched_curves, attach_arc_length_table
+from pulses import PulseEmitter
+from frame_profiler import FrameProfilerMixin
+from fast_camera import IncrementalDepthCamera
+from billboards import BillboardMixin
+from scene_layout import THEME, tool_offsets
+from trace_replay import TraceTimeline
+
+
+class InceptionTraceReplay3D(BillboardMixin, FrameProfilerMixin, ThreeDScene):
+    # Scene knobs
+    trace_path = os.environ.get("AGENT_TRACE")
+    duration = float(os.environ.get("AGENT_TRACE_DURATION", 20.0))   # output seconds for the whole trace
+    n_blocks = 6
+    n_tokens = 24
+    max_tools = 6
+    pulses_per_tool = 4     # pulse pool: dots per tool and direction
+    pulse_time = 0.8        # seconds a pulse takes along its path
+
+    theme = dict(THEME)   # same palette (and theme_batch colorways) as the v2 scene
+
+    def __init__(self, camera_class=IncrementalDepthCamera, **kwargs):
+        # slow ambient rotation: keep the painter's order between frames instead of re-sorting
+        super().__init__(camera_class=camera_class, **kwargs)
+
+    def construct(self):
+        if not self.trace_path:
+            raise ValueError("Set AGENT_TRACE=<trace.jsonl> (see trace_replay.py for the format)")
+        timeline = TraceTimeline.from_jsonl(
+            self.trace_path, duration=self.duration, fps=config.frame_rate, max_tools=self.max_tools,
+        )
+        logger.info("Trace: %s", timeline.summary())
+
+        THEME = self.theme
+        self.camera.background_color = THEME["bg"]
+        self.set_camera_orientation(phi=70 * DEGREES, theta=60 * DEGREES, zoom=1.0)
+        self.begin_ambient_camera_rotation(rate=0.05)
+
+        # ======================= STATIC LAYOUT =======================
+        n_blocks, x0, dx = self.n_blocks, -5.0, 2.0
+        blocks = VGroup(*[
+            GEOMETRY_CACHE.get(
+                Prism, dimensions=(1.6, 1.0, 1.0), fill_opacity=1.0, fill_color=THEME["block_fill"],
+                stroke_color=THEME["block_edge"], stroke_width=1.5,
+            ).move_to([x0 + i * dx, 0.0, 0.0])
+            for i in range(n_blocks)
+        ])
+        rail = GEOMETRY_CACHE.get(
+            Cylinder, radius=0.05, height=(n_blocks - 1) * dx + 1.2, direction=RIGHT,
+            fill_opacity=1, fill_color=THEME["rail"], stroke_width=0,
+        ).move_to([(x0 + (n_blocks - 1) * dx) / 2, -0.25, 0.0])
+
+        center_pos = blocks[n_blocks // 2].get_center()
+        c_origin = center_pos + np.array([0, -0.25, 0])
+        n_tools = len(timeline.tools)
+        rings, labels = VGroup(), VGroup()
+        for i, (name, offset) in enumerate(zip(timeline.tools, tool_offsets(n_tools))):
+            ring = GEOMETRY_CACHE.get(
+                Torus, major_radius=0.5, minor_radius=0.12, fill_opacity=1,
+                fill_color=THEME["tool_colors"][i % 3], stroke_color="#1a9e67", stroke_width=1.5,
+            ).move_to(center_pos + offset)
+            text = TEXT_CACHE.text(name, font="DejaVu Sans", scale=0.35).set_color(THEME["label_text"])
+            tag = VGroup(text, BackgroundRectangle(text, fill_opacity=0.6, fill_color=THEME["label_bg"], buff=0.06))
+            tag.move_to(ring.get_center() + 0.25 * OUT + 0.18 * UP)
+            rings.add(ring)
+            labels.add(tag)
+
+        def link_path(curve):
+            path = CubicBezier(*curve).set_stroke(width=1.5, color=THEME["link"]).set_opacity(0.25)
+            return attach_arc_length_table(path)
+
+        ring_centers = np.array([r.get_center() for r in rings])
+        out_paths = [link_path(c) for c in arched_curves(c_origin, ring_centers, arch_out=0.9, arch_down=0.55)]
+        in_paths = [link_path(c) for c in arched_curves(ring_centers, c_origin, arch_out=-0.9, arch_down=0.55)]
+
+        self.play(FadeIn(blocks), FadeIn(rail), FadeIn(rings), FadeIn(VGroup(*out_paths, *in_paths)), run_time=0.8)
+        self.add_fixed_orientation_mobjects(*labels)
+        self.add(labels)
+
+        # ======================= TRACE-DRIVEN PARTS =======================
+        self.rng = random.Random(42)   # on the scene so checkpoints record its state
+        tokens = TokenStream(
+            self.n_tokens,
+            x_start=x0 - 0.8,
+            spacing=((n_blocks - 1) * dx + 2.0) / self.n_tokens,
+            x_wrap=x0 + (n_blocks - 1) * dx + 0.8,
+            total_span=(n_blocks - 1) * dx + 2.0,
+            y_base=-0.25,
+            radius=0.06,
+            color=THEME["token"],
+            rng=self.rng,
+        )
+
+        pause_icon = VGroup(
+            RoundedRectangle(
+                width=1.1, height=0.7, corner_radius=0.08,
+                fill_opacity=1, fill_color="#17212b", stroke_color=YELLOW_B, stroke_width=2,
+            ),
+            Rectangle(width=0.18, height=0.44, fill_opacity=1, fill_color=YELLOW_C, stroke_width=0).shift(LEFT * 0.18),
+            Rectangle(width=0.18, height=0.44, fill_opacity=1, fill_color=YELLOW_C, stroke_width=0).shift(RIGHT * 0.18),
+        ).move_to(center_pos + np.array([0, 0.0, 0.6])).set_opacity(0)
+
+        # pooled pulses: a fixed set of dots, in the scene only while in flight
+        pulses = PulseEmitter(pool_size=2 * n_tools * self.pulses_per_tool, radius=0.06)
+        routes = dict(out=(out_paths, THEME["pulse_out"]), into=(in_paths, THEME["pulse_in"]))
+
+        # one group with one updater: everything the trace drives is redrawn every frame
+        live = VGroup(tokens, pause_icon)
+        state = dict(t=0.0, frame=0, pause=0.0)
+
+        def launch(kind, counts):
+            paths, colors = routes[kind]
+            for i, n in enumerate(counts):
+                # calls beyond pulses_per_tool in one frame are merged into the visible pulses
+                for _ in range(min(int(n), self.pulses_per_tool)):
+                    pulses.emit(paths[i], colors[i % 3], run_time=self.pulse_time, rate_func=linear, show_path=False)
+
+        def drive(mob, dt):
+            t = state["t"] = state["t"] + dt
+            target = timeline.paused_at(t)
+            level = state["pause"] + (target - state["pause"]) * min(1.0, 8.0 * dt)
+            if abs(level - state["pause"]) > 0.01 or (level < 0.01) != (state["pause"] < 0.01):
+                pause_icon.set_opacity(level if level >= 0.01 else 0)
+                state["pause"] = level
+
+            calls, results = timeline.frame_events(state["frame"])
+            state["frame"] += 1
+            launch("out", calls)
+            launch("into", results)
+
+        def follow_trace(mob):
+            mob.seek(self.time)
+
+        # token throughput is known up front: declare it as one piecewise rate (trace bin i starts at i / fps)
+        t0 = self.time
+        tokens.schedule(t0 + np.arange(timeline.n_bins) * timeline.bin_s, timeline.token_rates())
+        tokens.add_updater(follow_trace)
+
+        self.add(pulses, live)
+        live.add_updater(drive)
+        self.wait(self.duration)
+        live.remove_updater(drive)
+        tokens.remove_updater(follow_trace)
+        tokens.stop_motion(self.time)
+        self.wait(0.25)
+        logger.info("Pulses: %s", pulses.stats())
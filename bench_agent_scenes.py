@@ -0,0 +1,221 @@
+# bench_agent_scenes.py
+# Manim CE 0.19.x compatible
+# Benchmark grid for the agent-inference scenes, compared against a stored baseline
+#
+#   python bench_agent_scenes.py                                   # default grid vs bench_baseline.json
+#   python bench_agent_scenes.py --tokens 15,240 --versions v2     # a slice of the grid
+#   python bench_agent_scenes.py --update-baseline                 # record the current numbers
+
+from pathlib import Path
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import resource
+import sys
+import tempfile
+import time
+
+HERE = Path(__file__).resolve().parent
+SCENE_FILES = {
+    "v1": HERE / "agent_inference_tools.py",
+    "v2": HERE / "agent_inference_tools_v2.py",
+}
+SCENE_NAME = "InceptionToolUse3D"
+DEFAULT_BASELINE = HERE / "bench_baseline.json"
+
+GRID = dict(
+    versions=["v1", "v2"],
+    tokens=[15, 60, 240],
+    blocks=[6, 12],
+    tools=[3, 6],
+    detail=[0, 1],
+)
+
+# metric -> +1 if larger is worse, -1 if smaller is worse
+GATED_METRICS = dict(construction_s=+1, fps=-1, peak_rss_mb=+1)
+ABS_SLACK = dict(construction_s=0.05, fps=0.5, peak_rss_mb=5.0)   # ignore noise below these
+
+
+def run_id(p):
+    return f"{p['version']}-tok{p['tokens']}-blk{p['blocks']}-tools{p['tools']}-detail{p['detail']}"
+
+
+def expand_grid(grid):
+    runs = []
+    for version, tokens, blocks, tools, detail in itertools.product(
+        grid["versions"], grid["tokens"], grid["blocks"], grid["tools"], grid["detail"]
+    ):
+        if version == "v1" and detail != 1:
+            continue  # v1 has no optional detail layers
+        runs.append(dict(version=version, tokens=tokens, blocks=blocks, tools=tools, detail=detail))
+    return runs
+
+
+def bench_scene_class(params):
+    """The scene class a grid point renders (the base scene with its knobs overridden)."""
+    from parallel_render import load_scene_class
+
+    base = load_scene_class(SCENE_FILES[params["version"]], SCENE_NAME)
+    knobs = dict(n_tokens=params["tokens"], n_blocks=params["blocks"], n_tools=params["tools"])
+    if params["version"] == "v2":
+        knobs["lod_budget"] = 0 if params["detail"] == 0 else None
+    return type(f"{SCENE_NAME}Bench", (base,), knobs)
+
+
+def _bench_one(params):
+    """Runs in a fresh process, so peak RSS belongs to this configuration alone."""
+    os.environ["AGENT_SECTION_CACHE"] = "0"
+    os.environ.pop("AGENT_PROFILE", None)
+    from manim import config
+
+    media_dir = tempfile.mkdtemp(prefix="agent_bench_")
+    config.media_dir = media_dir
+    config.quality = "low_quality"
+    config.disable_caching = True
+    config.progress_bar = "none"
+    config.preview = False
+    config.verbosity = "WARNING"
+
+    scene = bench_scene_class(params)()
+
+    renderer = scene.renderer
+    stats = dict(play_s=0.0, finish_s=0.0, frames=0)
+    play, add_frame, scene_finished = renderer.play, renderer.add_frame, renderer.scene_finished
+
+    def timed_play(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return play(*args, **kwargs)
+        finally:
+            stats["play_s"] += time.perf_counter() - t0
+
+    def counted_add_frame(frame, num_frames=1):
+        stats["frames"] += num_frames
+        return add_frame(frame, num_frames)
+
+    def timed_scene_finished(*args, **kwargs):
+        # partial-movie concatenation and encoding: not construction
+        t0 = time.perf_counter()
+        try:
+            return scene_finished(*args, **kwargs)
+        finally:
+            stats["finish_s"] += time.perf_counter() - t0
+
+    renderer.play = timed_play
+    renderer.add_frame = counted_add_frame
+    renderer.scene_finished = timed_scene_finished
+
+    t0 = time.perf_counter()
+    scene.render()
+    total_s = time.perf_counter() - t0
+
+    movie = Path(renderer.file_writer.movie_file_path)
+    return dict(
+        params,
+        total_s=round(total_s, 3),
+        construction_s=round(total_s - stats["play_s"] - stats["finish_s"], 3),
+        finish_s=round(stats["finish_s"], 3),
+        frames=stats["frames"],
+        fps=round(stats["frames"] / stats["play_s"], 2) if stats["play_s"] else 0.0,
+        peak_rss_mb=round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        output_bytes=movie.stat().st_size if movie.exists() else 0,
+    )
+
+
+def bench(params, repeat=1):
+    """Best of `repeat` runs (min time, max fps), each in its own process."""
+    ctx = mp.get_context("spawn")
+    results = []
+    for _ in range(repeat):
+        with ctx.Pool(1) as pool:
+            results.append(pool.apply(_bench_one, (params,)))
+    best = dict(results[0])
+    best["construction_s"] = min(r["construction_s"] for r in results)
+    best["total_s"] = min(r["total_s"] for r in results)
+    best["finish_s"] = min(r["finish_s"] for r in results)
+    best["fps"] = max(r["fps"] for r in results)
+    best["peak_rss_mb"] = min(r["peak_rss_mb"] for r in results)
+    return best
+
+
+def compare(results, baseline, threshold):
+    """List of regressions: (run id, metric, baseline value, current value)."""
+    regressions = []
+    for rid, cur in results.items():
+        base = baseline.get(rid)
+        if base is None:
+            continue
+        for metric, direction in GATED_METRICS.items():
+            b, c = base.get(metric), cur.get(metric)
+            if b is None or c is None:
+                continue
+            if direction > 0:
+                worse = c > b * (1 + threshold) and c - b > ABS_SLACK[metric]
+            else:
+                worse = c < b * (1 - threshold) and b - c > ABS_SLACK[metric]
+            if worse:
+                regressions.append((rid, metric, b, c))
+    return regressions
+
+
+def print_table(results, baseline):
+    cols = ["construction_s", "fps", "peak_rss_mb", "output_bytes"]
+    print(f"{'run':40s}" + "".join(f"{c:>16s}" for c in cols))
+    for rid, r in results.items():
+        base = baseline.get(rid, {})
+        cells = []
+        for c in cols:
+            if c in base and base[c]:
+                cells.append(f"{r[c]} ({(r[c] - base[c]) / base[c]:+.0%})")
+            else:
+                cells.append(str(r[c]))
+        print(f"{rid:40s}" + "".join(f"{cell:>16s}" for cell in cells))
+
+
+def _int_list(s):
+    return [int(v) for v in s.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the agent-inference scenes over a parameter grid.")
+    parser.add_argument("--versions", type=lambda s: s.split(","), default=GRID["versions"])
+    parser.add_argument("--tokens", type=_int_list, default=GRID["tokens"])
+    parser.add_argument("--blocks", type=_int_list, default=GRID["blocks"])
+    parser.add_argument("--tools", type=_int_list, default=GRID["tools"])
+    parser.add_argument("--detail", type=_int_list, default=GRID["detail"])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative slowdown (0.15 = 15%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--out", type=Path, help="also write this run's results as JSON")
+    args = parser.parse_args(argv)
+
+    grid = dict(versions=args.versions, tokens=args.tokens, blocks=args.blocks, tools=args.tools, detail=args.detail)
+    results = {}
+    for params in expand_grid(grid):
+        rid = run_id(params)
+        print(f"running {rid} ...", file=sys.stderr, flush=True)
+        results[rid] = bench(params, args.repeat)
+
+    baseline = json.loads(args.baseline.read_text())["runs"] if args.baseline.exists() else {}
+    print_table(results, baseline)
+    if args.out:
+        args.out.write_text(json.dumps(dict(runs=results), indent=2))
+
+    if args.update_baseline or not baseline:
+        merged = dict(baseline, **results)
+        args.baseline.write_text(json.dumps(dict(runs=merged), indent=2, sort_keys=True))
+        print(f"baseline written: {args.baseline}", file=sys.stderr)
+        return
+
+    regressions = compare(results, baseline, args.threshold)
+    for rid, metric, b, c in regressions:
+        print(f"REGRESSION {rid} {metric}: {b} -> {c}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# bezier_paths.py
+# Manim CE 0.19.x compatible
+# Arc-length lookup tables for pulses moving along cubic Bezier paths
+
+import numpy as np
+
+
+def _bernstein(t):
+    """(len(t), 4) cubic Bernstein weights."""
+    mt = 1.0 - t
+    return np.stack([mt ** 3, 3 * mt ** 2 * t, 3 * mt * t ** 2, t ** 3], axis=1)
+
+
+class ArcLengthTable:
+    """
+    Arc-length parametrization of a piecewise cubic Bezier path, sampled once.
+
+    `points_at(alphas)` maps proportions in [0, 1] of the path's LENGTH to points with one
+    vectorized interpolation, so any number of pulses on the same path cost one lookup per
+    frame and move at uniform speed (unlike Bezier-t based point_from_proportion).
+    """
+
+    def __init__(self, control_points, samples_per_curve=64):
+        curves = np.asarray(control_points, dtype=float).reshape(-1, 4, 3)
+        t = np.linspace(0.0, 1.0, samples_per_curve + 1)
+        # (n_curves, samples + 1, 3), then drop each curve's duplicated start point
+        pts = np.einsum("sk,ckd->csd", _bernstein(t), curves)
+        pts = np.concatenate([pts[0, :1], pts[:, 1:].reshape(-1, 3)], axis=0)
+
+        seg = np.linalg.norm(np.diff(pts, axis=0), axis=1)
+        cum = np.concatenate([[0.0], np.cumsum(seg)])
+        self.length = cum[-1]
+        self.proportions = cum / self.length if self.length > 0 else np.linspace(0.0, 1.0, len(cum))
+        self.samples = pts
+
+    @classmethod
+    def from_vmobject(cls, vmobject, samples_per_curve=64):
+        return cls(vmobject.points, samples_per_curve=samples_per_curve)
+
+    def points_at(self, alphas):
+        """(m, 3) points at length-proportions `alphas` (any shape, flattened)."""
+        a = np.clip(np.asarray(alphas, dtype=float).ravel(), 0.0, 1.0)
+        s = self.proportions
+        i = np.clip(np.searchsorted(s, a, side="right") - 1, 0, len(s) - 2)
+        span = s[i + 1] - s[i]
+        w = np.divide(a - s[i], span, out=np.zeros_like(a), where=span > 0)
+        return self.samples[i] + w[:, None] * (self.samples[i + 1] - self.samples[i])
+
+    def point_at(self, alpha):
+        return self.points_at(alpha)[0]
+
+
+def attach_arc_length_table(vmobject, samples_per_curve=64):
+    """
+    Precompute an ArcLengthTable for a Bezier path and store it as `vmobject.arc_table`.
+    The table is built from the path's current points; rebuild it if the path is moved.
+    """
+    vmobject.arc_table = ArcLengthTable.from_vmobject(vmobject, samples_per_curve)
+    return vmobject
+
+
+def arched_curves(p_start, p_end, arch_out=0.8, arch_down=0.6):
+    """
+    (n, 4, 3) control points of n cubic Beziers arcing sideways and down, built in one pass.
+    The link/pulse routes of both agent scenes (FanOutPulses, the trace scene's paths);
+    every argument broadcasts over n.
+    """
+    p1, p4 = np.broadcast_arrays(
+        np.atleast_2d(np.asarray(p_start, dtype=float)), np.atleast_2d(np.asarray(p_end, dtype=float))
+    )
+    p1, p4 = p1.copy(), p4.copy()
+    n = len(p1)
+    arch_out = np.broadcast_to(np.asarray(arch_out, dtype=float), (n,))[:, None]
+    arch_down = np.broadcast_to(np.asarray(arch_down, dtype=float), (n,))[:, None]
+
+    v = p4 - p1
+    v[np.linalg.norm(v, axis=1) < 1e-6] = [1.0, 0.0, 0.0]
+    side = np.cross(v, [0.0, 0.0, 1.0])
+    side[np.linalg.norm(side, axis=1) < 1e-6] = [0.0, 1.0, 0.0]
+    side /= np.linalg.norm(side, axis=1, keepdims=True)
+
+    down = arch_down * np.array([0.0, -1.0, 0.0])
+    c1 = p1 + 0.25 * v + arch_out * side + down
+    c2 = p4 - 0.25 * v + arch_out * side + down
+    return np.stack([p1, c1, c2, p4], axis=1)
+
+
+class BatchArcLengthTable:
+    """
+    Arc-length tables for n single-curve Bezier paths at once.
+
+    `points_at(alphas)` takes one length-proportion per path and returns the (n, 3) points
+    in one vectorized lookup, so a frame of n pulses on n different paths is a handful of
+    array operations instead of n table lookups.
+    """
+
+    def __init__(self, curves, samples_per_curve=32):
+        curves = np.asarray(curves, dtype=float).reshape(-1, 4, 3)
+        t = np.linspace(0.0, 1.0, samples_per_curve + 1)
+        self.samples = np.einsum("sk,ckd->csd", _bernstein(t), curves)   # (n, samples + 1, 3)
+        seg = np.linalg.norm(np.diff(self.samples, axis=1), axis=2)
+        cum = np.concatenate([np.zeros((len(curves), 1)), np.cumsum(seg, axis=1)], axis=1)
+        self.length = cum[:, -1]
+        safe = np.where(self.length > 0, self.length, 1.0)[:, None]
+        self.proportions = np.where(self.length[:, None] > 0, cum / safe, t[None, :])
+
+    def points_at(self, alphas):
+        a = np.clip(np.asarray(alphas, dtype=float).ravel(), 0.0, 1.0)
+        s = self.proportions
+        rows = np.arange(len(s))
+        # per-row searchsorted: count of samples at or below alpha
+        i = np.clip((s <= a[:, None]).sum(axis=1) - 1, 0, s.shape[1] - 2)
+        lo, hi = s[rows, i], s[rows, i + 1]
+        span = hi - lo
+        w = np.divide(a - lo, span, out=np.zeros_like(a), where=span > 0)
+        p0, p1 = self.samples[rows, i], self.samples[rows, i + 1]
+        return p0 + w[:, None] * (p1 - p0)
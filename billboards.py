@@ -0,0 +1,186 @@
+# billboards.py
+# Manim CE 0.19.x compatible
+# Billboard layer: every fixed-orientation mobject's anchor in one array, moved to face the camera in one projection per frame
+#
+#   python billboards.py --labels 10,100,1000 --frames 60      # per-frame label cost: stock camera vs the layer
+
+import argparse
+import json
+from time import perf_counter
+
+import numpy as np
+
+
+class BillboardLayer:
+    """
+    Anchor points of all fixed-orientation mobjects, camera-facing offsets for all of them at once.
+
+    ThreeDCamera keeps a center function per family member and, for every member it draws,
+    calls it (a get_center() walk over the whole label) and projects that one point. Here
+    each add_fixed_orientation_mobjects() argument is one group with one row in `anchors`;
+    its members map to the row. Once per frame the anchors that may have moved are
+    re-evaluated, then all anchors are projected in one call; a member's display points are
+    its points plus its group's offset, the same translation ThreeDCamera applies.
+
+    A group is live (re-evaluated every frame) unless classify() found it static for the
+    current play: then its anchor is evaluated once, when the play starts. Without a scene
+    calling classify() (BillboardMixin), every group is live.
+    """
+
+    def __init__(self):
+        self.roots = []
+        self.funcs = []
+        self.kinds = []       # "center": root.get_center, "static": fixed point, "custom": user center_func, "removed"
+        self.index = {}       # member -> group
+        self.anchors = np.zeros((0, 3))
+        self.live = np.zeros(0, dtype=bool)
+        self._offsets = None
+        self.stats = dict(frames=0, anchor_evaluations=0, plays=0, static_group_plays=0)
+
+    def add(self, root, func, kind):
+        g = len(self.roots)
+        self.roots.append(root)
+        self.funcs.append(func)
+        self.kinds.append(kind)
+        for submob in root.get_family():
+            self.index[submob] = g
+        self.anchors = np.vstack([self.anchors, np.asarray(func(), dtype=float).reshape(1, 3)])
+        self.live = np.append(self.live, kind != "static")
+        self._offsets = None
+        return g
+
+    def remove(self, mobjects):
+        for mob in mobjects:
+            g = self.index.pop(mob, None)
+            if g is not None and self.roots[g] is mob:
+                self.kinds[g] = "removed"
+                self.live[g] = False
+
+    def invalidate(self):
+        self._offsets = None
+
+    def offset(self, camera, group):
+        if self._offsets is None:
+            live = np.flatnonzero(self.live)
+            for g in live.tolist():
+                self.anchors[g] = self.funcs[g]()
+            self._offsets = camera.project_points(self.anchors) - self.anchors
+            self.stats["frames"] += 1
+            self.stats["anchor_evaluations"] += len(live)
+        return self._offsets[group]
+
+    def classify(self, movers):
+        """At a play start: groups whose family is in `movers` (ids) stay live, other anchors are fixed now."""
+        for g, (root, kind) in enumerate(zip(self.roots, self.kinds)):
+            if kind == "center":
+                moving = any(id(m) in movers for m in root.get_family())
+                self.live[g] = moving
+                if not moving:
+                    self.anchors[g] = self.funcs[g]()
+        self._offsets = None
+        self.stats["plays"] += 1
+        self.stats["static_group_plays"] += int(np.count_nonzero(~self.live))
+
+    def mark_live(self, ids):
+        for g, (root, kind) in enumerate(zip(self.roots, self.kinds)):
+            if kind == "center" and not self.live[g] and any(id(m) in ids for m in root.get_family()):
+                self.live[g] = True
+        self._offsets = None
+
+    def report(self):
+        return dict(groups=len(self.roots), members=len(self.index), live=int(np.count_nonzero(self.live)), **self.stats)
+
+
+class BillboardMixin:
+    """
+    Scene mixin: at every play start, tells the camera's BillboardLayer which labels can move.
+
+    Movers are the animations' mobjects and every mobject carrying updaters (with their
+    families); a label outside them keeps the anchor it has when the play starts. An updater
+    that moves a label it doesn't own should call `scene.touch(label)`.
+    """
+
+    def begin_animations(self):
+        super().begin_animations()
+        layer = getattr(self.camera, "billboards", None)
+        if layer is None or not layer.roots:
+            return
+        movers = set()
+        for a in self.animations:
+            if getattr(a, "mobject", None) is not None:
+                movers.update(map(id, a.mobject.get_family()))
+        for mob in self.get_mobject_family_members():
+            if mob.updaters:
+                movers.update(map(id, mob.get_family()))
+        layer.classify(movers)
+
+    def touch(self, *mobjects):
+        touch = getattr(super(), "touch", None)
+        if touch is not None:
+            touch(*mobjects)
+        layer = getattr(self.camera, "billboards", None)
+        if layer is not None:
+            layer.mark_live({id(m) for mob in mobjects for m in mob.get_family()})
+
+
+# ======================= BENCHMARK =======================
+def _labels(n):
+    from manim import OUT, UP, BackgroundRectangle, VGroup
+
+    from scene_layout import tool_label, tool_offsets
+    from text_cache import TEXT_CACHE
+
+    labels = []
+    for i, offset in enumerate(tool_offsets(n)):
+        text = TEXT_CACHE.text(tool_label(i), font="DejaVu Sans", scale=0.35)
+        tag = VGroup(text, BackgroundRectangle(text, fill_opacity=0.6, buff=0.06))
+        labels.append(tag.move_to(offset + 0.25 * OUT + 0.18 * UP))
+    return labels
+
+
+def bench(counts, frames=60):
+    """Per-frame cost of the fixed-orientation transform for growing label counts: stock vs layer."""
+    from manim import DEGREES
+    from manim.camera.three_d_camera import ThreeDCamera
+
+    from fast_camera import IncrementalDepthCamera
+
+    rows = []
+    for n in counts:
+        labels = _labels(n)
+        members = [m for tag in labels for m in tag.get_family() if len(m.points)]
+        row = dict(labels=n, drawn_members=len(members))
+        for mode in ("stock", "layer_live", "layer_static"):
+            camera = IncrementalDepthCamera()
+            camera.set_phi(70 * DEGREES)
+            camera.add_fixed_orientation_mobjects(*labels)
+            if mode == "layer_static":
+                camera.billboards.classify(set())
+            transform = (
+                (lambda m, p, c=camera: ThreeDCamera.transform_points_pre_display(c, m, p))
+                if mode == "stock" else camera.transform_points_pre_display
+            )
+            t0 = perf_counter()
+            for f in range(frames):
+                camera.set_theta((60 + f * 0.05) * DEGREES)
+                camera.reset_rotation_matrix()
+                for m in members:
+                    transform(m, m.points)
+            ms = (perf_counter() - t0) * 1000 / frames
+            row[f"{mode}_ms_per_frame"] = round(ms, 3)
+            row[f"{mode}_us_per_label"] = round(ms * 1000 / n, 2)
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark fixed-orientation label cost: stock ThreeDCamera vs the billboard layer.")
+    parser.add_argument("--labels", default="10,100,1000", help="comma-separated label counts")
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args(argv)
+    counts = [int(c) for c in args.labels.split(",")]
+    print(json.dumps(dict(frames=args.frames, runs=bench(counts, args.frames)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+# checkpoint_render.py
+# Manim CE 0.19.x compatible
+# Checkpoint/resume for long renders: encoded segments, scene time, RNG and scene state saved periodically
+#
+#   python checkpoint_render.py agent_inference_trace.py InceptionTraceReplay3D -q k --every 600   # rerun to resume
+#   python checkpoint_render.py agent_inference_tools_v2.py InceptionToolUse3D -q l --every 2 --verify
+
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+
+from manim import config, logger
+import numpy as np
+
+from frame_profiler import updater_label
+from parallel_render import (
+    DigestRecordingRenderer,
+    QUALITY_FLAGS,
+    SegmentWriter,
+    TimelineRangeRenderer,
+    apply_settings,
+    concat_segments,
+    default_camera_class,
+    load_scene_class,
+)
+from render_daemon import local_dependencies
+from render_sections import scene_state_digest
+
+NO_END = 2**62          # a TimelineRangeRenderer range that never closes
+INTERRUPTED = 75        # exit code of a simulated crash (--interrupt-at)
+
+
+# ======================= STATE =======================
+def rng_states(scene):
+    """
+    JSON-able state of every RNG the scene owns: random.Random / numpy Generator attributes
+    (e.g. `self.rng = random.Random(42)`), plus the global generators when the scene seeds
+    them (Scene.random_seed). Unseeded globals differ per process and are left out.
+    """
+    states = {}
+    for name, value in sorted(vars(scene).items()):
+        if isinstance(value, random.Random):
+            version, internal, gauss = value.getstate()
+            states[name] = ["random", version, list(internal), gauss]
+        elif isinstance(value, np.random.Generator):
+            states[name] = ["numpy", value.bit_generator.state]
+    if getattr(scene, "random_seed", None) is not None:
+        version, internal, gauss = random.getstate()
+        states["<random>"] = ["random", version, list(internal), gauss]
+        kind, keys, pos, has_gauss, cached = np.random.get_state()
+        states["<numpy.random>"] = ["legacy", kind, keys.tolist(), pos, has_gauss, cached]
+    return json.loads(json.dumps(states))   # normalized (tuples -> lists) so saved == live
+
+
+def restore_rng_states(scene, states):
+    for name, state in states.items():
+        if name == "<random>":
+            random.setstate((state[1], tuple(state[2]), state[3]))
+        elif name == "<numpy.random>":
+            np.random.set_state((state[1], np.array(state[2], dtype=np.uint32), *state[3:]))
+        elif state[0] == "random":
+            getattr(scene, name).setstate((state[1], tuple(state[2]), state[3]))
+        else:
+            getattr(scene, name).bit_generator.state = state[1]
+
+
+def state_digest(scene):
+    """scene_state_digest (time, camera, every mobject's points/colors) plus the updaters each mobject carries."""
+    h = scene_state_digest(scene)
+    for mob in scene.get_mobject_family_members():
+        h.update("|".join(updater_label(mob, u) for u in mob.updaters).encode())
+    return h.hexdigest()
+
+
+def job_key(settings):
+    """
+    What a checkpoint is only valid for: scene, render settings and the source of the scene
+    file and of every local module it imports (camera, shading and geometry helpers draw
+    frames the state digest can't see). The scene module must be loaded.
+    """
+    path = Path(settings["file"]).resolve()
+    modules = local_dependencies(sys.modules[path.stem], path.parent)
+    files = sorted(Path(sys.modules[name].__file__).resolve() for name in modules)
+    return dict(
+        scene=settings["scene"],
+        quality=settings["quality"],
+        frame_rate=config.frame_rate,
+        pixels=[config.pixel_width, config.pixel_height],
+        sources={
+            str(f.relative_to(path.parent)): hashlib.sha256(f.read_bytes()).hexdigest() for f in files
+        },
+    )
+
+
+def _key_changes(saved, key):
+    changed = [k for k in key if k != "sources" and saved.get(k) != key[k]]
+    old, new = saved.get("sources", {}), key["sources"]
+    changed += sorted(f for f in old.keys() | new.keys() if old.get(f) != new.get(f))
+    return changed
+
+
+class CheckpointStore:
+    """One directory per job: seg_NNNN.mp4 segments (+ .sha256 digest lists) and checkpoint.json."""
+
+    def __init__(self, directory):
+        self.dir = Path(directory)
+        self.path = self.dir / "checkpoint.json"
+
+    def load(self):
+        if not self.path.exists():
+            return None
+        return json.loads(self.path.read_text())
+
+    def save(self, checkpoint):
+        # written next to the real file and renamed over it: a crash leaves the old checkpoint intact
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def segment_path(self, i):
+        return self.dir / f"seg_{i:04}.mp4"
+
+    def digests(self, checkpoint):
+        out = []
+        for seg in checkpoint["segments"]:
+            path = (self.dir / seg["path"]).with_suffix(".sha256")
+            out.extend(path.read_text().split() if path.exists() else [])
+        return out
+
+    def check_segments(self, checkpoint):
+        for seg in checkpoint["segments"]:
+            path = self.dir / seg["path"]
+            if not path.exists() or path.stat().st_size != seg["bytes"]:
+                raise RuntimeError(f"Checkpoint segment {path} is missing or changed; rerun with --restart")
+
+    def clear(self):
+        if self.dir.exists():
+            for path in self.dir.glob("seg_*"):
+                path.unlink()
+            self.path.unlink(missing_ok=True)
+
+
+# ======================= RENDERER =======================
+class CheckpointRenderer(TimelineRangeRenderer):
+    """
+    Renders from a checkpoint's frame to the end, closing a segment and saving a checkpoint
+    every `every_s` seconds of wall time and when the scene finishes.
+
+    Mobjects and their updaters are closures over construct() locals and can't be pickled,
+    so a resumed job rebuilds them by fast-forwarding the timeline to the checkpoint frame
+    without rasterizing (TimelineRangeRenderer, which also seeks time-driven mobjects such as
+    TokenStream once per play instead of every frame), then checks the rebuilt scene against the
+    checkpoint's state digest and RNG states before encoding anything new.
+    """
+
+    def __init__(self, store, key, checkpoint=None, every_s=600.0, interrupt_at=None, record_digests=False, **kwargs):
+        start = checkpoint["frame_index"] if checkpoint else 0
+        super().__init__(start=start, end=NO_END, record_digests=record_digests, **kwargs)
+        self.store = store
+        self.key = key
+        self.resume = checkpoint
+        self.segments = list(checkpoint["segments"]) if checkpoint else []
+        self.every_s = every_s
+        self.interrupt_at = interrupt_at
+        self.segment_start = None
+        self.segment_digests = 0
+        self.checkpoints_written = 0
+        self.resume_checked = checkpoint is None or start == 0
+        self._last_checkpoint = time.perf_counter()
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        self.scene = scene
+
+    def _emit(self, frame, num_frames):
+        if frame is not None and self.writer is None:
+            self.writer = SegmentWriter(self.store.segment_path(len(self.segments)))
+            self.segment_start = max(self.frame_index, self.start)
+            self.segment_digests = len(self.digests)
+        super()._emit(frame, num_frames)
+        if not self.resume_checked and self.frame_index >= self.start:
+            self._check_resume()
+        if self.interrupt_at is not None and self.frame_index >= self.interrupt_at:
+            os._exit(INTERRUPTED)   # simulated crash: no cleanup, the open segment is left half-written
+        if self.writer is not None and time.perf_counter() - self._last_checkpoint >= self.every_s:
+            self.checkpoint()
+
+    def _check_resume(self):
+        self.resume_checked = True
+        # checkpoints are only taken between emits, and the replay emits the same batches
+        if self.frame_index != self.start or state_digest(self.scene) != self.resume["state_digest"]:
+            raise RuntimeError(
+                f"Replay to checkpoint frame {self.start} diverged from the checkpointed scene "
+                "(non-deterministic construct?); rerun with --restart"
+            )
+        if rng_states(self.scene) != self.resume["rng"]:
+            raise RuntimeError(f"RNG state at checkpoint frame {self.start} differs from the checkpoint; rerun with --restart")
+        restore_rng_states(self.scene, self.resume["rng"])
+        self._last_checkpoint = time.perf_counter()   # the replay doesn't count towards the interval
+
+    def checkpoint(self, final=False):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            path = self.store.segment_path(len(self.segments))
+            if self.record_digests:
+                path.with_suffix(".sha256").write_text("\n".join(self.digests[self.segment_digests:]) + "\n")
+            self.segments.append(dict(
+                path=path.name, start=self.segment_start, end=self.frame_index, bytes=path.stat().st_size,
+            ))
+        self.store.save(dict(
+            key=self.key,
+            frame_index=self.frame_index,
+            time=self.time,
+            segments=self.segments,
+            rng=rng_states(self.scene),
+            state_digest=state_digest(self.scene),
+            record_digests=self.record_digests,
+            final=final,
+        ))
+        self.checkpoints_written += 1
+        self._last_checkpoint = time.perf_counter()
+
+    def scene_finished(self, scene):
+        self.checkpoint(final=True)
+
+
+# ======================= DRIVER =======================
+def _settings(file, scene, quality, media_dir):
+    return dict(file=str(Path(file).absolute()), scene=scene, quality=quality, media_dir=media_dir)
+
+
+def _paths(settings, output):
+    video_dir = config.get_dir("video_dir", module_name=Path(settings["file"]).stem)
+    output = Path(output) if output else video_dir / f"{settings['scene']}_resumable.mp4"
+    return CheckpointStore(video_dir / "checkpoints" / settings["scene"]), output
+
+
+def render_resumable(file, scene, quality="low_quality", every_s=600.0, output=None, media_dir=None,
+                     restart=False, interrupt_at=None, record_digests=False):
+    """Render (or resume) one scene with periodic checkpoints; returns a report dict."""
+    os.environ["AGENT_SECTION_CACHE"] = "0"   # the renderer is ours; beats replay through it
+    settings = _settings(file, scene, quality, media_dir)
+    apply_settings(settings)
+    config.disable_caching = True  # a cached play would skip its frames
+    store, output = _paths(settings, output)
+    scene_cls = load_scene_class(settings["file"], scene)
+    key = job_key(settings)
+
+    if restart:
+        store.clear()
+    store.dir.mkdir(parents=True, exist_ok=True)
+    checkpoint = store.load()
+    if checkpoint is not None:
+        if checkpoint["key"] != key:
+            raise RuntimeError(
+                f"Checkpoint in {store.dir} was made with different settings or code "
+                f"({', '.join(_key_changes(checkpoint['key'], key))}); rerun with --restart"
+            )
+        store.check_segments(checkpoint)
+        record_digests = record_digests or checkpoint["record_digests"]
+    resumed_from = checkpoint["frame_index"] if checkpoint else 0
+
+    t0 = time.perf_counter()
+    written = 0
+    if checkpoint is None or not checkpoint["final"]:
+        renderer = CheckpointRenderer(
+            store, key, checkpoint, every_s, interrupt_at, record_digests,
+            camera_class=default_camera_class(scene_cls),
+        )
+        scene_cls(renderer=renderer).render()
+        written = renderer.checkpoints_written
+        checkpoint = store.load()
+    render_s = time.perf_counter() - t0
+
+    concat_segments([store.dir / s["path"] for s in checkpoint["segments"]], output)
+    logger.info(
+        f"Checkpointed render: frames {resumed_from}-{checkpoint['frame_index']} in {render_s:.2f}s, "
+        f"{len(checkpoint['segments'])} segments -> {output}"
+    )
+    return dict(
+        scene=scene,
+        quality=quality,
+        frames=checkpoint["frame_index"],
+        resumed_from_frame=resumed_from,
+        segments=len(checkpoint["segments"]),
+        checkpoints_written=written,
+        render_s=round(render_s, 3),
+        checkpoint_dir=str(store.dir),
+        output=str(output),
+    )
+
+
+def _job(kwargs):
+    return render_resumable(**kwargs)
+
+
+def _clean_digests(settings):
+    apply_settings(settings)
+    config.disable_caching = True
+    scene_cls = load_scene_class(settings["file"], settings["scene"])
+    t0 = time.perf_counter()
+    scene = scene_cls(renderer=DigestRecordingRenderer(camera_class=default_camera_class(scene_cls)))
+    scene.render()
+    return dict(seconds=time.perf_counter() - t0, digests=scene.renderer.digests)
+
+
+def verify_resume(file, scene, quality="low_quality", every_s=2.0, interrupt_at=None, media_dir=None):
+    """
+    Crash a checkpointed render at `interrupt_at` (default: 2/3 of the timeline), resume it in a
+    fresh process, then render the scene cleanly and compare every frame's digest.
+    """
+    os.environ["AGENT_SECTION_CACHE"] = "0"
+    settings = _settings(file, scene, quality, media_dir)
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        clean = pool.apply(_clean_digests, (settings,))
+    n_frames = len(clean["digests"])
+    interrupt_at = interrupt_at if interrupt_at is not None else (2 * n_frames) // 3
+
+    kwargs = dict(file=file, scene=scene, quality=quality, every_s=every_s, media_dir=media_dir, record_digests=True)
+    crashed = ctx.Process(target=_job, args=(dict(kwargs, restart=True, interrupt_at=interrupt_at),))
+    crashed.start()
+    crashed.join()
+    with ctx.Pool(1) as pool:
+        resumed = pool.apply(_job, (kwargs,))
+
+    apply_settings(settings)
+    store, _ = _paths(settings, None)
+    digests = store.digests(store.load())
+    mismatches = [i for i, (a, b) in enumerate(zip(clean["digests"], digests)) if a != b]
+    return dict(
+        resumed,
+        interrupted_at_frame=interrupt_at,
+        interrupted=crashed.exitcode == INTERRUPTED,
+        rerendered_frames=max(interrupt_at - resumed["resumed_from_frame"], 0),
+        clean_s=round(clean["seconds"], 3),
+        clean_frames=n_frames,
+        frames_identical=(len(digests) == n_frames and not mismatches),
+        first_mismatch=mismatches[0] if mismatches else None,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render a scene with periodic checkpoints; rerunning the same command resumes from the latest one."
+    )
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", default="l", help="l, m, h, p or k (as in manim -q)")
+    parser.add_argument("-o", "--output")
+    parser.add_argument("--media-dir")
+    parser.add_argument("--every", type=float, default=600.0, help="seconds of wall time between checkpoints")
+    parser.add_argument("--restart", action="store_true", help="discard existing checkpoints and start over")
+    parser.add_argument("--digests", action="store_true", help="store a digest of every frame with its segment")
+    parser.add_argument("--interrupt-at", type=int, help="exit abruptly after this frame (to test resuming)")
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="crash a run at --interrupt-at, resume it, and compare every frame with a clean render",
+    )
+    args = parser.parse_args(argv)
+
+    quality = next(q for q, v in QUALITY_FLAGS.items() if v == args.quality)
+    if args.verify:
+        report = verify_resume(args.file, args.scene, quality, args.every, args.interrupt_at, args.media_dir)
+    else:
+        report = render_resumable(
+            args.file, args.scene, quality, args.every, args.output, args.media_dir,
+            args.restart, args.interrupt_at, args.digests,
+        )
+    print(json.dumps(report, indent=2))
+    if args.verify and not report["frames_identical"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# dependency_updaters.py
+# Manim CE 0.19.x compatible
+# Updaters registered together with the mobjects they read, skipped while none of those can change
+#
+#   class MyScene(DependencyTrackingMixin, ThreeDScene):
+#       ...
+#       self.add_dependent_updater(line, lambda m: m.put_start_and_end_on(a.get_center(), b.get_center()), a, b)
+
+import inspect
+
+
+def _family_ids(mobjects):
+    return {id(m) for mob in mobjects for m in mob.get_family()}
+
+
+class DependencyTrackingMixin:
+    """
+    Scene mixin for dependency-tracked updaters.
+
+    Everything that can change a mobject during a play is known when the play begins: the
+    animations' mobjects and the mobjects carrying ordinary updaters (with their families).
+    At every play start the scene bumps a version counter and works out once which tracked
+    updaters read one of those "movers". Those run every frame; the others run once at the
+    start of the play (picking up anything construct() did in between) and are then skipped,
+    so a frame costs one integer comparison per static relationship.
+
+    An updater that changes a mobject outside its own family should call
+    `scene.touch(mob)` so updaters reading `mob` run for the rest of the play.
+    """
+
+    def _dependency_state(self):
+        if not hasattr(self, "_dependents"):
+            self._dependents = []
+            self._dependency_version = 0
+        return self._dependents
+
+    def add_dependent_updater(self, mobject, func, *inputs):
+        """mobject.add_updater(func), run only on frames where one of `inputs` may have changed."""
+        entry = dict(mobject=mobject, inputs=inputs, ids=set(), version=-1, live=True, runs=0, skips=0)
+        self._dependency_state().append(entry)
+        takes_dt = "dt" in inspect.signature(func).parameters
+
+        def dependent(mob, dt):
+            if entry["version"] != self._dependency_version:
+                entry["version"] = self._dependency_version   # first frame of the play
+            elif not entry["live"]:
+                entry["skips"] += 1
+                return
+            entry["runs"] += 1
+            if takes_dt:
+                func(mob, dt)
+            else:
+                func(mob)
+
+        dependent.__name__ = f"dependent:{func.__name__}"
+        dependent.dependency = entry
+        mobject.add_updater(dependent)
+        return dependent
+
+    def remove_dependent_updater(self, mobject, dependent):
+        mobject.remove_updater(dependent)
+        self._dependents = [e for e in self._dependency_state() if e is not dependent.dependency]
+
+    def touch(self, *mobjects):
+        """Mark mobjects as changing for the rest of the current play."""
+        self._mark_movers(_family_ids(mobjects))
+
+    def begin_animations(self):
+        super().begin_animations()
+        dependents = self._dependency_state()
+        if not dependents:
+            return
+        self._dependency_version += 1
+        movers = [a.mobject for a in self.animations if getattr(a, "mobject", None) is not None]
+        for mob in self.get_mobject_family_members():
+            if any(not hasattr(u, "dependency") for u in mob.updaters):
+                movers.append(mob)
+        for e in dependents:
+            e["ids"] = _family_ids(e["inputs"])
+            e["live"] = False
+        self._mark_movers(_family_ids(movers))
+
+    def _mark_movers(self, ids):
+        # a live tracked updater changes its own mobject, which may feed further tracked updaters
+        pending = set(ids)
+        while pending:
+            changed = set()
+            for e in self._dependency_state():
+                if not e["live"] and not e["ids"].isdisjoint(pending):
+                    e["live"] = True
+                    changed |= _family_ids([e["mobject"]])
+            pending = changed
+
+    def dependency_stats(self):
+        """Runs and skips of every tracked updater (keyed by the updated mobject's type)."""
+        return [
+            dict(updater=type(e["mobject"]).__name__, runs=e["runs"], skips=e["skips"])
+            for e in self._dependency_state()
+        ]
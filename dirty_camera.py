@@ -0,0 +1,241 @@
+# dirty_camera.py
+# Manim CE 0.19.x compatible
+# 2D camera that redraws only the region that changed since the previous frame
+#
+#   class HelloWorld(Scene):
+#       def __init__(self, camera_class=DirtyRegionCamera, **kwargs):
+#           super().__init__(camera_class=camera_class, **kwargs)
+#
+#   python dirty_camera.py example.py HelloWorld -q l     # check every frame against a full redraw
+
+from pathlib import Path
+import argparse
+import itertools as it
+import json
+import math
+
+from manim import config
+from manim.camera.camera import Camera
+from manim.mobject.types.vectorized_mobject import VMobject
+import numpy as np
+
+MITER_LIMIT = 10.0   # cairo's default; a miter joint reaches at most this many half widths out
+
+
+def _signature(vmob):
+    """Everything about a VMobject that changes the pixels it draws."""
+    return (
+        vmob.points,
+        vmob.get_fill_rgbas(),
+        vmob.get_stroke_rgbas(),
+        vmob.get_stroke_rgbas(background=True),
+        vmob.get_stroke_width(),
+        vmob.get_stroke_width(background=True),
+        vmob.joint_type,
+        vmob.cap_style,
+    )
+
+
+def _same(a, b):
+    return all(
+        np.array_equal(x, y) if isinstance(x, np.ndarray) else x == y
+        for x, y in zip(a, b)
+    )
+
+
+class DirtyRegionCamera(Camera):
+    """
+    Camera that keeps the previous frame and redraws only what changed.
+
+    Each displayed VMobject's signature (points, colors, stroke widths) and pixel bounding
+    box are kept between frames. A mobject that appeared, disappeared or changed marks its
+    old and new boxes dirty (padded for strokes and antialiasing). The dirty boxes merge into
+    one rectangle. Inside it, the base image (background, or the renderer's static image) is
+    restored and every mobject touching it is redrawn, clipped to the rectangle; pixels
+    outside it stay as they were. A frame with nothing dirty is the previous frame, with no
+    drawing at all.
+
+    Anything the bookkeeping cannot follow (a new base image, a changed draw order, a moved
+    frame, non-VMobjects or background-image VMobjects) falls back to a full redraw. With
+    verify=True every frame is also drawn in full and compared (see dirty_report()).
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._base = None
+        self._drawn = None      # the array the previous frame was drawn into
+        self._entries = {}      # id(mob) -> (mob, signature, box)
+        self._order = []
+        super().__init__(*args, **kwargs)
+        self.verify = False
+        self.dirty_stats = dict(frames=0, full=0, partial=0, unchanged=0, redrawn_px=0, total_px=0,
+                                mismatched=0, max_abs_diff=0)
+
+    # ---------- base image ----------
+    def reset(self):
+        if not hasattr(self, "pixel_array") or self.pixel_array.shape != self.background.shape:
+            return super().reset()
+        self._base = self.background   # restored lazily, only where something changed
+        return self
+
+    def set_frame_to_background(self, background):
+        self._base = background
+
+    def _camera_key(self):
+        return (tuple(self.frame_center), self.frame_width, self.frame_height, self.pixel_width, self.pixel_height)
+
+    # ---------- capture ----------
+    def capture_mobjects(self, mobjects, **kwargs):
+        if self._base is None:
+            return super().capture_mobjects(mobjects, **kwargs)
+        mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        stats = self.dirty_stats
+        stats["frames"] += 1
+        stats["total_px"] += self.pixel_width * self.pixel_height
+        region, entries = self._dirty_region(mobjects)
+
+        if self._drawn is not None and self.pixel_array is not self._drawn and region != "full":
+            self.pixel_array[:] = self._drawn   # e.g. a pooled framebuffer: start from the last frame
+        if region == "full":
+            self.pixel_array[:] = self._base
+            self._display(mobjects, self.pixel_array)
+            stats["full"] += 1
+            stats["redrawn_px"] += self.pixel_width * self.pixel_height
+        elif region is None:
+            stats["unchanged"] += 1
+        else:
+            x0, y0, x1, y1 = region
+            self.pixel_array[y0:y1, x0:x1] = self._base[y0:y1, x0:x1]
+            touching = [m for m in mobjects if _overlaps(entries[id(m)][2], region)]
+            ctx = self.get_cairo_context(self.pixel_array)
+            ctx.save()
+            matrix = ctx.get_matrix()
+            ctx.identity_matrix()
+            ctx.rectangle(x0, y0, x1 - x0, y1 - y0)
+            ctx.clip()
+            ctx.set_matrix(matrix)
+            for vmob in touching:
+                self.display_vectorized(vmob, ctx)
+            ctx.restore()
+            stats["partial"] += 1
+            stats["redrawn_px"] += (x1 - x0) * (y1 - y0)
+
+        self._entries = entries
+        self._order = [id(m) for m in mobjects]
+        self._drawn = self.pixel_array
+        self._drawn_base = self._base   # held, so a new static image can't reuse its identity
+        self._key = self._camera_key()
+        if self.verify:
+            self._verify(mobjects)
+
+    def _display(self, mobjects, pixel_array):
+        for group_type, group in it.groupby(mobjects, self.type_or_raise):
+            self.display_funcs[group_type](list(group), pixel_array)
+
+    def _dirty_region(self, mobjects):
+        """'full', None (nothing changed) or the merged dirty rectangle (x0, y0, x1, y1) in pixels."""
+        trackable = all(isinstance(m, VMobject) and not m.get_background_image() for m in mobjects)
+        entries = {}
+        if trackable:
+            for mob in mobjects:
+                old = self._entries.get(id(mob))
+                if old is not None and old[0] is mob and _same(old[1], _signature(mob)):
+                    entries[id(mob)] = old
+                else:
+                    sig = tuple(np.array(v) if isinstance(v, np.ndarray) else v for v in _signature(mob))
+                    entries[id(mob)] = (mob, sig, self._box(mob))
+        if (
+            not trackable or self._drawn is None or self._drawn_base is not self._base
+            or self._key != self._camera_key()
+        ):
+            return "full", entries
+
+        current = set(entries)
+        prev = set(self._order)
+        common = [i for i in self._order if i in current]
+        if common != [i for i in entries if i in prev]:
+            return "full", entries   # draw order changed among mobjects on both frames
+
+        boxes = []
+        for i, entry in entries.items():
+            old = self._entries.get(i)
+            if old is None:
+                boxes.append(entry[2])
+            elif old is not entry:
+                boxes.extend((old[2], entry[2]))
+        for i in prev - current:
+            boxes.append(self._entries[i][2])
+        boxes = [b for b in boxes if b is not None]
+        if not boxes:
+            return None, entries
+        x0 = max(min(b[0] for b in boxes), 0)
+        y0 = max(min(b[1] for b in boxes), 0)
+        x1 = min(max(b[2] for b in boxes), self.pixel_width)
+        y1 = min(max(b[3] for b in boxes), self.pixel_height)
+        if x0 >= x1 or y0 >= y1:
+            return None, entries
+        return (x0, y0, x1, y1), entries
+
+    def _box(self, vmob):
+        """Pixel box a VMobject can touch: its control points plus stroke (miter) and antialiasing."""
+        if not len(vmob.points):
+            return None
+        coords = self.points_to_pixel_coords(vmob, vmob.points)
+        width = max(vmob.get_stroke_width(), vmob.get_stroke_width(background=True))
+        half = width * self.cairo_line_width_multiple * self.pixel_width / self.frame_width / 2
+        pad = math.ceil(half * MITER_LIMIT) + 2
+        (x0, y0), (x1, y1) = coords.min(axis=0), coords.max(axis=0)
+        return (int(x0) - pad, int(y0) - pad, int(x1) + pad + 1, int(y1) + pad + 1)
+
+    def _verify(self, mobjects):
+        # one persistent buffer: cairo contexts are cached by id(pixel_array)
+        if getattr(self, "_verify_buffer", None) is None or self._verify_buffer.shape != self.pixel_array.shape:
+            self._verify_buffer = np.empty_like(self.pixel_array)
+        full = self._verify_buffer
+        full[:] = self._base
+        self._display(mobjects, full)
+        diff = int(np.abs(full.astype(np.int16) - self.pixel_array.astype(np.int16)).max())
+        if diff:
+            self.dirty_stats["mismatched"] += 1
+        self.dirty_stats["max_abs_diff"] = max(self.dirty_stats["max_abs_diff"], diff)
+
+    def dirty_report(self):
+        s = self.dirty_stats
+        report = dict(s)
+        report["redrawn_fraction"] = round(s["redrawn_px"] / s["total_px"], 4) if s["total_px"] else 0.0
+        if not self.verify:
+            del report["mismatched"], report["max_abs_diff"]
+        return report
+
+
+def _overlaps(box, region):
+    return box is not None and box[0] < region[2] and region[0] < box[2] and box[1] < region[3] and region[1] < box[3]
+
+
+# ======================= CLI =======================
+def main(argv=None):
+    from parallel_render import QUALITY_FLAGS, apply_settings, default_camera_class, load_scene_class
+
+    parser = argparse.ArgumentParser(description="Render a 2D scene with DirtyRegionCamera and check it against full redraws.")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", default="l", help="l, m, h, p or k (as in manim -q)")
+    args = parser.parse_args(argv)
+
+    quality = next(q for q, v in QUALITY_FLAGS.items() if v == args.quality)
+    apply_settings(dict(file=str(Path(args.file).absolute()), quality=quality))
+    config.disable_caching = True
+    config.write_to_movie = False
+
+    scene_cls = load_scene_class(args.file, args.scene)
+    camera_class = default_camera_class(scene_cls)
+    if not (isinstance(camera_class, type) and issubclass(camera_class, DirtyRegionCamera)):
+        camera_class = DirtyRegionCamera   # a scene that doesn't pick it itself is checked with the stock one
+    scene = scene_cls(camera_class=camera_class)
+    camera = scene.renderer.camera
+    camera.verify = True
+    scene.render()
+    print(json.dumps(dict(scene=args.scene, quality=quality, **camera.dirty_report()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
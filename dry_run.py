@@ -0,0 +1,264 @@
+# dry_run.py
+# Manim CE 0.19.x compatible
+# Dry run: execute construct() with the camera and encoder stubbed out; report the timeline, live object
+# counts and an estimated render cost calibrated against bench_agent_scenes.py runs
+#
+#   python dry_run.py agent_inference_tools_v2.py InceptionToolUse3D -q h
+#   python dry_run.py --calibrate                     # fit the cost model to bench_baseline.json
+
+from pathlib import Path
+import argparse
+import json
+import os
+import time
+
+from manim import config, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.family import extract_mobject_family_members
+from manim.utils.iterables import list_update
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_CALIBRATION = HERE / "dry_run_calibration.json"
+FEATURES = ("frame", "face", "path", "updater_call")
+
+
+# ======================= RENDERER =======================
+def _live_counts(mobjects):
+    """(paths drawn, of which 3D-shaded faces, updaters on them) for mobjects and their families."""
+    paths = faces = updaters = 0
+    for mob in extract_mobject_family_members(mobjects):
+        updaters += len(mob.updaters)
+        if mob.points.size:
+            paths += 1
+            faces += bool(getattr(mob, "shade_in_3d", False))
+    return paths, faces, updaters
+
+
+class DryRunRenderer(CairoRenderer):
+    """
+    CairoRenderer that runs the whole timeline (updaters, animations, scene time) but never
+    rasterizes or encodes.
+
+    Every frame it would have drawn is counted instead: what update_frame() would have
+    captured (the moving mobjects, and the static ones once per play) accumulates into the
+    raster features of the cost model, and every written frame samples the live scene.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.totals = dict.fromkeys(FEATURES, 0)
+        self.plays = []
+        self.samples = []   # (t, paths, faces, updaters) once per second of scene time
+        self.play_s = 0.0
+        self._current = None
+
+    def play(self, scene, *args, **kwargs):
+        t0 = time.perf_counter()
+        start = self.time
+        self._current = entry = dict(index=len(self.plays), t=round(start, 3))
+        try:
+            super().play(scene, *args, **kwargs)
+        finally:
+            self.play_s += time.perf_counter() - t0
+            self._current = None
+        names = [type(a).__name__ for a in scene.animations or []]
+        entry.update(
+            kind="wait" if names and all(n == "Wait" for n in names) else "play",
+            duration=round(self.time - start, 3),
+            animations=sorted(set(names)),
+            n_animations=len(names),
+        )
+        self.plays.append(entry)
+
+    def update_frame(self, scene, mobjects=None, include_submobjects=True, ignore_skipping=True, **kwargs):
+        if self.skip_animations and not ignore_skipping:
+            return
+        if not mobjects:
+            mobjects = list_update(scene.mobjects, scene.foreground_mobjects)
+        if hasattr(self.camera, "reset_rotation_matrix"):
+            self.camera.reset_rotation_matrix()   # what capture_mobjects() would do; projections read it
+        paths, faces, _ = _live_counts(mobjects)
+        self.totals["face"] += faces
+        self.totals["path"] += paths - faces
+
+    def get_frame(self):
+        return None
+
+    def add_frame(self, frame, num_frames=1):
+        if self.skip_animations:
+            return
+        scene = self.scene
+        paths, faces, updaters = _live_counts(list_update(scene.mobjects, scene.foreground_mobjects))
+        self.totals["frame"] += num_frames
+        self.totals["updater_call"] += updaters * num_frames
+        entry = self._current
+        if entry is not None:
+            for key, value in (("paths", paths), ("faces", faces), ("updaters", updaters)):
+                stats = entry.setdefault(key, dict(start=value, max=value))
+                stats["max"] = max(stats["max"], value)
+        if not self.samples or self.time >= self.samples[-1][0] + 1.0:
+            self.samples.append((round(self.time, 3), paths, faces, updaters))
+        super().add_frame(frame, num_frames)
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        self.scene = scene
+
+
+# ======================= RUNNING =======================
+def dry_run(scene_cls, quality="low_quality", fps=None):
+    """Run scene_cls at `quality` without drawing; fps (optional) steps the timeline more coarsely."""
+    os.environ["AGENT_SECTION_CACHE"] = "0"
+    os.environ.pop("AGENT_PROFILE", None)
+    from parallel_render import default_camera_class
+
+    # quality first: setting it resets the frame rate
+    with tempconfig(dict(quality=quality)):
+        target_fps = config.frame_rate
+        pixels = (config.pixel_width, config.pixel_height)
+        settings = dict(dry_run=True, disable_caching=True, progress_bar="none", preview=False)
+        if fps:
+            settings["frame_rate"] = fps
+        with tempconfig(settings):
+            renderer = DryRunRenderer(camera_class=default_camera_class(scene_cls))
+            t0 = time.perf_counter()
+            scene_cls(renderer=renderer).render()
+            wall = time.perf_counter() - t0
+            sample_fps = config.frame_rate
+    scale = target_fps / sample_fps   # features were counted on the sampled frames
+    return dict(
+        scene=scene_cls.__name__,
+        quality=quality,
+        pixels=list(pixels),
+        frame_rate=target_fps,
+        sampled_frame_rate=sample_fps,
+        duration_s=round(renderer.time, 3),
+        frames=round(renderer.time * target_fps),
+        plays=renderer.plays,
+        over_time=[dict(t=t, paths=p, faces=f, updaters=u) for t, p, f, u in renderer.samples],
+        features={k: round(v * scale) for k, v in renderer.totals.items()},
+        construction_s=round(wall - renderer.play_s, 3),
+        dry_run_s=round(wall, 3),
+    )
+
+
+# ======================= COST MODEL =======================
+def calibrate(bench_file, out=DEFAULT_CALIBRATION):
+    """
+    Fit per-feature seconds to the play time of every run in a bench_agent_scenes.py results file.
+
+    Each run's grid point is dry-run at the benchmark's quality (-ql); its play time
+    (frames / fps) is modeled as frames * frame + faces * face + flat paths * path + updater
+    calls * updater_call, fitted with non-negative least squares.
+    """
+    from scipy.optimize import nnls
+
+    from bench_agent_scenes import bench_scene_class
+    from lod import seconds_per_face
+
+    runs = json.loads(Path(bench_file).read_text())["runs"]
+    rows, targets, ids = [], [], []
+    for rid, run in sorted(runs.items()):
+        if not run.get("fps"):
+            continue
+        report = dry_run(bench_scene_class(run), "low_quality")
+        rows.append([report["features"][k] for k in FEATURES])
+        targets.append(run["frames"] / run["fps"])
+        ids.append(rid)
+    if len(rows) < len(FEATURES):
+        raise ValueError(f"{bench_file}: need at least {len(FEATURES)} runs with fps to calibrate, got {len(rows)}")
+    a, b = np.array(rows, dtype=float), np.array(targets)
+    col_scale = a.max(axis=0)
+    col_scale[col_scale == 0] = 1.0
+    coef, _ = nnls(a / col_scale, b)
+    coef /= col_scale
+    predicted = a @ coef
+    with tempconfig(dict(quality="low_quality")):
+        probe = seconds_per_face()
+        pixels = [config.pixel_width, config.pixel_height]
+    calibration = dict(
+        bench_file=str(bench_file),
+        quality="low_quality",
+        pixels=pixels,
+        seconds_per_face_probe=probe,
+        coefficients=dict(zip(FEATURES, (float(c) for c in coef))),
+        runs=len(ids),
+        mean_abs_error_rel=round(float(np.mean(np.abs(predicted - b) / b)), 3),
+        per_run={rid: dict(play_s=round(t, 3), predicted_s=round(p, 3)) for rid, t, p in zip(ids, b, predicted)},
+    )
+    Path(out).write_text(json.dumps(calibration, indent=2))
+    return calibration
+
+
+def estimate(report, calibration):
+    """Render time estimate at the report's quality from a calibration made at -ql."""
+    from lod import seconds_per_face
+
+    coef = dict(calibration["coefficients"])
+    with tempconfig(dict(quality=report["quality"])):
+        raster = seconds_per_face() / calibration["seconds_per_face_probe"]
+    area = np.prod(report["pixels"]) / np.prod(calibration["pixels"])
+    # rasterization follows the measured per-face cost; background reset and encoding follow
+    # the pixel count; updaters don't depend on the resolution
+    coef["frame"] *= area
+    coef["face"] *= raster
+    coef["path"] *= raster
+    parts = {k: report["features"][k] * coef[k] for k in FEATURES}
+    play_s = sum(parts.values())
+    return dict(
+        calibrated=True,
+        play_s=round(play_s, 2),
+        total_s=round(play_s + report["construction_s"], 2),
+        breakdown_s={k: round(v, 2) for k, v in parts.items()},
+        calibration_error_rel=calibration.get("mean_abs_error_rel"),
+    )
+
+
+def rough_estimate(report):
+    """Uncalibrated: probe-measured Cairo cost of every drawn path, nothing else."""
+    from lod import seconds_per_face
+
+    with tempconfig(dict(quality=report["quality"])):
+        spf = seconds_per_face()
+    paths = report["features"]["face"] + report["features"]["path"]
+    play_s = paths * spf
+    return dict(calibrated=False, play_s=round(play_s, 2), total_s=round(play_s + report["construction_s"], 2))
+
+
+# ======================= CLI =======================
+def main(argv=None):
+    from parallel_render import QUALITY_FLAGS, load_scene_class
+
+    parser = argparse.ArgumentParser(description="Dry-run a scene: timeline, object counts and estimated render cost.")
+    parser.add_argument("file", nargs="?")
+    parser.add_argument("scene", nargs="?")
+    parser.add_argument("-q", "--quality", default="h", help="l, m, h, p or k (as in manim -q)")
+    parser.add_argument("--fps", type=float, help="step the timeline at this rate instead (faster, coarser)")
+    parser.add_argument("--calibration", type=Path, default=DEFAULT_CALIBRATION)
+    parser.add_argument("--calibrate", action="store_true", help="fit the cost model to a bench results file")
+    parser.add_argument("--bench", type=Path, default=HERE / "bench_baseline.json", help="with --calibrate")
+    parser.add_argument("--out", type=Path, help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.calibrate:
+        calibration = calibrate(args.bench, args.calibration)
+        print(json.dumps({k: v for k, v in calibration.items() if k != "per_run"}, indent=2))
+        return
+    if not (args.file and args.scene):
+        parser.error("file and scene are required (or --calibrate)")
+
+    quality = next(q for q, v in QUALITY_FLAGS.items() if v == args.quality)
+    config.input_file = str(Path(args.file).absolute())
+    report = dry_run(load_scene_class(args.file, args.scene), quality, args.fps)
+    if args.calibration.exists():
+        report["estimate"] = estimate(report, json.loads(args.calibration.read_text()))
+    else:
+        report["estimate"] = rough_estimate(report)
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
 from manim import *
 
+from dirty_camera import DirtyRegionCamera
+
 class HelloWorld(Scene):
+    def __init__(self, camera_class=DirtyRegionCamera, **kwargs):
+        # Write() only changes the glyphs being drawn; redraw just that part of the frame
+        super().__init__(camera_class=camera_class, **kwargs)
+
     def construct(self):
         text = Text("Hello from WSL2 + Manim!")
         self.play(Write(text))
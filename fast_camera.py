@@ -0,0 +1,282 @@
+# fast_camera.py
+# Manim CE 0.19.x compatible
+# ThreeDCamera with vectorized depth keys and a painter's order repaired incrementally between frames
+#
+#   python fast_camera.py agent_inference_tools_v2.py InceptionToolUse3D -q l   # measure vs stock sort
+
+from pathlib import Path
+from time import perf_counter
+import argparse
+import json
+import os
+
+from manim import config
+from manim.camera.camera import Camera
+from manim.camera.three_d_camera import ThreeDCamera
+from manim.mobject.types.vectorized_mobject import VMobject
+from manim.utils.iterables import remove_list_redundancies
+import numpy as np
+
+from billboards import BillboardLayer
+from static_batch import FrozenMesh, FrozenRun, draws_batched
+
+
+class IncrementalDepthCamera(ThreeDCamera):
+    """
+    ThreeDCamera whose painter's-algorithm sort is cheap when little changes between frames.
+
+    The stock camera calls get_center() on every face (a Python walk over its Bezier anchors)
+    and sorts from scratch. Here the depth of every plain VMobject face is computed for all
+    faces at once: anchors are concatenated and reduced per face, which gives the same
+    bounding-box centers. Other mobjects fall back to get_z_index_reference_point().
+
+    The previous frame's order is kept. If it is still sorted, it is reused as is. If only a
+    few neighbours are out of order (at most `repair_fraction` of them), it is repaired with
+    a stable merge sort seeded with the old order, which merges the sorted runs in near
+    linear time. Past that threshold, or when the set of mobjects changed, it sorts from
+    scratch. Ties are broken by family order, so the result is the order ThreeDCamera would
+    produce (up to floating-point rounding of the depth keys).
+
+    Subtrees frozen into a FrozenMesh (static_batch.py; `frozen` maps id(root) to its mesh)
+    are not walked: their faces join the sort as array slices with precomputed reference
+    points, and consecutive faces of one mesh are drawn as a FrozenRun from one projection.
+
+    Fixed-orientation mobjects are moved to face the camera by a BillboardLayer: one anchor
+    per add_fixed_orientation_mobjects() argument, all projected in one call per frame.
+
+    With measure=True every frame also runs the stock sort, times both and counts frames
+    whose order differs (see sort_report()).
+    """
+
+    repair_fraction = 0.05
+
+    def __init__(self, *args, **kwargs):
+        self.billboards = BillboardLayer()   # ThreeDCamera.__init__ already resets the rotation matrix
+        super().__init__(*args, **kwargs)
+        self.measure = False
+        self.frozen = {}
+        self._projected = {}
+        self._ids = None
+        self._order = None
+        self.sort_stats = dict(frames=0, reused=0, repaired=0, full=0, seconds=0.0,
+                               stock_seconds=0.0, mismatched=0)
+
+    def get_mobjects_to_display(self, mobjects, include_submobjects=True, excluded_mobjects=None):
+        batched = self.frozen and include_submobjects and not excluded_mobjects
+        if batched:
+            items = self.extract_with_frozen(mobjects)
+        else:
+            items = Camera.get_mobjects_to_display(self, mobjects, include_submobjects, excluded_mobjects)
+        t0 = perf_counter()
+        meshes = [m for m in items if isinstance(m, FrozenMesh)] if batched else []
+        if meshes:
+            result = self.frozen_painter_order(items)
+        else:
+            order = self.painter_order([id(m) for m in items], self.depth_keys(items))
+            result = [items[i] for i in order]
+        stats = self.sort_stats
+        stats["seconds"] += perf_counter() - t0
+        stats["frames"] += 1
+        if self.measure:
+            t0 = perf_counter()
+            stock = ThreeDCamera.get_mobjects_to_display(self, mobjects, include_submobjects, excluded_mobjects)
+            stats["stock_seconds"] += perf_counter() - t0
+            if meshes:
+                result_faces = [f for m in result for f in (m.expand() if isinstance(m, FrozenRun) else [m])]
+            else:
+                result_faces = result
+            if len(stock) != len(result_faces) or any(a is not b for a, b in zip(stock, result_faces)):
+                stats["mismatched"] += 1
+        return result
+
+    # ---------- billboards ----------
+    def add_fixed_orientation_mobjects(self, *mobjects, use_static_center_func=False, center_func=None):
+        super().add_fixed_orientation_mobjects(
+            *mobjects, use_static_center_func=use_static_center_func, center_func=center_func,
+        )
+        kind = "custom" if center_func else "static" if use_static_center_func else "center"
+        for mob in mobjects:
+            self.billboards.add(mob, self.fixed_orientation_mobjects[mob], kind)
+
+    def remove_fixed_orientation_mobjects(self, *mobjects):
+        super().remove_fixed_orientation_mobjects(*mobjects)
+        self.billboards.remove(m for mob in mobjects for m in mob.get_family())
+
+    def reset_rotation_matrix(self):
+        super().reset_rotation_matrix()
+        self.billboards.invalidate()   # a new frame (or a new view): offsets are recomputed on first use
+
+    def transform_points_pre_display(self, mobject, points):
+        group = self.billboards.index.get(mobject)
+        if group is None or mobject in self.fixed_in_frame_mobjects:
+            return super().transform_points_pre_display(mobject, points)
+        points = Camera.transform_points_pre_display(self, mobject, points)
+        return points + self.billboards.offset(self, group)
+
+    # ---------- frozen meshes ----------
+    def extract_with_frozen(self, mobjects):
+        """Camera.get_mobjects_to_display's family members, with each frozen subtree as its FrozenMesh."""
+        items, covered = [], set()
+
+        def visit(mob):
+            mesh = self.frozen.get(id(mob))
+            if mesh is not None and mesh.root is mob:
+                items.append(mesh)   # repeats collapse to the last one, as family members do
+                covered.update(mesh.member_ids)
+                return
+            if id(mob) in covered:
+                return
+            if len(mob.points):
+                items.append(mob)
+            for submob in mob.submobjects:
+                visit(submob)
+
+        for mob in mobjects:
+            visit(mob)
+        # a member listed before its root
+        items = [m for m in items if isinstance(m, FrozenMesh) or id(m) not in covered]
+        items = remove_list_redundancies(items)
+        if self.use_z_index:
+            items.sort(key=lambda m: m.z_index)
+        return items
+
+    def frozen_painter_order(self, items):
+        """Painter's order over every face: plain mobjects and FrozenRuns of consecutive mesh faces."""
+        is_mesh = [isinstance(m, FrozenMesh) for m in items]
+        sizes = np.array([m.n_faces if mesh else 1 for m, mesh in zip(items, is_mesh)])
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        owner = np.repeat(np.arange(len(items)), sizes)
+        keys = np.empty(int(sizes.sum()))
+        plain = [i for i, mesh in enumerate(is_mesh) if not mesh]
+        keys[starts[plain]] = self.depth_keys([items[i] for i in plain])
+        rot_t = self.get_rotation_matrix().T
+        for i, mesh in enumerate(is_mesh):
+            if mesh:
+                keys[starts[i]:starts[i] + sizes[i]] = items[i].depth_keys(rot_t)
+        order = self.painter_order([(id(m), n) for m, n in zip(items, sizes.tolist())], keys)
+
+        owners = owner[order]
+        faces = (order - starts[owners]).tolist()
+        cuts = np.flatnonzero(owners[1:] != owners[:-1]) + 1
+        bounds = [0, *cuts.tolist(), len(order)]
+        owners = owners.tolist()
+        result = []
+        for a, b in zip(bounds, bounds[1:]):
+            item = items[owners[a]]
+            result.append(FrozenRun(item, faces[a:b]) if is_mesh[owners[a]] else item)
+        self._projected = {}
+        return result
+
+    def type_or_raise(self, mobject):
+        kind = FrozenRun if isinstance(mobject, FrozenRun) else super().type_or_raise(mobject)
+        # Camera.type_or_raise rebuilds display_funcs on every call
+        self.display_funcs[FrozenRun] = self.display_frozen_runs
+        return kind
+
+    def display_frozen_runs(self, runs, pixel_array):
+        ctx = self.get_cairo_context(pixel_array)
+        batched = draws_batched(self)
+        for run in runs:
+            mesh = run.mesh
+            if not batched:
+                for face in run.expand():
+                    self.display_vectorized(face, ctx)
+                continue
+            flat = self._projected.get(id(mesh))
+            if flat is None:
+                flat = self._projected[id(mesh)] = self.project_points(mesh.points)[:, :2].ravel().tolist()
+            mesh.draw(self, ctx, run.faces, flat)
+
+    def depth_keys(self, mobjects):
+        """Distance along the view axis of every mobject's reference point (inf: not shaded in 3D)."""
+        rot_t = self.get_rotation_matrix().T
+        keys = np.full(len(mobjects), np.inf)
+        fast, anchors = [], []
+        for i, mob in enumerate(mobjects):
+            if not getattr(mob, "shade_in_3d", False):
+                continue
+            points = mob.points
+            if (
+                isinstance(mob, VMobject) and not mob.submobjects and not hasattr(mob, "z_index_group")
+                and len(points) > 1 and len(points) % mob.n_points_per_cubic_curve == 0
+            ):
+                # the anchors VMobject.get_points_defining_boundary() would return
+                fast.append(i)
+                anchors.append(points[0::mob.n_points_per_cubic_curve])
+                anchors.append(points[mob.n_points_per_cubic_curve - 1::mob.n_points_per_cubic_curve])
+            else:
+                keys[i] = np.dot(mob.get_z_index_reference_point(), rot_t)[2]
+        if fast:
+            sizes = np.array([len(a) for a in anchors]).reshape(-1, 2).sum(axis=1)
+            starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+            stacked = np.concatenate(anchors)
+            centers = (np.minimum.reduceat(stacked, starts) + np.maximum.reduceat(stacked, starts)) / 2
+            keys[fast] = np.dot(centers, rot_t)[:, 2]
+        return keys
+
+    def painter_order(self, ids, keys):
+        """Indices of `keys` sorted by (depth key, family index); `ids` identifies the items across frames."""
+        index = np.arange(len(keys))
+        stats = self.sort_stats
+        order = None
+        if self._order is not None and ids == self._ids:
+            prev = self._order
+            k = keys[prev]
+            out_of_order = (k[1:] < k[:-1]) | ((k[1:] == k[:-1]) & (prev[1:] < prev[:-1]))
+            bad = np.count_nonzero(out_of_order)
+            if bad == 0:
+                order = prev
+                stats["reused"] += 1
+            elif bad <= self.repair_fraction * len(prev):
+                order = prev[np.argsort(k, kind="stable")]
+                # equal keys keep the previous order; that must still be family order
+                ko = keys[order]
+                if np.any((ko[1:] == ko[:-1]) & (order[1:] < order[:-1])):
+                    order = None
+                else:
+                    stats["repaired"] += 1
+        if order is None:
+            order = np.lexsort((index, keys))
+            stats["full"] += 1
+        self._ids, self._order = ids, order
+        return order
+
+    def sort_report(self):
+        s = self.sort_stats
+        n = max(s["frames"], 1)
+        report = dict(s, ms_per_frame=round(s["seconds"] * 1000 / n, 3))
+        report["seconds"] = round(s["seconds"], 4)
+        if self.measure:
+            report["stock_seconds"] = round(s["stock_seconds"], 4)
+            report["stock_ms_per_frame"] = round(s["stock_seconds"] * 1000 / n, 3)
+            report["speedup"] = round(s["stock_seconds"] / s["seconds"], 2) if s["seconds"] else None
+        return report
+
+
+# ======================= CLI =======================
+def main(argv=None):
+    from parallel_render import QUALITY_FLAGS, apply_settings, load_scene_class
+
+    parser = argparse.ArgumentParser(description="Measure incremental vs stock depth sorting on a scene.")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", default="l", help="l, m, h, p or k (as in manim -q)")
+    parser.add_argument("--repair-fraction", type=float, default=IncrementalDepthCamera.repair_fraction)
+    args = parser.parse_args(argv)
+
+    os.environ["AGENT_SECTION_CACHE"] = "0"
+    quality = next(q for q, v in QUALITY_FLAGS.items() if v == args.quality)
+    apply_settings(dict(file=str(Path(args.file).absolute()), quality=quality))
+    config.disable_caching = True
+    config.write_to_movie = False
+
+    scene = load_scene_class(args.file, args.scene)(camera_class=IncrementalDepthCamera)
+    camera = scene.renderer.camera
+    camera.measure = True
+    camera.repair_fraction = args.repair_fraction
+    scene.render()
+    print(json.dumps(dict(scene=args.scene, quality=quality, **camera.sort_report()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
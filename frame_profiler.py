@@ -0,0 +1,297 @@
+# frame_profiler.py
+# Manim CE 0.19.x compatible
+# Opt-in per-frame profiler: updaters, animations and camera stages, written as JSON + folded stacks
+#
+#   AGENT_PROFILE=1 manim -ql agent_inference_tools_v2.py InceptionToolUse3D
+#   flamegraph.pl media/profiles/InceptionToolUse3D.folded > flame.svg
+
+from collections import defaultdict
+from pathlib import Path
+from time import perf_counter
+import json
+import os
+
+from manim import config, logger
+import numpy as np
+
+
+def profiling_enabled():
+    return os.environ.get("AGENT_PROFILE", "0") not in ("", "0")
+
+
+def updater_label(mob, updater):
+    name = getattr(updater, "__name__", type(updater).__name__)
+    if name == "<lambda>" and hasattr(updater, "__code__"):
+        name = f"<lambda>@{updater.__code__.co_firstlineno}"
+    return f"updater:{type(mob).__name__}.{name}"
+
+
+def animation_label(animation):
+    mob = getattr(animation, "mobject", None)
+    return f"animation:{type(animation).__name__}({type(mob).__name__})"
+
+
+class _TimedUpdater:
+    """
+    Stand-in for one updater during a profiled frame. Mobject.update still does the calling
+    (inspect.signature follows __wrapped__); it compares equal to the updater it wraps, so
+    remove_updater() from inside an updater keeps working.
+    """
+
+    def __init__(self, profiler, mob, updater):
+        self.__wrapped__ = updater
+        self.profiler = profiler
+        self.label = updater_label(mob, updater)
+
+    def __call__(self, *args):
+        self.profiler.push(self.label)
+        try:
+            return self.__wrapped__(*args)
+        finally:
+            self.profiler.pop()
+
+    def __eq__(self, other):
+        return self.__wrapped__ == (other.__wrapped__ if isinstance(other, _TimedUpdater) else other)
+
+    def __hash__(self):
+        return hash(self.__wrapped__)
+
+
+class FrameProfiler:
+    """
+    Wall-time profiler for one scene render.
+
+    Timed regions nest on a stack. Each region adds its inclusive time to the per-frame
+    record and to the run totals, and its exclusive time to the folded stack it was called
+    from (the `a;b;c <microseconds>` format read by flamegraph.pl / speedscope).
+
+    A frame opens at Scene.update_to_time (or at the first timed call after the previous
+    frame) and closes when the renderer writes it. Work done between written frames (e.g.
+    the final update after each play) is kept in the totals but not counted as a frame.
+    """
+
+    def __init__(self, scene_name):
+        self.scene_name = scene_name
+        self.stack = []                       # [label, start, child_seconds]
+        self.folded = defaultdict(float)      # "a;b;c" -> exclusive seconds
+        self.totals = defaultdict(lambda: [0.0, 0, 0.0])   # label -> [seconds, calls, max]
+        self.frames = []
+        self._frame = None
+        self._t0 = perf_counter()
+
+    # ---------- timed regions ----------
+    def push(self, label):
+        if self._frame is None and not self.stack:
+            self.begin_frame(None)
+        self.stack.append([label, perf_counter(), 0.0])
+
+    def pop(self):
+        label, start, child = self.stack.pop()
+        elapsed = perf_counter() - start
+        path = ";".join([self.scene_name, "frame"] + [s[0] for s in self.stack] + [label])
+        self.folded[path] += elapsed - child
+        total = self.totals[label]
+        total[0] += elapsed
+        total[1] += 1
+        total[2] = max(total[2], elapsed)
+        if self.stack:
+            self.stack[-1][2] += elapsed
+        if self._frame is not None:
+            stages = self._frame["stages"]
+            stages[label] = stages.get(label, 0.0) + elapsed
+
+    def wrap(self, fn, label):
+        """Timed version of fn; label may be a string or a function of fn's arguments."""
+        def timed(*args, **kwargs):
+            self.push(label(*args, **kwargs) if callable(label) else label)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.pop()
+        return timed
+
+    # ---------- frames ----------
+    def begin_frame(self, t, replayed=False):
+        if self._frame is not None:
+            self.end_frame()
+        self._frame = dict(t=t, start=perf_counter(), stages={}, n=1, replayed=replayed, written=False)
+
+    def end_frame(self, num_frames=1):
+        frame, self._frame = self._frame, None
+        if frame is None:
+            return
+        frame["ms"] = (perf_counter() - frame.pop("start")) * 1000
+        frame["n"] = num_frames
+        frame["stages"] = {k: round(v * 1000, 4) for k, v in frame["stages"].items()}
+        self.frames.append(frame)
+
+    # ---------- scene hooks ----------
+    def time_updaters(self, mobjects):
+        """Swap every updater of `mobjects` for a timed stand-in (in place); undo with restore_updaters."""
+        swapped = list({id(mob): mob for mob in mobjects if mob.updaters}.values())
+        for mob in swapped:
+            mob.updaters[:] = [_TimedUpdater(self, mob, u) for u in mob.updaters]
+        return swapped
+
+    @staticmethod
+    def restore_updaters(swapped):
+        for mob in swapped:
+            mob.updaters[:] = [u.__wrapped__ if isinstance(u, _TimedUpdater) else u for u in mob.updaters]
+
+    def install(self, scene):
+        """Time the renderer and camera stages of `scene` (instance-level wrappers)."""
+        renderer = scene.renderer
+        camera = renderer.camera
+
+        renderer.update_frame = self.wrap(renderer.update_frame, "render")
+        renderer.get_frame = self.wrap(renderer.get_frame, "capture")
+        renderer.save_static_frame_data = self.wrap(renderer.save_static_frame_data, "static_image")
+        add_frame = renderer.add_frame
+
+        def timed_add_frame(frame, num_frames=1):
+            self.push("write_frame")
+            try:
+                return add_frame(frame, num_frames)
+            finally:
+                self.pop()
+                if self._frame is not None:
+                    self._frame["written"] = True
+                    self._frame["mobjects"] = len(scene.get_mobject_family_members())
+                    self._frame["replayed"] = bool(getattr(renderer, "replaying", False))
+                self.end_frame(num_frames)
+
+        renderer.add_frame = timed_add_frame
+
+        camera.reset = self.wrap(camera.reset, "camera:reset")
+        camera.set_frame_to_background = self.wrap(camera.set_frame_to_background, "camera:static_background")
+        camera.get_mobjects_to_display = self.wrap(camera.get_mobjects_to_display, "camera:depth_sort")
+        for mob_type, fn in list(camera.display_funcs.items()):
+            camera.display_funcs[mob_type] = self.wrap(fn, f"camera:rasterize:{mob_type.__name__}")
+        fixed = getattr(camera, "fixed_orientation_mobjects", {})
+        camera.transform_points_pre_display = self.wrap(
+            camera.transform_points_pre_display,
+            lambda mob, points: "camera:fixed_orientation" if mob in fixed else "camera:project",
+        )
+
+    # ---------- output ----------
+    def summary(self):
+        frames = [f for f in self.frames if f["written"] and not f["replayed"]]
+        frame_ms = np.array([f["ms"] for f in frames]) if frames else np.zeros(1)
+        n = max(len(frames), 1)
+        wall = perf_counter() - self._t0
+        counts = [f["mobjects"] for f in self.frames if f["written"]]   # live mobjects over time
+        stages = {
+            label: dict(
+                total_ms=round(sec * 1000, 3),
+                calls=calls,
+                max_ms=round(mx * 1000, 4),
+                ms_per_frame=round(sec * 1000 / n, 4),
+                share=round(sec / wall, 4) if wall else 0.0,
+            )
+            for label, (sec, calls, mx) in sorted(self.totals.items(), key=lambda kv: -kv[1][0])
+        }
+        return dict(
+            scene=self.scene_name,
+            resolution=[config.pixel_width, config.pixel_height],
+            frame_rate=config.frame_rate,
+            frames=len(frames),
+            replayed_frames=sum(1 for f in self.frames if f["replayed"]),
+            wall_s=round(wall, 3),
+            frame_ms=dict(
+                mean=round(float(frame_ms.mean()), 3),
+                p50=round(float(np.percentile(frame_ms, 50)), 3),
+                p95=round(float(np.percentile(frame_ms, 95)), 3),
+                max=round(float(frame_ms.max()), 3),
+            ),
+            stages=stages,
+            mobjects=dict(
+                first=counts[0] if counts else 0,
+                max=max(counts, default=0),
+                last=counts[-1] if counts else 0,
+            ),
+            per_frame=[
+                dict(
+                    t=f["t"], n=f["n"], ms=round(f["ms"], 4), replayed=f["replayed"],
+                    mobjects=f.get("mobjects"), stages=f["stages"],
+                )
+                for f in self.frames
+                if f["written"]
+            ],
+        )
+
+    def write(self, out_dir=None):
+        self.end_frame()
+        out_dir = Path(out_dir or os.environ.get("AGENT_PROFILE_DIR") or Path(config.media_dir) / "profiles")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        json_path = out_dir / f"{self.scene_name}.json"
+        folded_path = out_dir / f"{self.scene_name}.folded"
+        json_path.write_text(json.dumps(self.summary(), indent=1))
+        folded_path.write_text("".join(
+            f"{path} {max(int(round(sec * 1e6)), 1)}\n" for path, sec in sorted(self.folded.items())
+        ))
+        return json_path, folded_path
+
+
+class FrameProfilerMixin:
+    """
+    Scene mixin: with AGENT_PROFILE=1, every frame of the render is profiled and written to
+    <media_dir>/profiles/<Scene>.json and .folded (or AGENT_PROFILE_DIR). Frames replayed
+    from the section cache are marked and left out of the frame statistics.
+    """
+
+    profiler = None
+
+    def render(self, *args, **kwargs):
+        if not profiling_enabled():
+            return super().render(*args, **kwargs)
+        self.profiler = FrameProfiler(type(self).__name__)
+        self.profiler.install(self)
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            json_path, folded_path = self.profiler.write()
+            summary = self.profiler.summary()
+            top = list(summary["stages"].items())[:8]
+            logger.info(
+                f"Profile: {summary['frames']} frames, mean {summary['frame_ms']['mean']} ms/frame, "
+                f"up to {summary['mobjects']['max']} mobjects -> {json_path}"
+            )
+            for label, s in top:
+                logger.info(f"  {label}: {s['ms_per_frame']} ms/frame ({s['calls']} calls)")
+
+    def begin_animations(self):
+        super().begin_animations()
+        p = self.profiler
+        if p is None:
+            return
+        for animation in self.animations:
+            label = animation_label(animation)
+            animation.update_mobjects = p.wrap(animation.update_mobjects, label)
+            animation.interpolate = p.wrap(animation.interpolate, label)
+
+    def update_to_time(self, t):
+        p = self.profiler
+        if p is None:
+            return super().update_to_time(t)
+        p.begin_frame(round(self.renderer.time, 6))
+        mobjects = self.get_mobject_family_members()
+        for animation in self.animations:
+            if getattr(animation, "mobject", None) is not None:
+                mobjects += animation.mobject.get_family()
+        swapped = p.time_updaters(mobjects)
+        p.push("update")
+        try:
+            super().update_to_time(t)
+        finally:
+            p.pop()
+            p.restore_updaters(swapped)
+
+    def update_meshes(self, dt):
+        if self.profiler is None:
+            return super().update_meshes(dt)
+        return self.profiler.wrap(super().update_meshes, "update_meshes")(dt)
+
+    def update_self(self, dt):
+        if self.profiler is None:
+            return super().update_self(dt)
+        return self.profiler.wrap(super().update_self, "scene_updaters")(dt)
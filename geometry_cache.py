@@ -0,0 +1,91 @@
+# geometry_cache.py
+# Manim CE 0.19.x compatible
+# Shared geometry cache: each unique 3D primitive is built once, callers get copies
+
+from collections import OrderedDict
+
+from manim import ManimColor
+import numpy as np
+
+
+def _freeze(value):
+    """Turn kwargs values (lists, arrays, colors) into something hashable and stable."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, np.ndarray):
+        return tuple(np.round(value.astype(float), 9).ravel().tolist())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, ManimColor):
+        return value.to_hex(with_alpha=True)
+    if isinstance(value, float):
+        return round(value, 9)
+    return value
+
+
+class GeometryCache:
+    """
+    LRU cache of parametric primitives (Sphere, Torus, Prism, Cylinder, ...).
+
+    Entries are keyed by (primitive type, constructor kwargs): dimensions, resolution and
+    style. Style is part of the key because Surface bakes fill/stroke/checkerboard colors
+    into its faces at build time. A hit returns `master.copy()`, which skips the
+    per-point parametric evaluation entirely.
+
+    max_points bounds memory by the total number of points held by cached masters;
+    least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries=256, max_points=2_000_000):
+        self.max_entries = max_entries
+        self.max_points = max_points
+        self._entries = OrderedDict()  # key -> (master, n_points)
+        self._n_points = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, mobject_class, **kwargs):
+        """Return a fresh copy of mobject_class(**kwargs), building it only on a miss."""
+        key = (mobject_class.__module__, mobject_class.__qualname__, _freeze(kwargs))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0].copy()
+
+        self.misses += 1
+        master = mobject_class(**kwargs)
+        n_points = sum(len(m.points) for m in master.get_family())
+        self._entries[key] = (master, n_points)
+        self._n_points += n_points
+        self._evict()
+        return master.copy()
+
+    def _evict(self):
+        # always keep the entry that was just inserted
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._n_points > self.max_points
+        ):
+            _, (_, n_points) = self._entries.popitem(last=False)
+            self._n_points -= n_points
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._n_points = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=(self.hits / total) if total else 0.0,
+            entries=len(self._entries),
+            points=self._n_points,
+            evictions=self.evictions,
+        )
+
+
+# Process-wide cache shared by every scene rendered in this interpreter
+GEOMETRY_CACHE = GeometryCache()
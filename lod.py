@@ -0,0 +1,182 @@
+# lod.py
+# Manim CE 0.19.x compatible
+# Level of detail: tessellation and decorative layers from output quality, screen size and a frame budget
+
+from time import perf_counter
+import math
+import os
+
+from manim import config, logger, Sphere
+from manim.camera.camera import Camera
+import numpy as np
+
+# (tier, min pixel height, budget in drawn faces per frame; None = unlimited)
+QUALITY_TIERS = [
+    ("low", 0, 1500),
+    ("medium", 720, 4000),
+    ("high", 1080, 10000),
+    ("production", 1440, 20000),
+    ("fourk", 2160, None),
+]
+
+_SECONDS_PER_FACE = {}  # (pixel_width, pixel_height) -> measured Cairo cost of one surface face
+
+
+def quality_tier(pixel_height=None):
+    pixel_height = config.pixel_height if pixel_height is None else pixel_height
+    tier = QUALITY_TIERS[0]
+    for entry in QUALITY_TIERS:
+        if pixel_height >= entry[1]:
+            tier = entry
+    return tier
+
+
+def seconds_per_face():
+    """Cairo time for one Surface face at the current resolution (probe render, once per size)."""
+    key = (config.pixel_width, config.pixel_height)
+    if key not in _SECONDS_PER_FACE:
+        camera = Camera()
+        probe = Sphere(radius=1.5, resolution=(16, 16))
+        n_faces = len(probe.submobjects)
+        camera.capture_mobjects([probe])  # warm-up
+        t0 = perf_counter()
+        for _ in range(3):
+            camera.reset()
+            camera.capture_mobjects([probe])
+        _SECONDS_PER_FACE[key] = (perf_counter() - t0) / (3 * n_faces)
+    return _SECONDS_PER_FACE[key]
+
+
+class LevelOfDetail:
+    """
+    Chooses tessellation and decorative layers for one scene.
+
+    Inputs: the output quality (tier and pixel density from config), each object's
+    projected size under the camera's current orientation, and a per-frame budget of drawn
+    faces (every Surface face, shadow or bar is one Cairo path). Tessellation follows screen
+    size (about one segment per `px_per_segment` pixels of outline) and never exceeds the
+    resolution the scene asks for, so 4K output keeps full detail. Decorative layers are
+    enabled in priority order while the budget allows.
+
+    Every choice is recorded; report() estimates the time saved against full detail using
+    a probe render of the per-face Cairo cost at this resolution.
+    """
+
+    def __init__(self, camera, frame_budget=None, px_per_segment=6.0):
+        self.camera = camera
+        self.tier, _, budget = quality_tier()
+        env_budget = os.environ.get("AGENT_LOD_BUDGET")
+        if frame_budget is None and env_budget:
+            frame_budget = None if env_budget == "none" else int(env_budget)
+        elif frame_budget is None:
+            frame_budget = budget
+        self.frame_budget = frame_budget
+        self.px_per_segment = px_per_segment
+        self.px_per_unit = config.pixel_height / config.frame_height
+        self.decisions = []
+        self.layers = {}
+
+    # ---------- screen size ----------
+    def projected_size(self, center, radius):
+        """On-screen diameter in pixels of a ball of `radius` at `center`."""
+        center = np.asarray(center, dtype=float)
+        probes = center + radius * np.vstack([np.eye(3), -np.eye(3)])
+        if hasattr(self.camera, "project_points"):
+            probes = self.camera.project_points(probes)
+        extent = np.ptp(probes[:, :2], axis=0).max()
+        return float(extent * self.px_per_unit)
+
+    def segments(self, outline_px, full, minimum=3, px_per_segment=None):
+        n = math.ceil(outline_px / (px_per_segment or self.px_per_segment))
+        return int(min(max(n, minimum), full))
+
+    def _record(self, name, kind, size_px, resolution, full, count, layer):
+        faces = int(np.prod(resolution)) * count
+        full_faces = int(np.prod(full)) * count
+        self.decisions.append(dict(
+            name=name, kind=kind, size_px=round(size_px, 1), resolution=tuple(resolution),
+            full=tuple(full), faces=faces, full_faces=full_faces, layer=layer,
+        ))
+        return tuple(resolution)
+
+    # ---------- tessellation ----------
+    def sphere_resolution(self, name, center, radius, full=(16, 16), count=1, layer=None):
+        d = self.projected_size(center, radius)
+        u = self.segments(math.pi * d, full[0], minimum=6)
+        v = self.segments(0.5 * math.pi * d, full[1], minimum=4)
+        return self._record(name, "sphere", d, (u, v), full, count, layer)
+
+    def torus_resolution(self, name, center, major_radius, minor_radius, full=(24, 24), count=1, layer=None):
+        d = self.projected_size(center, major_radius + minor_radius)
+        tube = d * minor_radius / (major_radius + minor_radius)
+        u = self.segments(math.pi * d, full[0], minimum=8)
+        v = self.segments(math.pi * tube, full[1], minimum=4)
+        return self._record(name, "torus", d, (u, v), full, count, layer)
+
+    def cylinder_resolution(self, name, p1, p2, radius, full=(24, 24), count=1, layer=None):
+        """(along, around); straight along the axis, so that direction needs far fewer segments."""
+        p1, p2 = np.asarray(p1, dtype=float), np.asarray(p2, dtype=float)
+        length = np.linalg.norm(p2 - p1)
+        d = self.projected_size((p1 + p2) / 2, radius)
+        length_px = self.projected_size((p1 + p2) / 2, length / 2)
+        u = self.segments(length_px, full[0], minimum=1, px_per_segment=4 * self.px_per_segment)
+        v = self.segments(math.pi * d, full[1], minimum=6)
+        return self._record(name, "cylinder", length_px, (u, v), full, count, layer)
+
+    def edge_stroke(self, name, center, size, width, min_px=48.0):
+        """Keep edge strokes only on objects at least `min_px` across on screen."""
+        d = self.projected_size(center, size / 2)
+        keep = d >= min_px
+        self.decisions.append(dict(name=name, kind="stroke", size_px=round(d, 1), stroke=keep))
+        return width if keep else 0
+
+    # ---------- decorative layers ----------
+    def decide_layers(self, layers):
+        """
+        `layers` is a list of (name, extra_faces) in priority order. A layer's cost is
+        extra_faces plus the faces of tessellations recorded with layer=name. Core geometry
+        (layer=None) is always drawn and is charged first.
+        """
+        spent = sum(d["faces"] for d in self.decisions if d.get("layer") is None and "faces" in d)
+        for name, extra in layers:
+            cost = extra + sum(d["faces"] for d in self.decisions if d.get("layer") == name)
+            on = self.frame_budget is None or spent + cost <= self.frame_budget
+            if on:
+                spent += cost
+            self.layers[name] = dict(enabled=on, faces=cost)
+        return {name: v["enabled"] for name, v in self.layers.items()}
+
+    def enabled(self, name):
+        return self.layers.get(name, {}).get("enabled", True)
+
+    # ---------- reporting ----------
+    def report(self, frames=None):
+        drawn = full = 0
+        for d in self.decisions:
+            if "faces" not in d:
+                continue
+            full += d["full_faces"]
+            if d["layer"] is None or self.enabled(d["layer"]):
+                drawn += d["faces"]
+        for name, v in self.layers.items():
+            extra = v["faces"] - sum(d["faces"] for d in self.decisions if d.get("layer") == name)
+            full += extra
+            drawn += extra if v["enabled"] else 0
+        spf = seconds_per_face()
+        saved_ms = (full - drawn) * spf * 1000
+        out = dict(
+            tier=self.tier,
+            budget=self.frame_budget,
+            faces_full=full,
+            faces_drawn=drawn,
+            est_ms_saved_per_frame=round(saved_ms, 2),
+            layers={k: v["enabled"] for k, v in self.layers.items()},
+        )
+        if frames is not None:
+            out["est_s_saved"] = round(saved_ms * frames / 1000, 2)
+        return out
+
+    def log(self, frames=None):
+        for d in self.decisions:
+            logger.info("LOD %s: %s", d["name"], {k: v for k, v in d.items() if k != "name"})
+        logger.info("LOD summary: %s", self.report(frames))
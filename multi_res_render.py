@@ -0,0 +1,389 @@
+# multi_res_render.py
+# Manim CE 0.19.x compatible
+# Geometry once, rasterize many: one pass over the timeline feeds several resolutions / frame rates
+#
+#   python multi_res_render.py agent_inference_tools_v2.py InceptionToolUse3D --tiers 480p15,1080p60,2160p60
+
+from pathlib import Path
+from queue import Queue
+from threading import Thread
+import argparse
+import copy
+import json
+import math
+import re
+import resource
+import time
+
+from manim import config, logger
+from manim.camera.camera import Camera
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.file_ops import write_to_movie
+import cairo
+import numpy as np
+
+from stream_writer import StreamingFileWriter, make_sink
+
+DEFAULT_TIERS = "480p15,1080p60,2160p60"
+
+
+# ======================= RECORDING CAMERA =======================
+class RecordingCameraMixin:
+    """
+    Camera mixin that records a frame instead of rasterizing it.
+
+    Everything the camera works out per frame (depth order, 3D projection, shading, Bezier
+    paths, gradients) happens once, as usual; the resulting Cairo drawing commands go to a
+    RecordingSurface in this camera's pixel space (the largest tier, so no precision is lost).
+    A frame is the display list of those recordings, replayed by each tier at its own scale.
+
+    Mobjects that manim draws straight into pixels rather than through Cairo (point clouds,
+    images, background-colored VMobjects) are drawn right away by every tier camera into a
+    transparent layer, which the display list composites in order.
+
+    With several `palettes` (see theme_batch.py), every VMobject's path is still built once;
+    it is then filled and stroked once per palette, each into that palette's recording.
+    """
+
+    recording = True
+    palette = None     # color remap applied before shading (set per tier, or per pass while recording)
+    palettes = (None,)
+
+    def reset(self):
+        if not self.recording:
+            return super().reset()
+        self.display_list = []
+        self._recording_ctxs = None
+        return self
+
+    def set_frame_to_background(self, background):
+        if not self.recording:
+            return super().set_frame_to_background(background)
+        self.display_list = list(background)   # static mobjects recorded earlier
+        self._recording_ctxs = None
+
+    def end_frame(self):
+        """The frame drawn since reset(), as an immutable display list."""
+        self._recording_ctxs = None   # later draws start fresh recordings
+        return tuple(self.display_list)
+
+    def get_cairo_context(self, pixel_array):
+        if not self.recording or pixel_array is not self.pixel_array:
+            return super().get_cairo_context(pixel_array)
+        if self._recording_ctxs is None:
+            surfaces, self._recording_ctxs = [], []
+            for _ in self.palettes:
+                surface = cairo.RecordingSurface(
+                    cairo.Content.COLOR_ALPHA, cairo.Rectangle(0, 0, self.pixel_width, self.pixel_height),
+                )
+                ctx = cairo.Context(surface)
+                ctx.set_matrix(self._pixel_matrix())
+                surfaces.append(surface)
+                self._recording_ctxs.append(ctx)
+            self.display_list.append(("vector", surfaces))
+        return self._recording_ctxs[0]
+
+    def display_vectorized(self, vmobject, ctx):
+        if not self.recording or len(self.palettes) == 1 or ctx is not self._recording_ctxs[0]:
+            return super().display_vectorized(vmobject, ctx)
+        self.palette = self.palettes[0]
+        super().display_vectorized(vmobject, ctx)
+        path = ctx.copy_path()
+        for other, palette in zip(self._recording_ctxs[1:], self.palettes[1:]):
+            self.palette = palette
+            other.new_path()
+            other.append_path(path)
+            self.apply_stroke(other, vmobject, background=True)
+            self.apply_fill(other, vmobject)
+            self.apply_stroke(other, vmobject)
+        self.palette = None
+        return self
+
+    def get_fill_rgbas(self, vmobject):
+        if self.palette is None:
+            return super().get_fill_rgbas(vmobject)
+        return self._shade(vmobject, self.palette.remap(vmobject.get_fill_rgbas()))
+
+    def get_stroke_rgbas(self, vmobject, background=False):
+        if self.palette is None:
+            return super().get_stroke_rgbas(vmobject, background=background)
+        return self._shade(vmobject, self.palette.remap(vmobject.get_stroke_rgbas(background)))
+
+    def _shade(self, vmobject, rgbas):
+        # ThreeDCamera shades the (remapped) colors; a 2D Camera uses them as they are
+        return self.modified_rgbas(vmobject, rgbas) if hasattr(self, "modified_rgbas") else rgbas
+
+    def _pixel_matrix(self):
+        # frame coordinates -> pixels, as in Camera.get_cairo_context
+        pw, ph = self.pixel_width, self.pixel_height
+        fw, fh = self.frame_width, self.frame_height
+        fc = self.frame_center
+        return cairo.Matrix(pw / fw, 0, 0, -(ph / fh), (pw / 2) - fc[0] * (pw / fw), (ph / 2) + fc[1] * (ph / fh))
+
+    def _add_layer(self, method, mobjects):
+        mobjects = list(mobjects)
+        layers = []
+        for cam in self.raster_cameras:
+            layer = np.zeros((cam.pixel_height, cam.pixel_width, cam.n_channels), dtype=cam.pixel_array_dtype)
+            if hasattr(cam, "reset_rotation_matrix"):
+                cam.reset_rotation_matrix()
+            getattr(cam, method)(mobjects, layer)
+            layers.append(layer)
+        self.display_list.append(("layer", layers))
+        self._recording_ctxs = None
+
+    def display_multiple_point_cloud_mobjects(self, pmobjects, pixel_array):
+        if not self.recording:
+            return super().display_multiple_point_cloud_mobjects(pmobjects, pixel_array)
+        self._add_layer("display_multiple_point_cloud_mobjects", pmobjects)
+
+    def display_multiple_image_mobjects(self, image_mobjects, pixel_array):
+        if not self.recording:
+            return super().display_multiple_image_mobjects(image_mobjects, pixel_array)
+        self._add_layer("display_multiple_image_mobjects", image_mobjects)
+
+    def display_multiple_background_colored_vmobjects(self, cvmobjects, pixel_array):
+        if not self.recording:
+            return super().display_multiple_background_colored_vmobjects(cvmobjects, pixel_array)
+        self._add_layer("display_multiple_background_colored_vmobjects", cvmobjects)
+
+
+def recording_camera_class(camera_class):
+    camera_class = camera_class or Camera
+    return type(f"Recording{camera_class.__name__}", (RecordingCameraMixin, camera_class), {})
+
+
+# ======================= TIERS =======================
+def parse_tiers(spec):
+    """'480p15,1080p60' -> [(480, 15), (1080, 60)]"""
+    tiers = []
+    for item in spec.split(","):
+        match = re.fullmatch(r"\s*(\d+)p(\d+)\s*", item)
+        if not match:
+            raise ValueError(f"tier {item!r} is not <height>p<fps>, e.g. 1080p60")
+        tiers.append((int(match[1]), int(match[2])))
+    return tiers
+
+
+class Tier:
+    """
+    One output: a raster camera at its own resolution (and palette), a timeline stride and an
+    encoder. `theme` picks the palette's recording out of each vector entry of a display list.
+    """
+
+    def __init__(self, index, height, fps, recorder, timeline_fps, theme=0, palette=None):
+        if int(timeline_fps) % fps:
+            raise ValueError(f"{height}p{fps}: {fps} fps does not divide the {timeline_fps} fps timeline")
+        aspect = recorder.frame_width / recorder.frame_height
+        width = math.ceil(height * aspect / 2) * 2   # manim's sizes: 854x480, 1920x1080, 3840x2160
+        self.index = index
+        self.name = f"{height}p{fps}"
+        self.fps = fps
+        self.stride = int(timeline_fps) // fps
+        self.theme = theme
+        self.label = palette.name if palette is not None else None
+        self.camera = copy.copy(recorder)   # shares the scene-side camera state (trackers, fixed mobjects)
+        self.camera.recording = False
+        self.camera.palette = palette
+        self.camera.pixel_array_to_cairo_context = {}
+        self.camera.reset_pixel_shape(height, width)
+        self._background_key = None
+        self.buffer = self.camera.background.copy()
+        surface = cairo.ImageSurface.create_for_data(self.buffer, cairo.FORMAT_ARGB32, width, height)
+        self.ctx = cairo.Context(surface)
+        self.ctx.scale(width / recorder.pixel_width, height / recorder.pixel_height)
+        self.sink = None
+        self.path = None
+        self.frames_written = 0
+
+    def frames_in(self, start, count):
+        """How many of timeline frames [start, start + count) fall on this tier's stride."""
+        return -(-(start + count) // self.stride) - -(-start // self.stride)
+
+    def set_background(self, color, opacity):
+        """Follow the recording camera's background (construct() usually sets it)."""
+        if (color, opacity) == self._background_key:
+            return
+        self._background_key = (color, opacity)
+        cam = self.camera
+        cam._background_color = color if cam.palette is None else cam.palette.remap_color(color)
+        cam._background_opacity = opacity
+        cam.init_background()
+
+    def rasterize(self, display_list):
+        self.buffer[:] = self.camera.background
+        ctx = self.ctx
+        for kind, payload in display_list:
+            if kind == "vector":
+                ctx.set_source_surface(payload[self.theme])
+            else:
+                layer = payload[self.index]
+                h, w = layer.shape[:2]
+                ctx.save()
+                ctx.identity_matrix()
+                ctx.set_source_surface(cairo.ImageSurface.create_for_data(layer, cairo.FORMAT_ARGB32, w, h))
+            ctx.paint()
+            if kind != "vector":
+                ctx.restore()
+        return self.buffer
+
+
+# ======================= FILE WRITER / RENDERER =======================
+class MultiResFileWriter(StreamingFileWriter):
+    """
+    Streams every tier into its own movie, <media>/videos/<module>/<height>p<fps>/<Scene>.mp4.
+
+    Display lists are queued to one rasterizer thread, which replays them for each tier whose
+    stride they fall on and feeds that tier's encoder. Frames the scene holds (waits) are
+    rasterized once per tier and written as many times as that tier needs.
+    """
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.timeline_frames = 0
+
+    def _open(self):
+        for tier in self.renderer.tiers:
+            movie = self.movie_file_path
+            name = f"{movie.stem}_{tier.label}{movie.suffix}" if tier.label else movie.name
+            tier.path = movie.parent.parent / tier.name / name
+            tier.path.parent.mkdir(parents=True, exist_ok=True)
+            tier.sink = make_sink(
+                self.renderer.backend, tier.path, tier.camera.pixel_width, tier.camera.pixel_height, tier.fps,
+            )
+        self.sink = self.renderer.tiers   # marks the writer as open
+        self.frame_queue = Queue(maxsize=self.renderer.queue_depth)
+        self.writer_thread = Thread(target=self._encode_loop, daemon=True)
+        self.writer_thread.start()
+
+    def _encode_loop(self):
+        while True:
+            item = self.frame_queue.get()
+            if item is None:
+                break
+            display_list, background, start, num_frames = item
+            try:
+                if self.writer_error is None:
+                    for tier in self.renderer.tiers:
+                        n = tier.frames_in(start, num_frames)
+                        if n:
+                            tier.set_background(*background)
+                            frame = tier.rasterize(display_list)
+                            for _ in range(n):
+                                tier.sink.write(frame)
+                            tier.frames_written += n
+                    self.frames_written += num_frames
+            except Exception as e:   # reported on the render thread
+                self.writer_error = e
+
+    def write_frame(self, frame, num_frames=1):
+        if not write_to_movie():
+            return
+        self._raise_writer_error()
+        if self.sink is None:
+            self._open()
+        camera = self.renderer.camera
+        background = (camera.background_color, camera.background_opacity)
+        self.frame_queue.put((frame, background, self.timeline_frames, num_frames))
+        self.timeline_frames += num_frames
+
+    def finish(self):
+        if self.sink is not None:
+            self.frame_queue.put(None)
+            self.writer_thread.join()
+            for tier in self.renderer.tiers:
+                tier.sink.close()
+                self.print_file_ready_message(tier.path)
+            self.sink = None
+            self._raise_writer_error()
+            if self.includes_sound:
+                logger.warning("Multi-resolution output does not mux audio; render without it for sound.")
+        if self.subcaptions:
+            self.write_subcaption_file()
+
+
+class MultiResRenderer(CairoRenderer):
+    """
+    CairoRenderer that runs the timeline once, at the highest tier's resolution and frame rate,
+    and hands each frame's display list (see RecordingCameraMixin) to every tier.
+
+    `palettes` (objects with name, remap(rgbas) and remap_color(color)) multiply the outputs:
+    every resolution tier is written once per palette, as <Scene>_<palette name>.mp4.
+    """
+
+    def __init__(self, tiers, queue_depth=4, backend="auto", camera_class=None, palettes=None, **kwargs):
+        kwargs.setdefault("file_writer_class", MultiResFileWriter)
+        super().__init__(camera_class=recording_camera_class(camera_class), **kwargs)
+        self.queue_depth = queue_depth
+        self.backend = backend
+        palettes = list(palettes) if palettes else [None]
+        self.camera.palettes = palettes
+        self.tiers = []
+        for theme, palette in enumerate(palettes):
+            for height, fps in tiers:
+                self.tiers.append(Tier(
+                    len(self.tiers), height, fps, self.camera, self.camera.frame_rate, theme=theme, palette=palette,
+                ))
+        self.camera.raster_cameras = [tier.camera for tier in self.tiers]
+
+    def get_frame(self):
+        return self.camera.end_frame()
+
+
+# ======================= CLI =======================
+def render_multi_res(file, scene, tiers=DEFAULT_TIERS, quality="high_quality", queue_depth=4, backend="auto",
+                     media_dir=None, make_palettes=None):
+    """make_palettes(scene_cls), if given, returns the palettes to render every tier in."""
+    from parallel_render import apply_settings, load_scene_class, default_camera_class
+
+    tiers = parse_tiers(tiers) if isinstance(tiers, str) else list(tiers)
+    apply_settings(dict(file=str(Path(file).absolute()), quality=quality, media_dir=media_dir))
+    # the timeline runs at the largest resolution and the highest frame rate
+    top = max(height for height, _ in tiers)
+    config.pixel_width = math.ceil(top * config.frame_width / config.frame_height / 2) * 2
+    config.pixel_height = top
+    config.frame_rate = max(fps for _, fps in tiers)
+    config.disable_caching = True
+
+    scene_cls = load_scene_class(file, scene)
+    renderer = MultiResRenderer(
+        tiers, queue_depth=queue_depth, backend=backend, camera_class=default_camera_class(scene_cls),
+        palettes=make_palettes(scene_cls) if make_palettes else None,
+    )
+    t0 = time.perf_counter()
+    cpu0 = time.process_time()
+    instance = scene_cls(renderer=renderer)
+    instance.render()
+    wall = time.perf_counter() - t0
+    return dict(
+        scene=scene,
+        timeline=f"{top}p{config.frame_rate:g}",
+        timeline_frames=renderer.file_writer.timeline_frames,
+        wall_s=round(wall, 3),
+        cpu_s=round(time.process_time() - cpu0, 3),
+        peak_rss_mb=round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        outputs={
+            f"{tier.name}/{tier.label}" if tier.label else tier.name: dict(frames=tier.frames_written, path=str(tier.path))
+            for tier in renderer.tiers
+        },
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a scene once into several resolutions and frame rates.")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("--tiers", default=DEFAULT_TIERS, help="comma-separated <height>p<fps> outputs")
+    parser.add_argument("--depth", type=int, default=4, help="frames queued between timeline and rasterizer")
+    parser.add_argument("--backend", choices=["auto", "ffmpeg", "pyav"], default="auto")
+    parser.add_argument("--media-dir")
+    args = parser.parse_args(argv)
+
+    report = render_multi_res(
+        args.file, args.scene, args.tiers, queue_depth=args.depth, backend=args.backend, media_dir=args.media_dir,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
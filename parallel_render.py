@@ -0,0 +1,344 @@
+# parallel_render.py
+# Manim CE 0.19.x compatible
+# Render one deterministic scene on many cores by splitting its timeline into frame ranges
+#
+#   python parallel_render.py agent_inference_tools_v2.py InceptionToolUse3D -j 32 -q l
+#   python parallel_render.py agent_inference_tools_v2.py InceptionToolUse3D -j 8 -q l --verify
+
+from pathlib import Path
+import argparse
+import hashlib
+import importlib.util
+import inspect
+import json
+import multiprocessing as mp
+import sys
+import time
+
+from manim import config, logger
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import to_av_frame_rate
+from manim.utils.exceptions import EndSceneEarlyException
+import av
+import numpy as np
+
+
+# ======================= SCENE LOADING =======================
+def load_scene_class(path, scene_name):
+    """Import a scene file the way the manim CLI does (its folder goes on sys.path)."""
+    path = Path(path).absolute()
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    return getattr(module, scene_name)
+
+
+def default_camera_class(scene_cls):
+    """The camera_class a scene would pick for itself (e.g. ThreeDCamera for ThreeDScene)."""
+    for klass in scene_cls.__mro__:
+        param = inspect.signature(klass.__init__).parameters.get("camera_class")
+        if param is not None and param.default is not inspect.Parameter.empty:
+            return param.default
+    return None
+
+
+def apply_settings(settings):
+    """Configure manim identically in the parent and in every worker."""
+    config.input_file = settings["file"]
+    config.quality = settings["quality"]
+    config.progress_bar = "none"
+    config.preview = False
+    if settings.get("media_dir"):
+        config.media_dir = settings["media_dir"]
+
+
+def frame_digest(frame):
+    return hashlib.sha256(frame.tobytes()).hexdigest()
+
+
+# ======================= ENCODING =======================
+class SegmentWriter:
+    """Encodes RGBA frames to one video segment with manim's partial-movie settings."""
+
+    def __init__(self, path):
+        self.container = av.open(str(path), mode="w")
+        self.stream = self.container.add_stream(
+            "libx264", rate=to_av_frame_rate(config.frame_rate), options={"crf": "23"}
+        )
+        self.stream.pix_fmt = "yuv420p"
+        self.stream.width = config.pixel_width
+        self.stream.height = config.pixel_height
+
+    def write(self, frame, num_frames=1):
+        for _ in range(num_frames):
+            # a fresh VideoFrame per encode; PyAV consumes it
+            av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+            for packet in self.stream.encode(av_frame):
+                self.container.mux(packet)
+
+    def close(self):
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+
+
+def concat_segments(files, output):
+    """Stitch segments with the concat demuxer (remux only, no re-encode)."""
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    file_list = output.with_suffix(".segments.txt")
+    file_list.write_text("".join(f"file 'file:{Path(f).absolute().as_posix()}'\n" for f in files))
+    with av.open(str(file_list), format="concat", options={"safe": "0"}) as src:
+        src_stream = src.streams.video[0]
+        with av.open(str(output), mode="w") as dst:
+            dst_stream = dst.add_stream(template=src_stream)
+            for packet in src.demux(src_stream):
+                if packet.dts is None:
+                    continue
+                packet.dts = None
+                packet.stream = dst_stream
+                dst.mux(packet)
+    file_list.unlink()
+    return output
+
+
+# ======================= RENDERERS =======================
+class TimelineRangeRenderer(CairoRenderer):
+    """
+    Renders only frames [start, end) of a scene; every other frame is fast-forwarded.
+
+    Fast-forwarded frames run the same update_to_time/updater calls with the same dt and
+    scene.time arithmetic as CairoRenderer, but skip capture and encoding. Rasterization
+    inside the range follows CairoRenderer.play exactly (static image per play, moving
+    mobjects per frame), so frames are bit-identical to a serial render.
+    end=None counts frames without rendering any.
+
+    During a play that ends before the range, `time_driven` mobjects (TokenStream) have
+    their updaters suspended; on the play's last frame they are resumed and updated once,
+    which seeks them to where the per-frame updates would have left them.
+    """
+
+    def __init__(self, start=0, end=None, out_path=None, record_digests=False, **kwargs):
+        super().__init__(**kwargs)
+        self.start = start
+        self.end = end
+        self.frame_index = 0
+        self.digests = []
+        self.record_digests = record_digests
+        self.seeking = []
+        self.play_end = 0
+        self.writer = SegmentWriter(out_path) if (out_path and end is not None and end > start) else None
+
+    def in_range(self, first, last):
+        return self.end is not None and first < self.end and last > self.start
+
+    def _emit(self, frame, num_frames):
+        lo = max(self.frame_index, self.start)
+        hi = min(self.frame_index + num_frames, self.end) if self.end is not None else lo
+        if frame is not None and hi > lo:
+            if self.writer is not None:
+                self.writer.write(frame, hi - lo)
+            if self.record_digests:
+                self.digests.extend([frame_digest(frame)] * (hi - lo))
+        # same arithmetic as CairoRenderer.add_frame
+        dt = 1 / self.camera.frame_rate
+        self.time += num_frames * dt
+        self.frame_index += num_frames
+
+    def play(self, scene, *args, **kwargs):
+        scene.compile_animation_data(*args, **kwargs)
+        scene.begin_animations()
+        frozen = scene.is_current_animation_frozen_frame()
+        dt = 1 / self.camera.frame_rate
+        # frame counts as in freeze_current_frame / Scene.get_time_progression
+        n_frames = int(scene.duration / dt) if frozen else len(np.arange(0, scene.duration, dt))
+
+        self.static_image = None
+        if self.in_range(self.frame_index, self.frame_index + n_frames):
+            self.save_static_frame_data(scene, scene.static_mobjects)
+
+        if frozen:
+            frame = None
+            if self.in_range(self.frame_index, self.frame_index + n_frames):
+                self.update_frame(scene, mobjects=scene.moving_mobjects)
+                frame = self.get_frame()
+            self._emit(frame, n_frames)
+        else:
+            self.play_end = self.frame_index + n_frames
+            if self.play_end < self.start:
+                self.seeking = [
+                    m for m in scene.get_mobject_family_members()
+                    if getattr(m, "time_driven", False) and not m.updating_suspended
+                ]
+                for mob in self.seeking:
+                    mob.suspend_updating()
+            try:
+                scene.play_internal()
+            finally:
+                self._resume_seeking()
+        self.num_plays += 1
+        self._stop_if_done()
+
+    def _resume_seeking(self):
+        seeking, self.seeking = self.seeking, []
+        for mob in seeking:
+            mob.resume_updating()   # runs its updaters once: seek(scene.time)
+
+    def render(self, scene, time, moving_mobjects):
+        if self.seeking and self.frame_index + 1 >= self.play_end:
+            self._resume_seeking()   # before the last frame is emitted, as update_to_time left it
+        frame = None
+        if self.in_range(self.frame_index, self.frame_index + 1):
+            self.update_frame(scene, moving_mobjects)
+            frame = self.get_frame()
+        self._emit(frame, 1)
+        self._stop_if_done()
+
+    def _stop_if_done(self):
+        if self.end is not None and self.frame_index >= self.end:
+            raise EndSceneEarlyException()
+
+    def scene_finished(self, scene):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class DigestRecordingRenderer(CairoRenderer):
+    """Plain serial CairoRenderer that also records a digest of every written frame."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.digests = []
+
+    def add_frame(self, frame, num_frames=1):
+        if not self.skip_animations:
+            self.digests.extend([frame_digest(frame)] * num_frames)
+        super().add_frame(frame, num_frames)
+
+
+# ======================= WORKERS =======================
+def _build_scene(settings, renderer_cls, **renderer_kwargs):
+    apply_settings(settings)
+    scene_cls = load_scene_class(settings["file"], settings["scene"])
+    renderer = renderer_cls(camera_class=default_camera_class(scene_cls), **renderer_kwargs)
+    return scene_cls(renderer=renderer)
+
+
+def _count_frames(settings):
+    scene = _build_scene(settings, TimelineRangeRenderer, start=0, end=None)
+    scene.render()
+    return scene.renderer.frame_index
+
+
+def _render_range(job):
+    settings, start, end, out_path = job
+    t0 = time.perf_counter()
+    scene = _build_scene(
+        settings, TimelineRangeRenderer,
+        start=start, end=end, out_path=out_path, record_digests=settings["verify"],
+    )
+    scene.render()
+    return dict(start=start, end=end, path=out_path, seconds=time.perf_counter() - t0, digests=scene.renderer.digests)
+
+
+def _render_serial(settings):
+    t0 = time.perf_counter()
+    config.disable_caching = True  # a cached play would skip its frames
+    scene = _build_scene(settings, DigestRecordingRenderer)
+    scene.render()
+    return dict(seconds=time.perf_counter() - t0, digests=scene.renderer.digests)
+
+
+# ======================= DRIVER =======================
+def split_frames(n_frames, jobs):
+    bounds = [round(i * n_frames / jobs) for i in range(jobs + 1)]
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def render_parallel(file, scene, jobs, quality="low_quality", output=None, verify=False, media_dir=None):
+    settings = dict(file=str(Path(file).absolute()), scene=scene, quality=quality, verify=verify, media_dir=media_dir)
+    apply_settings(settings)
+    module_name = Path(file).stem
+    video_dir = config.get_dir("video_dir", module_name=module_name)
+    output = Path(output) if output else video_dir / f"{scene}_parallel.mp4"
+    segment_dir = video_dir / "parallel_segments" / scene
+    segment_dir.mkdir(parents=True, exist_ok=True)
+
+    ctx = mp.get_context("spawn")
+    t0 = time.perf_counter()
+    with ctx.Pool(1) as pool:
+        n_frames = pool.apply(_count_frames, (settings,))
+    count_s = time.perf_counter() - t0
+
+    ranges = split_frames(n_frames, jobs)
+    work = [(settings, a, b, str(segment_dir / f"seg_{i:04}.mp4")) for i, (a, b) in enumerate(ranges)]
+    with ctx.Pool(len(work)) as pool:
+        results = pool.map(_render_range, work)
+    concat_segments([r["path"] for r in results], output)
+    parallel_s = time.perf_counter() - t0
+
+    report = dict(
+        scene=scene,
+        quality=quality,
+        frames=n_frames,
+        jobs=len(work),
+        count_pass_s=round(count_s, 3),
+        parallel_s=round(parallel_s, 3),
+        worker_s=[round(r["seconds"], 3) for r in results],
+        output=str(output),
+    )
+    logger.info(f"Parallel render: {n_frames} frames in {parallel_s:.2f}s on {len(work)} workers -> {output}")
+
+    if verify:
+        with ctx.Pool(1) as pool:
+            serial = pool.apply(_render_serial, (settings,))
+        parallel_digests = [d for r in results for d in r["digests"]]
+        mismatches = [
+            i for i, (a, b) in enumerate(zip(serial["digests"], parallel_digests)) if a != b
+        ]
+        report.update(
+            serial_s=round(serial["seconds"], 3),
+            speedup=round(serial["seconds"] / parallel_s, 2) if parallel_s else None,
+            serial_frames=len(serial["digests"]),
+            frames_identical=(len(serial["digests"]) == len(parallel_digests) and not mismatches),
+            first_mismatch=mismatches[0] if mismatches else None,
+        )
+    return report
+
+
+QUALITY_FLAGS = {
+    "low_quality": "l",
+    "medium_quality": "m",
+    "high_quality": "h",
+    "production_quality": "p",
+    "fourk_quality": "k",
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render one scene in parallel by splitting its timeline into frame ranges."
+    )
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-j", "--jobs", type=int, default=mp.cpu_count())
+    parser.add_argument("-q", "--quality", default="l", help="l, m, h, p or k (as in manim -q)")
+    parser.add_argument("-o", "--output")
+    parser.add_argument("--media-dir")
+    parser.add_argument("--verify", action="store_true", help="also render serially and compare frame digests")
+    args = parser.parse_args(argv)
+
+    quality = next(q for q, v in QUALITY_FLAGS.items() if v == args.quality)
+    report = render_parallel(
+        args.file, args.scene, args.jobs, quality, args.output, args.verify, args.media_dir
+    )
+    print(json.dumps(report, indent=2))
+    if args.verify and not report["frames_identical"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
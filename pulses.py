@@ -0,0 +1,208 @@
+# pulses.py
+# Manim CE 0.19.x compatible
+# Pulses along Bezier paths: a pooled emitter for event-driven pulses, and one batched
+# animation for a whole fan-out of concurrent tool calls
+
+from manim import Animation, Mobject, VGroup, VMobject, Sphere, WHITE, linear, smooth
+from manim.utils.simple_functions import sigmoid
+import numpy as np
+
+from geometry_cache import GEOMETRY_CACHE
+from bezier_paths import attach_arc_length_table, arched_curves, BatchArcLengthTable
+from token_stream import bind_face_points
+
+
+class PulseEmitter(VGroup):
+    """
+    Fixed-size pool of pulse dots moving along Bezier paths.
+
+    emit() takes a free dot from the pool, colors it and makes it (and, by default, its
+    path) a submobject for the duration of the trip. When the trip ends both are removed
+    again, so finished pulses are neither rendered nor depth-sorted, and the object count
+    stays bounded by `pool_size` however many pulses a scene emits. When every dot is in
+    flight, further emits are dropped and counted.
+
+    The emitter moves its pulses from its own dt updater: add it to the scene once and
+    keep time running (self.wait / any play) while pulses are in flight.
+    """
+
+    def __init__(self, pool_size=16, radius=0.06, resolution=(16, 16), stroke_color=WHITE, **kwargs):
+        super().__init__(**kwargs)
+        template = GEOMETRY_CACHE.get(
+            Sphere, radius=radius, resolution=resolution, fill_opacity=1,
+            fill_color=WHITE, stroke_width=0.5, stroke_color=stroke_color,
+        )
+        self.pool_size = pool_size
+        self.free = [template.copy() for _ in range(pool_size)]
+        self.active = []        # in flight: dict(dot, table, path, elapsed, run_time, rate_func, pos)
+        self.path_users = {}    # id(path) -> number of active pulses showing it
+        self.emitted = 0
+        self.dropped = 0
+        self.peak_live = 0
+        self.add_updater(lambda m, dt: m.advance(dt))
+
+    @property
+    def busy(self):
+        return bool(self.active)
+
+    def emit(self, path, color, run_time=1.0, rate_func=smooth, show_path=True):
+        """Send one pulse along `path` (a CubicBezier); returns False if the pool is exhausted."""
+        if not self.free:
+            self.dropped += 1
+            return False
+        if not hasattr(path, "arc_table"):
+            attach_arc_length_table(path)
+        dot = self.free.pop()
+        dot.set_fill(color)
+        start = path.arc_table.point_at(rate_func(0.0))
+        dot.shift(start - dot.get_center())
+        pulse = dict(dot=dot, table=path.arc_table, path=path if show_path else None, elapsed=0.0,
+                     run_time=run_time, rate_func=rate_func, pos=start)
+        if show_path:
+            if self.path_users.get(id(path), 0) == 0:
+                self.add(path)
+            self.path_users[id(path)] = self.path_users.get(id(path), 0) + 1
+        self.add(dot)
+        self.active.append(pulse)
+        self.emitted += 1
+        self.peak_live = max(self.peak_live, len(self.active))
+        return True
+
+    def advance(self, dt):
+        """Move every pulse in flight by dt; finished pulses go back to the pool."""
+        if not self.active:
+            return self
+        still = []
+        for pulse in self.active:
+            pulse["elapsed"] += dt
+            if pulse["elapsed"] >= pulse["run_time"] + 1e-9:
+                self._retire(pulse)
+                continue
+            alpha = pulse["rate_func"](pulse["elapsed"] / pulse["run_time"])
+            target = pulse["table"].point_at(alpha)
+            pulse["dot"].shift(target - pulse["pos"])
+            pulse["pos"] = target
+            still.append(pulse)
+        self.active = still
+        return self
+
+    def _retire(self, pulse):
+        self.remove(pulse["dot"])
+        self.free.append(pulse["dot"])
+        path = pulse["path"]
+        if path is not None:
+            self.path_users[id(path)] -= 1
+            if self.path_users[id(path)] == 0:
+                del self.path_users[id(path)]
+                self.remove(path)
+
+    def stats(self):
+        return dict(
+            pool_size=self.pool_size, live=len(self.active), peak_live=self.peak_live,
+            emitted=self.emitted, dropped=self.dropped,
+        )
+
+
+# ======================= BATCHED FAN-OUT =======================
+def _smooth_array(t, inflection=10.0):
+    # manim's smooth(), elementwise
+    error = sigmoid(-inflection / 2)
+    return np.clip((1.0 / (1.0 + np.exp(-inflection * (t - 0.5))) - error) / (1 - 2 * error), 0.0, 1.0)
+
+
+def eval_rate_func(rate_func, alphas):
+    """rate_func over an array of alphas (vectorized for smooth/linear, elementwise otherwise)."""
+    if rate_func is smooth:
+        return _smooth_array(alphas)
+    if rate_func is linear:
+        return alphas
+    return np.array([rate_func(a) for a in alphas], dtype=float)
+
+
+class PulseBatch(VGroup):
+    """
+    n pulse dots (copies of one cached Sphere per color) whose face points are views into one
+    (n, n_points, 3) buffer, plus an optional single VMobject holding all n paths as subpaths.
+    move_to_points() repositions every dot with one in-place add.
+    """
+
+    def __init__(self, positions, colors, radius=0.06, resolution=(8, 8), paths=None, **kwargs):
+        self.positions = np.array(positions, dtype=float).reshape(-1, 3)
+        templates = {}
+        for color in dict.fromkeys(colors):
+            templates[color] = GEOMETRY_CACHE.get(
+                Sphere, radius=1.0, resolution=resolution, fill_opacity=1,
+                fill_color=color, stroke_width=0.5, stroke_color=WHITE,
+            )
+        self.dots = VGroup(*[templates[c].copy() for c in colors])
+        super().__init__(*([paths] if paths is not None else []), self.dots, **kwargs)
+
+        unit = np.concatenate([f.points for f in templates[colors[0]]], axis=0)
+        self._buffer = unit[None, :, :] * radius + self.positions[:, None, :]
+        bind_face_points(self.dots.submobjects, self._buffer, copy_in=False)
+
+    def __deepcopy__(self, clone_from_id):
+        result = super().__deepcopy__(clone_from_id)
+        bind_face_points(result.dots.submobjects, result._buffer, copy_in=True)
+        return result
+
+    def move_to_points(self, positions):
+        self._buffer += (positions - self.positions)[:, None, :]
+        self.positions[:] = positions
+        return self
+
+
+class FanOutPulses(Animation):
+    """
+    Many concurrent pulses as ONE animation: pulse i travels the arched Bezier from origins[i]
+    to destinations[i] (any of the per-pulse arguments may be a single value).
+
+    Every frame is one vectorized step for the whole batch: per-pulse alphas, the rate
+    function, one batched arc-length lookup and one in-place move of all dot points.
+    offsets[i] in [0, 1) delays pulse i by that fraction of run_time; each pulse then runs
+    for the remaining (1 - max(offsets)) of it, with the rate function applied per pulse, so
+    with zero offsets this matches one smooth UpdateFromAlphaFunc per pulse. The dots and
+    paths are removed from the scene when the animation ends (remover=True).
+    """
+
+    def __init__(
+        self,
+        origins,
+        destinations,
+        colors,
+        offsets=0.0,
+        arch_out=0.8,
+        arch_down=0.6,
+        radius=0.06,
+        resolution=(8, 8),
+        show_paths=True,
+        path_color="#1b2a35",
+        path_opacity=0.25,
+        path_width=1.5,
+        rate_func=smooth,
+        remover=True,
+        **kwargs,
+    ):
+        curves = arched_curves(origins, destinations, arch_out, arch_down)
+        n = len(curves)
+        colors = [colors] * n if isinstance(colors, str) else list(colors)
+        self.offsets = np.broadcast_to(np.asarray(offsets, dtype=float), (n,))
+        self.span = max(1.0 - float(self.offsets.max()), 1e-6)
+        self.table = BatchArcLengthTable(curves)
+
+        paths = None
+        if show_paths:
+            paths = VMobject(stroke_color=path_color, stroke_width=path_width, stroke_opacity=path_opacity, fill_opacity=0)
+            paths.points = curves.reshape(-1, 3).copy()   # one subpath per pulse
+        batch = PulseBatch(curves[:, 0], colors, radius=radius, resolution=resolution, paths=paths)
+        super().__init__(batch, rate_func=rate_func, remover=remover, **kwargs)
+
+    def create_starting_mobject(self):
+        return Mobject()   # interpolate() never reads a starting copy; skip copying n spheres
+
+    def update_mobjects(self, dt):
+        pass   # the dots carry no updaters; don't walk every face of every dot per frame
+
+    def interpolate(self, alpha):
+        local = np.clip((alpha - self.offsets) / self.span, 0.0, 1.0)
+        self.mobject.move_to_points(self.table.points_at(eval_rate_func(self.rate_func, local)))
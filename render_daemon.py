@@ -0,0 +1,341 @@
+# render_daemon.py
+# Manim CE 0.19.x compatible
+# Warm render server: manim, fonts and geometry/text caches stay loaded; watched scenes re-render on save
+#
+#   python render_daemon.py serve &                                              # start once
+#   python render_daemon.py render agent_inference_tools_v2.py InceptionToolUse3D -q l --watch -p
+#   python render_daemon.py status
+#   python render_daemon.py stop
+
+from pathlib import Path
+from queue import Queue
+from threading import Event, Lock, Thread
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+import traceback
+
+DEFAULT_SOCKET = Path.home() / ".cache" / "agent_inference" / "render.sock"
+
+
+def socket_path():
+    return Path(os.environ.get("AGENT_DAEMON_SOCKET", DEFAULT_SOCKET))
+
+
+# ======================= MODULE TRACKING =======================
+def local_imports(module, root):
+    """Modules under `root` that `module` imports directly (as modules or through their names)."""
+    deps = []
+    for value in list(vars(module).values()):
+        name = value.__name__ if isinstance(value, type(sys)) else getattr(value, "__module__", None)
+        dep = sys.modules.get(name) if isinstance(name, str) else None
+        dep_file = getattr(dep, "__file__", None)
+        if dep is not module and dep_file and Path(dep_file).resolve().is_relative_to(root):
+            deps.append(dep)
+    return deps
+
+
+def local_dependencies(module, root, seen=None):
+    """Files of `module` and of every module under `root` it imports, directly or not."""
+    seen = set() if seen is None else seen
+    path = getattr(module, "__file__", None)
+    if path is None or module.__name__ in seen:
+        return seen
+    seen.add(module.__name__)
+    for dep in local_imports(module, root):
+        local_dependencies(dep, root, seen)
+    return seen
+
+
+def _files(module_names):
+    return {
+        name: Path(sys.modules[name].__file__).resolve()
+        for name in module_names
+        if name in sys.modules and getattr(sys.modules[name], "__file__", None)
+    }
+
+
+def _mtimes(files):
+    out = {}
+    for name, path in files.items():
+        try:
+            out[name] = path.stat().st_mtime_ns
+        except OSError:
+            out[name] = None
+    return out
+
+
+# ======================= SERVER =======================
+class RenderDaemon:
+    """
+    Renders jobs one at a time in this long-lived process.
+
+    A job is (file, scene, quality). The scene file is re-imported for every render. Local
+    helper modules (those under the scene's folder) are imported once and kept, so their
+    caches (geometry, text) stay warm between renders; when one of their files changes, that
+    module and the local modules importing it are dropped and re-imported. Watched jobs are re-rendered when a file
+    they depend on changes, and only those.
+    """
+
+    def __init__(self, poll_interval=0.5):
+        self.poll_interval = poll_interval
+        self.jobs = Queue()
+        self.watched = {}      # (file, scene, quality) -> dict(files, mtimes, job)
+        self.scene_modules = set()   # scene files' module names; re-imported by every render
+        self.lock = Lock()
+        self.history = []
+        self.started = time.time()
+        self.stopping = Event()
+
+    def warm_up(self):
+        """Pay the import and font loading cost once."""
+        t0 = time.perf_counter()
+        import manim   # noqa: F401  (the expensive import)
+        import manimpango
+        from manim import Text
+
+        manimpango.list_fonts()
+        Text("warm", font="DejaVu Sans")   # loads the Pango font map and the default font
+        self.warm_up_s = round(time.perf_counter() - t0, 3)
+        print(f"render daemon: manim and fonts loaded in {self.warm_up_s}s", flush=True)
+
+    # ---------- rendering ----------
+    def _local_modules(self, root):
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None)
+            if name not in ("__main__", __name__) and path and Path(path).resolve().is_relative_to(root):
+                yield name, module, Path(path)
+
+    def _evict_changed_modules(self, root):
+        """Drop local helper modules changed on disk, and the local modules importing them."""
+        local = [
+            (name, module, path) for name, module, path in self._local_modules(root)
+            if name not in self.scene_modules   # load_scene_class re-executes those anyway
+        ]
+        changed = []
+        for name, module, path in local:
+            stamp = getattr(module, "__daemon_mtime__", None)
+            try:
+                if stamp is not None and path.stat().st_mtime_ns != stamp:
+                    changed.append(name)
+            except OSError:
+                changed.append(name)
+        stale = set(changed)
+        while True:
+            importers = {
+                name for name, module, _ in local
+                if name not in stale and any(dep.__name__ in stale for dep in local_imports(module, root))
+            }
+            if not importers:
+                break
+            stale |= importers
+        for name in stale:
+            del sys.modules[name]
+        return sorted(stale)
+
+    def _stamp_modules(self, root):
+        for _, module, path in self._local_modules(root):
+            if getattr(module, "__daemon_mtime__", None) is None:
+                try:
+                    module.__daemon_mtime__ = path.stat().st_mtime_ns
+                except OSError:
+                    pass
+
+    def render(self, file, scene, quality="low_quality", preview=False, media_dir=None):
+        from manim import tempconfig
+        from manim.utils.file_ops import open_file
+        from parallel_render import load_scene_class
+
+        file = Path(file).resolve()
+        root = file.parent
+        t0 = time.perf_counter()
+        reloaded = self._evict_changed_modules(root)
+        settings = dict(input_file=str(file), quality=quality, progress_bar="none", preview=False)
+        if media_dir:
+            settings["media_dir"] = media_dir
+        with tempconfig(settings):
+            scene_cls = load_scene_class(file, scene)
+            self.scene_modules.add(file.stem)
+            self._stamp_modules(root)
+            instance = scene_cls()
+            instance.render()
+            output = instance.renderer.file_writer.movie_file_path
+        deps = local_dependencies(sys.modules[file.stem], root)
+        result = dict(
+            file=str(file), scene=scene, quality=quality, ok=True,
+            seconds=round(time.perf_counter() - t0, 3), output=str(output),
+            reloaded=reloaded, dependencies=sorted(str(p) for p in _files(deps).values()),
+        )
+        if preview and output:
+            open_file(output)
+        return result, deps
+
+    def _run(self, job):
+        key = (job["file"], job["scene"], job["quality"])
+        try:
+            result, deps = self.render(
+                job["file"], job["scene"], job["quality"], job.get("preview", False), job.get("media_dir"),
+            )
+            if job.get("watch"):
+                files = _files(deps)
+                with self.lock:
+                    self.watched[key] = dict(files=files, mtimes=_mtimes(files), job=dict(job, watch=False))
+        except Exception as e:   # a broken scene must not take the daemon down
+            result = dict(file=job["file"], scene=job["scene"], quality=job["quality"], ok=False,
+                          error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc())
+            if job.get("watch"):
+                # keep watching the scene file so fixing the error triggers a render
+                files = {Path(job["file"]).stem: Path(job["file"]).resolve()}
+                with self.lock:
+                    self.watched[key] = dict(files=files, mtimes=_mtimes(files), job=dict(job, watch=False))
+        result["trigger"] = job.get("trigger", "request")
+        self.history.append(result)
+        del self.history[:-50]
+        status = "ok" if result["ok"] else result["error"]
+        print(f"render daemon: {job['scene']} ({result['trigger']}) {result.get('seconds', '-')}s {status}", flush=True)
+        return result
+
+    def worker(self):
+        while not self.stopping.is_set():
+            job, done = self.jobs.get()
+            if job is None:
+                break
+            result = self._run(job)
+            if done is not None:
+                done["result"] = result
+                done["event"].set()
+
+    def watcher(self):
+        while not self.stopping.wait(self.poll_interval):
+            with self.lock:
+                entries = list(self.watched.values())
+            for entry in entries:
+                mtimes = _mtimes(entry["files"])
+                if mtimes != entry["mtimes"]:
+                    entry["mtimes"] = mtimes
+                    self.jobs.put((dict(entry["job"], trigger="file changed", watch=True), None))
+
+    def submit(self, job):
+        done = dict(event=Event())
+        self.jobs.put((job, done))
+        done["event"].wait()
+        return done["result"]
+
+    def status(self):
+        with self.lock:
+            watched = [dict(file=k[0], scene=k[1], quality=k[2]) for k in self.watched]
+        return dict(
+            pid=os.getpid(), uptime_s=round(time.time() - self.started, 1), warm_up_s=self.warm_up_s,
+            queued=self.jobs.qsize(), watched=watched, recent=self.history[-5:],
+        )
+
+    def unwatch(self, file, scene=None):
+        file = str(Path(file).resolve())
+        with self.lock:
+            for key in [k for k in self.watched if k[0] == file and scene in (None, k[1])]:
+                del self.watched[key]
+
+    def serve(self, path):
+        self.warm_up()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    reply = self.dispatch(json.loads(self.rfile.readline()))
+                except Exception as e:
+                    reply = dict(ok=False, error=f"{type(e).__name__}: {e}")
+                self.wfile.write((json.dumps(reply) + "\n").encode())
+
+            def dispatch(self, request):
+                cmd = request.pop("cmd")
+                if cmd == "render":
+                    from parallel_render import QUALITY_FLAGS
+
+                    flag = request["quality"]
+                    request["quality"] = next((q for q, v in QUALITY_FLAGS.items() if v == flag), flag)
+                    return daemon.submit(request)
+                if cmd == "status":
+                    return daemon.status()
+                if cmd == "unwatch":
+                    daemon.unwatch(request["file"], request.get("scene"))
+                    return daemon.status()
+                if cmd == "stop":
+                    daemon.stopping.set()
+                    daemon.jobs.put((None, None))
+                    Thread(target=server.shutdown, daemon=True).start()
+                    return dict(stopping=True)
+                return dict(ok=False, error=f"unknown command {cmd!r}")
+
+        Thread(target=self.worker, daemon=True).start()
+        Thread(target=self.watcher, daemon=True).start()
+        with socketserver.ThreadingUnixStreamServer(str(path), Handler) as server:
+            print(f"render daemon: listening on {path}", flush=True)
+            try:
+                server.serve_forever()
+            finally:
+                path.unlink(missing_ok=True)
+
+
+# ======================= CLIENT =======================
+def request(payload, path=None):
+    path = path or socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            sys.exit(f"no render daemon at {path}; start one with: python render_daemon.py serve")
+        s.sendall((json.dumps(payload) + "\n").encode())
+        return json.loads(s.makefile().readline())
+
+
+def main(argv=None):
+    # the client stays import-light: no manim here
+    parser = argparse.ArgumentParser(description="Warm manim render server and its client.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_serve = sub.add_parser("serve", help="start the daemon in this process")
+    p_serve.add_argument("--poll", type=float, default=0.5, help="seconds between file checks")
+    p_render = sub.add_parser("render", help="render a scene in the daemon")
+    p_render.add_argument("file")
+    p_render.add_argument("scene")
+    p_render.add_argument("-q", "--quality", default="l", help="l, m, h, p or k (as in manim -q)")
+    p_render.add_argument("-p", "--preview", action="store_true", help="open the movie when done")
+    p_render.add_argument("--watch", action="store_true", help="re-render whenever the scene or its helpers change")
+    p_render.add_argument("--media-dir")
+    p_unwatch = sub.add_parser("unwatch", help="stop watching a file (or one scene of it)")
+    p_unwatch.add_argument("file")
+    p_unwatch.add_argument("scene", nargs="?")
+    sub.add_parser("status")
+    sub.add_parser("stop")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "serve":
+        RenderDaemon(poll_interval=args.poll).serve(socket_path())
+        return
+    if args.cmd == "render":
+        payload = dict(
+            cmd="render", file=str(Path(args.file).resolve()), scene=args.scene, quality=args.quality,
+            preview=args.preview, watch=args.watch, media_dir=args.media_dir,
+        )
+    elif args.cmd == "unwatch":
+        payload = dict(cmd="unwatch", file=str(Path(args.file).resolve()), scene=args.scene)
+    else:
+        payload = dict(cmd=args.cmd)
+    t0 = time.perf_counter()
+    reply = request(payload)
+    if args.cmd == "render":
+        reply["client_s"] = round(time.perf_counter() - t0, 3)
+    print(json.dumps(reply, indent=2))
+    if reply.get("ok") is False:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
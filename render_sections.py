@@ -0,0 +1,241 @@
+# render_sections.py
+# Manim CE 0.19.x compatible
+# Section-level render cache: unchanged beats of construct() reuse their encoded segment
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import textwrap
+
+from manim import config, logger, __version__ as MANIM_VERSION
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.section import DefaultSectionType
+from manim.utils.file_ops import write_to_movie
+import numpy as np
+
+SECTION_CACHE_VERSION = 1
+
+
+def section_cache_enabled():
+    """On by default; AGENT_SECTION_CACHE=0 or manim's --disable_caching turn it off."""
+    return (
+        os.environ.get("AGENT_SECTION_CACHE", "1") != "0"
+        and not config.disable_caching
+        and write_to_movie()
+    )
+
+
+def scene_state_digest(scene, h=None):
+    """Hash of everything a later beat can see: time, camera, and every mobject's points/colors."""
+    h = h or hashlib.sha256()
+    camera = scene.camera
+    h.update(repr(round(scene.time, 9)).encode())
+    for name in ("get_phi", "get_theta", "get_gamma", "get_zoom", "get_focal_distance"):
+        if hasattr(camera, name):
+            h.update(repr(float(getattr(camera, name)())).encode())
+    h.update(str(camera.background_color).encode())
+    for mob in scene.get_mobject_family_members():
+        h.update(type(mob).__name__.encode())
+        h.update(np.ascontiguousarray(mob.points).tobytes())
+        for attr in ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas"):
+            arr = getattr(mob, attr, None)
+            if arr is not None:
+                h.update(np.ascontiguousarray(arr).tobytes())
+        h.update(repr(getattr(mob, "stroke_width", None)).encode())
+        h.update(repr(getattr(mob, "z_index", 0)).encode())
+    return h
+
+
+def _section_sources(code):
+    """
+    Split the source of `code` at its cached_section(...) calls.
+
+    Returns (preamble, {start_line: source}) where each section's source also carries the
+    functions defined in earlier sections (helpers declared mid-construct and used later).
+    """
+    lines, _ = inspect.getsourcelines(code)
+    source = textwrap.dedent("".join(lines))
+    tree = ast.parse(source)
+    starts = sorted(
+        node.lineno - 1
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "cached_section"
+    )
+    if not starts:
+        return "".join(lines), {}
+    defs = [
+        (node.lineno - 1, ast.get_source_segment(source, node))
+        for node in ast.walk(tree)
+        if isinstance(node, ast.FunctionDef) and node.lineno - 1 >= starts[0]
+    ]
+    bounds = starts + [len(lines)]
+    sections = {}
+    for start, end in zip(bounds, bounds[1:]):
+        earlier = "".join(seg + "\n" for line, seg in sorted(defs) if line < start and seg)
+        sections[start] = earlier + "".join(lines[start:end])
+    return "".join(lines[: starts[0]]), sections
+
+
+class SectionCachingRenderer(CairoRenderer):
+    """
+    CairoRenderer that can replay a section without rasterizing or encoding it.
+
+    Replayed sections step through every frame exactly like a real render (same dt, same
+    updaters, same scene.time), so the scene state at the next section is bit-identical.
+    Only capture and encoding are skipped; the section's cached segment is put in place of
+    its partial movie files and the final file is concatenated by manim without re-encoding.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replaying = False
+        self._section = None
+        self._fresh_sections = []
+        self.section_log = []
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        self.section_cache_dir = None
+        if hasattr(self.file_writer, "partial_movie_directory"):
+            self.section_cache_dir = (
+                self.file_writer.partial_movie_directory.parent.parent
+                / "section_cache"
+                / scene.__class__.__name__
+            )
+
+    def begin_cached_section(self, name, key):
+        self._close_section()
+        path = self.section_cache_dir / f"{key}{config.movie_file_extension}"
+        cached = path.exists()
+        self._section = dict(name=name, key=key, path=path, first_play=self.num_plays, cached=cached)
+        self.replaying = cached
+        self.section_log.append(dict(name=name, key=key[:12], cached=cached))
+        logger.info(f"Section '{name}': {'reusing cached segment' if cached else 'rendering'} ({key[:12]})")
+        self.file_writer.next_section(name, DefaultSectionType.NORMAL, skip_animations=False)
+
+    def _close_section(self):
+        section, self._section = self._section, None
+        self.replaying = False
+        if section is None or section["cached"]:
+            return
+        files = [
+            f for f in self.file_writer.partial_movie_files[section["first_play"]:self.num_plays]
+            if f is not None
+        ]
+        if files:
+            self._fresh_sections.append((files, section["path"]))
+
+    # ---- replay: advance the timeline, skip capture/encoding ----
+    def play(self, scene, *args, **kwargs):
+        if not self.replaying:
+            return super().play(scene, *args, **kwargs)
+
+        scene.compile_animation_data(*args, **kwargs)
+        first = self.num_plays == self._section["first_play"]
+        # one entry per play keeps partial_movie_files indexed by num_plays
+        segment = str(self._section["path"]) if first else None
+        self.file_writer.partial_movie_files.append(segment)
+        self.file_writer.sections[-1].partial_movie_files.append(segment)
+        self.animations_hashes.append(None)
+
+        scene.begin_animations()
+        if scene.is_current_animation_frozen_frame():
+            self.freeze_current_frame(scene.duration)
+        else:
+            scene.play_internal()
+        self.num_plays += 1
+
+    def update_frame(self, *args, **kwargs):
+        if not self.replaying:
+            super().update_frame(*args, **kwargs)
+
+    def get_frame(self):
+        return None if self.replaying else super().get_frame()
+
+    def add_frame(self, frame, num_frames=1):
+        if not self.replaying:
+            return super().add_frame(frame, num_frames)
+        # same arithmetic as CairoRenderer.add_frame, so scene.time stays bit-identical
+        dt = 1 / self.camera.frame_rate
+        self.time += num_frames * dt
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        if self.replaying:
+            self.static_image = None
+            return None
+        return super().save_static_frame_data(scene, static_mobjects)
+
+    def scene_finished(self, scene):
+        self._close_section()
+        # store freshly rendered sections before manim combines (and may clean) partial files
+        for files, path in self._fresh_sections:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.stem}.tmp{path.suffix}")
+            self.file_writer.combine_files(files, tmp)
+            os.replace(tmp, path)
+        self._fresh_sections = []
+        super().scene_finished(scene)
+
+
+class SectionCacheMixin:
+    """
+    Scene mixin adding `self.cached_section(name, **inputs)`.
+
+    Like manim's next_section, a call marks the start of a beat that runs until the next
+    call (or the end of construct). Its key hashes the beat's source code, the code before
+    the first beat (helpers/theme), `inputs`, the render settings and the scene state at
+    its start. A beat whose key is unchanged is replayed from its cached segment.
+    Edits to imported helper modules are not tracked; set AGENT_SECTION_CACHE=0 to force.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if (
+            type(self.renderer) is CairoRenderer
+            and section_cache_enabled()
+        ):
+            self.renderer = SectionCachingRenderer(
+                camera_class=self.camera_class,
+                skip_animations=self.skip_animations,
+            )
+            self.renderer.init_scene(self)
+
+    def cached_section(self, name, **inputs):
+        renderer = self.renderer
+        if not isinstance(renderer, SectionCachingRenderer) or renderer.section_cache_dir is None:
+            self.next_section(name)
+            return
+
+        caller = inspect.currentframe().f_back
+        code = caller.f_code
+        if not hasattr(self, "_section_source_cache"):
+            self._section_source_cache = {}
+        if code not in self._section_source_cache:
+            self._section_source_cache[code] = _section_sources(code)
+        preamble, sources = self._section_source_cache[code]
+        own = sources.get(caller.f_lineno - code.co_firstlineno, "")
+
+        h = hashlib.sha256()
+        h.update(json.dumps([
+            SECTION_CACHE_VERSION,
+            MANIM_VERSION,
+            type(self).__qualname__,
+            name,
+            config.pixel_width,
+            config.pixel_height,
+            config.frame_rate,
+            config.movie_file_extension,
+            config.transparent,
+        ]).encode())
+        h.update(preamble.encode())
+        h.update(own.encode())
+        for k in sorted(inputs):
+            v = inputs[k]
+            h.update(k.encode())
+            h.update(np.ascontiguousarray(v).tobytes() if isinstance(v, np.ndarray) else repr(v).encode())
+        scene_state_digest(self, h)
+        renderer.begin_cached_section(name, h.hexdigest())
@@ -0,0 +1,44 @@
+# scene_layout.py
+# Manim CE 0.19.x compatible
+# Layout helpers shared by the agent-inference scenes when their knobs (block/token/tool counts) change
+
+from manim import BLUE_E, GREY_A
+import numpy as np
+
+# every color the agent-inference scenes use by name; each scene copies it into its `theme`
+# class attribute, which theme_batch.py overrides key by key to render colorways
+THEME = dict(
+    bg="#0b0f14",
+    block_fill="#16324d",
+    block_edge=BLUE_E,
+    block_face="#102331",
+    rail="#0e2233",
+    link="#1b2a35",
+    label_text=GREY_A,
+    label_bg="#0c1218",
+    token="#34d399",          # normal token
+    token_hot="#22d3ee",      # emphasized token color used briefly
+    tool_colors=["#0c4a3e", "#12395b", "#44235b"],
+    tool_glow=["#2dd4bf", "#93c5fd", "#e9d5ff"],
+    pulse_out=["#34d399", "#60a5fa", "#c084fc"],
+    pulse_in=["#10b981", "#3b82f6", "#a855f7"],
+    caption=GREY_A,
+    shadow="#000000",
+)
+
+TOOL_LABELS = ["Search API", "DB Query", "Code Exec"]
+
+
+def tool_label(i):
+    return TOOL_LABELS[i] if i < len(TOOL_LABELS) else f"Tool {i + 1}"
+
+
+def tool_offsets(n_tools):
+    """
+    Offsets of the tool nodes from the center block: an arc below and behind it.
+    For three tools this is exactly the original layout (±1.8 / 0 in x).
+    """
+    half = 0.9 * (n_tools - 1)
+    xs = np.linspace(-half, half, n_tools) if n_tools > 1 else np.zeros(1)
+    w = np.abs(xs) / 1.8
+    return [np.array([x, -1.8 + 0.6 * k, -2.0 + 0.4 * k]) for x, k in zip(xs, w)]
@@ -0,0 +1,84 @@
+# shadow_layer.py
+# Manim CE 0.19.x compatible
+# Persistent ground-shadow layer: ellipses are built once and updated in place every frame
+
+from manim import VGroup, Circle
+import numpy as np
+
+
+class ShadowLayer(VGroup):
+    """
+    Soft "ground shadows" for a set of targets, replacing one always_redraw Circle per target.
+
+    The ellipse geometry is created once from a single Circle template. Shadow points and
+    fill colors are views into two shared arrays, so a frame is one batched pass over the
+    targets' centers: positions, scales and opacities are written for all shadows at once.
+
+    get_centers(): function with no args returning an (n, 3) array of points to follow.
+    height_falloff: > 0 shrinks and fades a shadow as its target rises above y_offset.
+    auto_update: False leaves registering refresh() to the scene (e.g. as a dependent updater).
+    """
+
+    def __init__(
+        self,
+        get_centers,
+        scale=1.0,
+        base_opacity=0.18,
+        y_offset=-0.32,
+        color="#000000",
+        height_falloff=0.0,
+        auto_update=True,
+        **kwargs,
+    ):
+        self.get_centers = get_centers
+        self.y_offset = y_offset
+        self.height_falloff = height_falloff
+
+        centers = np.asarray(get_centers(), dtype=float).reshape(-1, 3)
+        n = len(centers)
+        scale = np.broadcast_to(np.asarray(scale, dtype=float), (n,))
+        # Circle(r=0.35*s) widened by 1.8*s in x and flattened by 0.6*s in y
+        self.rx = 0.35 * scale * 1.8 * scale
+        self.ry = 0.35 * scale * 0.6 * scale
+        self.base_opacity = np.broadcast_to(np.asarray(base_opacity, dtype=float), (n,)).copy()
+
+        template = Circle(radius=1.0, stroke_width=0).set_fill(color, opacity=1.0)
+        super().__init__(*[template.copy() for _ in range(n)], **kwargs)
+
+        self._unit = np.array(template.points)
+        self._buffer = np.zeros((n, len(self._unit), 3))
+        self._rgbas = np.repeat(template.get_fill_rgbas()[None, :1, :], n, axis=0)
+        for i, shadow in enumerate(self.submobjects):
+            shadow.points = self._buffer[i]
+            shadow.fill_rgbas = self._rgbas[i]
+
+        self._last_centers = None
+        self.refresh()
+        if auto_update:
+            self.add_updater(lambda m: m.refresh())
+
+    def __deepcopy__(self, clone_from_id):
+        # ndarray deepcopy does not keep views, so reattach the copy to its own arrays
+        result = super().__deepcopy__(clone_from_id)
+        for i, shadow in enumerate(result.submobjects):
+            shadow.points = result._buffer[i]
+            shadow.fill_rgbas = result._rgbas[i]
+        return result
+
+    def refresh(self):
+        """Project every target onto the ground plane in one vectorized pass."""
+        centers = np.asarray(self.get_centers(), dtype=float).reshape(-1, 3)
+        if self._last_centers is not None and np.array_equal(centers, self._last_centers):
+            return self  # nothing moved (e.g. static blocks)
+        self._last_centers = centers.copy()
+
+        if self.height_falloff:
+            height = np.maximum(centers[:, 1] - self.y_offset, 0.0)
+            k = 1.0 / (1.0 + self.height_falloff * height)
+        else:
+            k = np.ones(len(centers))
+
+        self._buffer[:, :, 0] = self._unit[None, :, 0] * (self.rx * k)[:, None] + centers[:, 0:1]
+        self._buffer[:, :, 1] = self._unit[None, :, 1] * (self.ry * k)[:, None] + self.y_offset
+        self._rgbas[:, :, 3] = (self.base_opacity * k)[:, None]
+        return self
@@ -0,0 +1,407 @@
+# static_batch.py
+# Manim CE 0.19.x compatible
+# Static geometry batching: freeze a non-animated subtree into one array-backed mesh, projected in one pass per frame
+#
+#   self.freeze(*blocks, rail)      # in construct(), once the subtrees stop changing (StaticBatchMixin)
+#   python static_batch.py agent_inference_tools_v2.py InceptionToolUse3D -q l   # check frames vs unbatched drawing
+
+from pathlib import Path
+from time import perf_counter
+import argparse
+import itertools as it
+import json
+import os
+
+import cairo
+from manim import config, logger
+from manim.camera.camera import CAP_STYLE_MAP, LINE_JOIN_MAP
+from manim.camera.three_d_camera import ThreeDCamera
+from manim.constants import CapStyleType, LineJointType
+from manim.mobject.types.vectorized_mobject import VMobject
+import numpy as np
+
+# camera methods the batched drawing reproduces; a camera overriding any of them draws frozen faces one by one
+_STOCK_DRAWING = (
+    "display_vectorized", "set_cairo_context_path", "set_cairo_context_color", "apply_fill", "apply_stroke",
+    "get_fill_rgbas", "get_stroke_rgbas", "modified_rgbas",
+)
+
+
+def static_batch_enabled():
+    return os.environ.get("AGENT_STATIC_BATCH", "1") != "0"
+
+
+def _face_state(face):
+    """Everything about a face that the frozen mesh bakes in."""
+    return (
+        face.points,
+        face.get_fill_rgbas(),
+        face.get_stroke_rgbas(),
+        face.get_stroke_rgbas(background=True),
+        face.get_stroke_width(),
+        face.get_stroke_width(background=True),
+        face.joint_type,
+        face.cap_style,
+        bool(getattr(face, "shade_in_3d", False)),
+        face.z_index,
+    )
+
+
+def _same(a, b):
+    return all(
+        np.array_equal(x, y) if isinstance(x, np.ndarray) else x == y
+        for x, y in zip(a, b)
+    )
+
+
+class FrozenMesh:
+    """
+    A static subtree baked into flat arrays.
+
+    Every face (family member with points) keeps its place in family order, so the camera
+    still depth-sorts faces individually and interleaves them with the rest of the scene.
+    What goes away is the per-face Python work: the family walk, get_center() for the depth
+    key, projecting each face on its own, splitting it into subpaths and shading its colors.
+    Points (plus each face's two gradient end points) live in one array projected in a single
+    call per frame; depth reference points, subpath layout and shaded colors are computed once.
+    Subpaths are split where consecutive curves don't meet in 3D (the stock camera checks the
+    projected points, which only differs for points lined up along the view axis).
+
+    Raises ValueError for subtrees it can't reproduce: updaters, non-VMobjects, background
+    images, fixed-in-frame or fixed-orientation members, or mixed z_index.
+    """
+
+    def __init__(self, root, camera):
+        self.root = root
+        self.build(camera)
+
+    def build(self, camera):
+        root = self.root
+        name = type(root).__name__
+        family = root.get_family()
+        fixed = set(map(id, getattr(camera, "fixed_in_frame_mobjects", ())))
+        fixed |= set(map(id, getattr(camera, "fixed_orientation_mobjects", {})))
+        faces = [m for m in family if len(m.points)]
+        if not faces:
+            raise ValueError(f"cannot freeze {name}: nothing to draw")
+        for m in family:
+            if m.updaters:
+                raise ValueError(f"cannot freeze {name}: {type(m).__name__} has updaters")
+        for f in faces:
+            if not isinstance(f, VMobject) or f.get_background_image():
+                raise ValueError(f"cannot freeze {name}: {type(f).__name__} is not a plain VMobject")
+            if id(f) in fixed:
+                raise ValueError(f"cannot freeze {name}: {type(f).__name__} is fixed in frame or orientation")
+            if len(f.points) % f.n_points_per_cubic_curve or not np.all(np.isfinite(f.points)):
+                raise ValueError(f"cannot freeze {name}: {type(f).__name__} has malformed points")
+        if len({f.z_index for f in faces}) > 1:
+            raise ValueError(f"cannot freeze {name}: members have different z_index")
+
+        self.members = family
+        self.member_ids = {id(m) for m in family}
+        self.faces = faces
+        self.z_index = faces[0].z_index
+        self.states = [tuple(np.array(v) if isinstance(v, np.ndarray) else v for v in _face_state(f)) for f in faces]
+        self.shaded = np.array([bool(getattr(f, "shade_in_3d", False)) for f in faces])
+        self.centers = np.array([f.get_z_index_reference_point() for f in faces])
+
+        # face points, then two gradient end points per face
+        n_face_points = sum(len(f.points) for f in faces)
+        self.grad_index = [n_face_points + 2 * i for i in range(len(faces))]
+        self.points = np.concatenate(
+            [f.points for f in faces] + [np.array(f.get_gradient_start_and_end_points()) for f in faces]
+        )
+        # per face: [(2 * start, [2 * (curve start) + 2, ...], closed)] indexing the flattened 2D points
+        self.paths = []
+        offset = 0
+        for f in faces:
+            self.paths.append(self._subpaths(f, offset))
+            offset += len(f.points)
+        self._styles = None
+        self._styles_key = None
+        return self
+
+    @staticmethod
+    def _subpaths(face, offset):
+        # what gen_subpaths_from_points_2d / gen_cubic_bezier_tuples_from_points give, in 3D
+        points = face.points
+        nppcc = face.n_points_per_cubic_curve
+        tol = face.tolerance_for_point_equality
+        n = len(points)
+        meets = np.all(np.isclose(points[nppcc - 1:n - 1:nppcc], points[nppcc::nppcc], rtol=1e-5, atol=tol), axis=1)
+        splits = [0] + [nppcc * (k + 1) for k in np.flatnonzero(~meets)] + [n]
+        subpaths = []
+        for i1, i2 in zip(splits, splits[1:]):
+            if i2 - i1 < nppcc:
+                continue
+            curves = [2 * (offset + j) + 2 for j in range(i1, i2 - nppcc + 1, nppcc)]
+            closed = bool(np.all(np.isclose(points[i1], points[i2 - 1], rtol=1e-5, atol=tol)))
+            subpaths.append((2 * (offset + i1), curves, closed))
+        return subpaths
+
+    def is_stale(self):
+        """True when the subtree changed since it was frozen."""
+        family = self.root.get_family()
+        if len(family) != len(self.members) or any(a is not b for a, b in zip(family, self.members)):
+            return True
+        return any(not _same(state, _face_state(f)) for f, state in zip(self.faces, self.states))
+
+    @property
+    def n_faces(self):
+        return len(self.faces)
+
+    def depth_keys(self, rot_t):
+        """ThreeDCamera's depth key of every face (inf: not shaded in 3D)."""
+        keys = np.full(len(self.faces), np.inf)
+        keys[self.shaded] = self.centers[self.shaded] @ rot_t[:, 2]
+        return keys
+
+    def info(self):
+        return dict(root=type(self.root).__name__, faces=len(self.faces), points=len(self.points))
+
+    # ---------- drawing ----------
+    def styles(self, camera):
+        """Per face (background stroke, fill, stroke) as the camera would shade them; static, so cached."""
+        key = (id(camera), camera.should_apply_shading, tuple(camera.light_source.points[0]),
+               camera.cairo_line_width_multiple)
+        if key != self._styles_key:
+            self._styles = [self._face_style(camera, f) for f in self.faces]
+            self._styles_key = key
+        return self._styles
+
+    @staticmethod
+    def _source(rgbas):
+        if len(rgbas) == 1:
+            return True, (*rgbas[0][2::-1], rgbas[0][3])   # cairo surfaces are BGR
+        step = 1.0 / (len(rgbas) - 1)
+        return False, [(offset, *rgba[2::-1], rgba[3]) for rgba, offset in zip(rgbas, np.arange(0, 1 + step, step))]
+
+    def _face_style(self, camera, face):
+        def stroke(background):
+            width = face.get_stroke_width(background)
+            if width == 0:
+                return None
+            join = LINE_JOIN_MAP[face.joint_type] if face.joint_type != LineJointType.AUTO else None
+            cap = CAP_STYLE_MAP[face.cap_style] if face.cap_style != CapStyleType.AUTO else None
+            source = self._source(camera.get_stroke_rgbas(face, background=background))
+            return width * camera.cairo_line_width_multiple, join, cap, source
+
+        fill = camera.get_fill_rgbas(face)
+        # a fully transparent fill leaves the pixels as they are
+        fill = self._source(fill) if np.any(fill[:, 3] > 0) else None
+        return stroke(True), fill, stroke(False)
+
+    def draw(self, camera, ctx, faces, flat):
+        """Draw `faces` (indices) into ctx; flat: projected 2D points, flattened to a list."""
+        styles = self.styles(camera)
+        for i in faces:
+            ctx.new_path()
+            for start, curves, closed in self.paths[i]:
+                ctx.new_sub_path()
+                ctx.move_to(flat[start], flat[start + 1])
+                for c in curves:
+                    ctx.curve_to(*flat[c:c + 6])
+                if closed:
+                    ctx.close_path()
+            background, fill, stroke = styles[i]
+            g = 2 * self.grad_index[i]
+            if background:
+                self._stroke(ctx, background, flat, g)
+            if fill:
+                self._set_source(ctx, fill, flat, g)
+                ctx.fill_preserve()
+            if stroke:
+                self._stroke(ctx, stroke, flat, g)
+
+    @staticmethod
+    def _set_source(ctx, source, flat, g):
+        solid, data = source
+        if solid:
+            ctx.set_source_rgba(*data)
+            return
+        pattern = cairo.LinearGradient(*flat[g:g + 4])
+        for stop in data:
+            pattern.add_color_stop_rgba(*stop)
+        ctx.set_source(pattern)
+
+    def _stroke(self, ctx, style, flat, g):
+        width, join, cap, source = style
+        self._set_source(ctx, source, flat, g)
+        ctx.set_line_width(width)
+        if join is not None:
+            ctx.set_line_join(join)
+        if cap is not None:
+            ctx.set_line_cap(cap)
+        ctx.stroke_preserve()
+
+
+class FrozenRun:
+    """Consecutive faces of one FrozenMesh in the camera's painter's order."""
+
+    __slots__ = ("mesh", "faces")
+
+    def __init__(self, mesh, faces):
+        self.mesh = mesh
+        self.faces = faces
+
+    def expand(self):
+        return [self.mesh.faces[i] for i in self.faces]
+
+
+def draws_batched(camera):
+    """Whether the camera draws exactly like ThreeDCamera, so FrozenMesh.draw can stand in for it."""
+    return all(getattr(type(camera), name) is getattr(ThreeDCamera, name) for name in _STOCK_DRAWING)
+
+
+# ======================= SCENE =======================
+class StaticBatchMixin:
+    """
+    Scene mixin: freeze(*mobjects) turns each static subtree into a FrozenMesh.
+
+    The camera (IncrementalDepthCamera) then draws it from the mesh, and the subtree's
+    updaters are no longer walked each frame (the root is suspended). At every play start a
+    subtree is unfrozen when an animation's mobject family overlaps it or a member got an
+    updater, and frozen again from its current state when construct() changed it directly.
+    Without a batching camera, or with AGENT_STATIC_BATCH=0, freeze() does nothing.
+    """
+
+    def _static_batch_state(self):
+        if not hasattr(self, "_unfrozen"):
+            self._unfrozen = []
+            self._refrozen = 0
+        return self._unfrozen
+
+    def freeze(self, *mobjects):
+        frozen = getattr(self.camera, "frozen", None)
+        self._static_batch_state()
+        if frozen is None or not static_batch_enabled():
+            return self
+        for mob in mobjects:
+            mesh = FrozenMesh(mob, self.camera)
+            mesh.was_suspended = mob.updating_suspended
+            mob.updating_suspended = True   # nothing to update below it; skip the walk
+            frozen[id(mob)] = mesh
+        return self
+
+    def unfreeze(self, *mobjects, reason="unfreeze()"):
+        frozen = getattr(self.camera, "frozen", None) or {}
+        for mob in mobjects:
+            mesh = frozen.pop(id(mob), None)
+            if mesh is None or mesh.root is not mob:
+                continue
+            mob.updating_suspended = mesh.was_suspended
+            self._static_batch_state().append(dict(mesh.info(), t=round(self.time, 3), reason=reason))
+        return self
+
+    def begin_animations(self):
+        super().begin_animations()
+        frozen = getattr(self.camera, "frozen", None)
+        if not frozen:
+            return
+        animated = set()
+        for a in self.animations:
+            if getattr(a, "mobject", None) is not None:
+                animated.update(map(id, a.mobject.get_family()))
+        for mesh in list(frozen.values()):
+            root = mesh.root
+            if not mesh.member_ids.isdisjoint(animated):
+                suspended = root.updating_suspended
+                self.unfreeze(root, reason="animated")
+                if id(root) in animated:
+                    root.updating_suspended = suspended   # the animation resumes it when it finishes
+            elif any(m.updaters for m in mesh.members):
+                self.unfreeze(root, reason="updater added")
+            elif mesh.is_stale():
+                mesh.build(self.camera)
+                self._refrozen += 1
+
+    def static_batch_report(self):
+        frozen = getattr(self.camera, "frozen", None) or {}
+        self._static_batch_state()
+        return dict(
+            frozen=[m.info() for m in frozen.values()],
+            unfrozen=self._unfrozen,
+            refrozen=self._refrozen,
+        )
+
+
+# ======================= CLI =======================
+def verifying_camera_class(cls):
+    """cls that also draws every frame without batching, timing both and comparing the pixels."""
+
+    class VerifyingCamera(cls):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._stock_buffer = None   # persistent: cairo contexts are cached by id(pixel_array)
+            self.verify_stats = dict(frames=0, batched_seconds=0.0, stock_seconds=0.0, mismatched=0, max_abs_diff=0)
+
+        def capture_mobjects(self, mobjects, **kwargs):
+            if self._stock_buffer is None or self._stock_buffer.shape != self.pixel_array.shape:
+                self._stock_buffer = np.empty_like(self.pixel_array)
+            stock = self._stock_buffer
+            stock[:] = self.pixel_array
+            stats = self.verify_stats
+            t0 = perf_counter()
+            super().capture_mobjects(mobjects, **kwargs)
+            stats["batched_seconds"] += perf_counter() - t0
+            t0 = perf_counter()
+            self.reset_rotation_matrix()
+            for group_type, group in it.groupby(
+                ThreeDCamera.get_mobjects_to_display(self, mobjects, **kwargs), self.type_or_raise,
+            ):
+                self.display_funcs[group_type](list(group), stock)
+            stats["stock_seconds"] += perf_counter() - t0
+            diff = int(np.abs(stock.astype(np.int16) - self.pixel_array.astype(np.int16)).max())
+            stats["frames"] += 1
+            stats["mismatched"] += bool(diff)
+            stats["max_abs_diff"] = max(stats["max_abs_diff"], diff)
+
+        def verify_report(self):
+            s = self.verify_stats
+            n = max(s["frames"], 1)
+            return dict(
+                frames=s["frames"],
+                batched_ms_per_frame=round(s["batched_seconds"] * 1000 / n, 3),
+                stock_ms_per_frame=round(s["stock_seconds"] * 1000 / n, 3),
+                speedup=round(s["stock_seconds"] / s["batched_seconds"], 2) if s["batched_seconds"] else None,
+                mismatched=s["mismatched"],
+                max_abs_diff=s["max_abs_diff"],
+            )
+
+    VerifyingCamera.__name__ = f"Verifying{cls.__name__}"
+    return VerifyingCamera
+
+
+def main(argv=None):
+    from parallel_render import QUALITY_FLAGS, apply_settings, default_camera_class, load_scene_class
+
+    parser = argparse.ArgumentParser(description="Render a scene with frozen static geometry and check it against unbatched drawing.")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", default="l", help="l, m, h, p or k (as in manim -q)")
+    args = parser.parse_args(argv)
+
+    os.environ["AGENT_SECTION_CACHE"] = "0"
+    os.environ.pop("AGENT_STATIC_BATCH", None)
+    quality = next(q for q, v in QUALITY_FLAGS.items() if v == args.quality)
+    apply_settings(dict(file=str(Path(args.file).absolute()), quality=quality))
+    config.disable_caching = True
+    config.write_to_movie = False
+
+    from fast_camera import IncrementalDepthCamera
+
+    scene_cls = load_scene_class(args.file, args.scene)
+    camera_cls = default_camera_class(scene_cls)
+    if not (isinstance(camera_cls, type) and issubclass(camera_cls, IncrementalDepthCamera)):
+        logger.warning("%s does not batch frozen geometry; nothing to compare.", getattr(camera_cls, "__name__", camera_cls))
+        camera_cls = IncrementalDepthCamera
+    scene = scene_cls(camera_class=verifying_camera_class(camera_cls))
+    scene.render()
+    report = dict(scene=args.scene, quality=quality, **scene.renderer.camera.verify_report())
+    if isinstance(scene, StaticBatchMixin):
+        report["static_batch"] = scene.static_batch_report()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# stream_writer.py
+# Manim CE 0.19.x compatible
+# Streaming output: framebuffers go straight to one long-lived encoder, no partial movie files
+#
+#   python stream_writer.py agent_inference_tools_v2.py InceptionToolUse3D -q h
+#   python stream_writer.py agent_inference_tools_v2.py InceptionToolUse3D -q h --depth 8 --backend pyav
+
+from pathlib import Path
+from queue import Queue
+from threading import Thread
+import argparse
+import json
+import resource
+import shutil
+import subprocess
+import time
+
+from manim import config, logger
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter, to_av_frame_rate
+from manim.utils.file_ops import write_to_movie
+import av
+
+
+# ======================= ENCODER SINKS =======================
+class FFmpegSink:
+    """Long-lived ffmpeg process reading raw RGBA frames from stdin."""
+
+    def __init__(self, path, width, height, fps):
+        cmd = [
+            shutil.which("ffmpeg"), "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-framerate", str(fps),
+            "-i", "-",
+            "-an", "-c:v", "libx264", "-pix_fmt", "yuv420p", "-crf", "23", "-movflags", "+faststart",
+            str(path),
+        ]
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, bufsize=0)
+
+    def write(self, frame):
+        # memoryview over the framebuffer itself: the pipe reads straight from it. stdin is
+        # unbuffered (bufsize=0), so a write may be partial: keep going until all of it is out
+        view = memoryview(frame).cast("B")
+        while view:
+            view = view[self.proc.stdin.write(view):]
+
+    def close(self):
+        self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self.proc.returncode}")
+
+
+class PyAVSink:
+    """Same settings as manim's partial movie files, as one continuous stream (no ffmpeg binary)."""
+
+    def __init__(self, path, width, height, fps):
+        self.container = av.open(str(path), mode="w")
+        self.stream = self.container.add_stream("libx264", rate=to_av_frame_rate(fps), options={"crf": "23"})
+        self.stream.pix_fmt = "yuv420p"
+        self.stream.width = width
+        self.stream.height = height
+
+    def write(self, frame):
+        for packet in self.stream.encode(av.VideoFrame.from_ndarray(frame, format="rgba")):
+            self.container.mux(packet)
+
+    def close(self):
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+
+
+def make_sink(backend, path, width, height, fps):
+    if backend == "auto":
+        backend = "ffmpeg" if shutil.which("ffmpeg") else "pyav"
+    return (FFmpegSink if backend == "ffmpeg" else PyAVSink)(path, width, height, fps)
+
+
+# ======================= FRAMEBUFFER POOL =======================
+class FramePool:
+    """
+    Fixed set of framebuffers the camera renders into in turn.
+
+    A buffer handed to the encoder is not touched again until the encoder releases it, so
+    rasterizing frame n+1 overlaps encoding frame n without copying. acquire() blocks when
+    every buffer is in flight, which bounds memory and applies back-pressure.
+    """
+
+    def __init__(self, first, size):
+        self.free = Queue()
+        for _ in range(size - 1):
+            self.free.put(first.copy())
+        self.size = size
+
+    def acquire(self):
+        return self.free.get()
+
+    def release(self, buf):
+        self.free.put(buf)
+
+
+# ======================= FILE WRITER / RENDERER =======================
+class StreamingFileWriter(SceneFileWriter):
+    """
+    SceneFileWriter that encodes the whole scene into its final movie file as it renders.
+    No partial movie files, no concatenation, and no per-play hashing or caching.
+    """
+
+    def __init__(self, renderer, scene_name, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.sink = None
+        self.frame_queue = None
+        self.writer_error = None
+        self.frames_written = 0
+
+    def add_partial_movie_file(self, hash_animation):
+        # keep partial_movie_files indexed by num_plays; nothing is written per play
+        self.partial_movie_files.append(None)
+        self.sections[-1].partial_movie_files.append(None)
+
+    def is_already_cached(self, hash_invocation):
+        return False
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        if write_to_movie() and allow_write and self.sink is None:
+            self._open()
+
+    def end_animation(self, allow_write=False):
+        self._raise_writer_error()
+
+    def _open(self):
+        self.movie_file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sink = make_sink(
+            self.renderer.backend, self.movie_file_path,
+            config.pixel_width, config.pixel_height, config.frame_rate,
+        )
+        self.frame_queue = Queue(maxsize=self.renderer.queue_depth)
+        self.writer_thread = Thread(target=self._encode_loop, daemon=True)
+        self.writer_thread.start()
+
+    def _encode_loop(self):
+        while True:
+            item = self.frame_queue.get()
+            if item is None:
+                break
+            frame, num_frames, pooled = item
+            try:
+                if self.writer_error is None:
+                    for _ in range(num_frames):
+                        self.sink.write(frame)
+                    self.frames_written += num_frames
+            except Exception as e:   # reported on the render thread
+                self.writer_error = e
+            finally:
+                if pooled:
+                    self.renderer.frame_pool.release(frame)
+
+    def _raise_writer_error(self):
+        if self.writer_error is not None:
+            raise RuntimeError("streaming encoder failed") from self.writer_error
+
+    def write_frame(self, frame, num_frames=1):
+        if not write_to_movie():
+            return super().write_frame(frame, num_frames)
+        self._raise_writer_error()
+        if self.sink is None:
+            self._open()
+        pooled = frame is self.renderer.camera.pixel_array
+        self.frame_queue.put((frame, num_frames, pooled))
+
+    def finish(self):
+        if self.sink is not None:
+            self.frame_queue.put(None)
+            self.writer_thread.join()
+            self.sink.close()
+            self.sink = None
+            self._raise_writer_error()
+            if self.includes_sound:
+                logger.warning("Streaming output does not mux audio; render without it for sound.")
+            self.print_file_ready_message(self.movie_file_path)
+        if self.subcaptions:
+            self.write_subcaption_file()
+
+
+class StreamingRenderer(CairoRenderer):
+    """
+    CairoRenderer whose frames are handed to StreamingFileWriter by reference.
+
+    get_frame() returns the camera's framebuffer itself instead of a copy; once a frame is
+    queued the camera switches to a free buffer from the pool before drawing the next one.
+    """
+
+    def __init__(self, queue_depth=4, backend="auto", **kwargs):
+        kwargs.setdefault("file_writer_class", StreamingFileWriter)
+        super().__init__(**kwargs)
+        self.queue_depth = queue_depth
+        self.backend = backend
+        # queued + one being encoded + one being drawn
+        self.frame_pool = FramePool(self.camera.pixel_array, queue_depth + 2)
+        self._held = False
+
+    def update_frame(self, *args, **kwargs):
+        if self._held:
+            self.camera.pixel_array = self.frame_pool.acquire()
+            self._held = False
+        super().update_frame(*args, **kwargs)
+
+    def get_frame(self):
+        return self.camera.pixel_array
+
+    def add_frame(self, frame, num_frames=1):
+        if not self.skip_animations and frame is self.camera.pixel_array:
+            self._held = True
+        super().add_frame(frame, num_frames)
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        super().save_static_frame_data(scene, static_mobjects)
+        if self.static_image is not None:
+            # get_frame() returned the live buffer, which is about to be redrawn
+            self.static_image = self.static_image.copy()
+        return self.static_image
+
+
+# ======================= CLI =======================
+def render_streaming(file, scene, quality="low_quality", queue_depth=4, backend="auto", media_dir=None):
+    from parallel_render import apply_settings, load_scene_class, default_camera_class
+
+    apply_settings(dict(file=str(Path(file).absolute()), quality=quality, media_dir=media_dir))
+    config.disable_caching = True   # nothing to reuse without partial movie files
+    scene_cls = load_scene_class(file, scene)
+    renderer = StreamingRenderer(
+        queue_depth=queue_depth, backend=backend, camera_class=default_camera_class(scene_cls),
+    )
+    t0 = time.perf_counter()
+    instance = scene_cls(renderer=renderer)
+    instance.render()
+    wall = time.perf_counter() - t0
+    frames = renderer.file_writer.frames_written
+    return dict(
+        scene=scene,
+        quality=quality,
+        frames=frames,
+        wall_s=round(wall, 3),
+        fps=round(frames / wall, 2) if wall else 0.0,
+        peak_rss_mb=round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        output=str(renderer.file_writer.movie_file_path),
+    )
+
+
+def main(argv=None):
+    from parallel_render import QUALITY_FLAGS
+
+    parser = argparse.ArgumentParser(description="Render a scene straight into one encoder, without partial movie files.")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", default="l", help="l, m, h, p or k (as in manim -q)")
+    parser.add_argument("--depth", type=int, default=4, help="frames queued between rasterizer and encoder")
+    parser.add_argument("--backend", choices=["auto", "ffmpeg", "pyav"], default="auto")
+    parser.add_argument("--media-dir")
+    args = parser.parse_args(argv)
+
+    quality = next(q for q, v in QUALITY_FLAGS.items() if v == args.quality)
+    print(json.dumps(render_streaming(args.file, args.scene, quality, args.depth, args.backend, args.media_dir), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# text_cache.py
+# Manim CE 0.19.x compatible
+# Persistent, content-addressed cache of vectorized Text outlines shared across renders
+
+from pathlib import Path
+from time import perf_counter
+import hashlib
+import json
+import os
+import tempfile
+
+from manim import Text, VGroup, VMobject, NORMAL, __version__ as MANIM_VERSION
+import numpy as np
+
+
+class TextCache:
+    """
+    On-disk cache of Text outlines keyed by (string, font, weight, scale, other Text kwargs).
+
+    A miss renders through Pango + SVG parsing once and stores the glyph points and colors
+    as one .npz file named by the SHA-256 of the key. A hit rebuilds plain VMobjects
+    straight from the arrays, skipping Pango and SVG parsing. A miss returns the same
+    rebuilt VGroup, so cold and warm runs give identical mobject trees (and state digests). Files are written atomically
+    (temp file + os.replace) so parallel render processes can share one directory.
+
+    The directory is bounded by max_bytes; least recently used files (by mtime, refreshed on
+    every hit) are evicted first.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=256 * 1024 * 1024):
+        if cache_dir is None:
+            cache_dir = os.environ.get(
+                "AGENT_TEXT_CACHE", Path.home() / ".cache" / "agent_inference" / "text"
+            )
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0   # seconds: recorded build time minus load time, summed over hits
+        self.time_spent = 0.0   # seconds spent building on misses
+
+    def _key(self, text, font, weight, scale, kwargs):
+        payload = json.dumps(
+            [MANIM_VERSION, text, font, str(weight), float(scale), sorted(kwargs.items())],
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def text(self, text, font="", weight=NORMAL, scale=1.0, **kwargs):
+        """Return the outlines of Text(text, font=font, weight=weight, **kwargs).scale(scale)."""
+        path = self.cache_dir / f"{self._key(text, font, weight, scale, kwargs)}.npz"
+
+        t0 = perf_counter()
+        outlines = self._load(path)
+        if outlines is not None:
+            self.hits += 1
+            self.time_saved += max(float(outlines["build_time"]) - (perf_counter() - t0), 0.0)
+            return self._build(outlines)
+
+        mob = Text(text, font=font, weight=weight, **kwargs)
+        if scale != 1.0:
+            mob.scale(scale)
+        outlines = self._outlines(mob, perf_counter() - t0)
+        self.misses += 1
+        self.time_spent += float(outlines["build_time"])
+        self._store(path, outlines)
+        self._evict()
+        return self._build(outlines)
+
+    @staticmethod
+    def _outlines(mob, build_time):
+        glyphs = mob.family_members_with_points()
+        return dict(
+            points=np.concatenate([g.points for g in glyphs]) if glyphs else np.zeros((0, 3)),
+            offsets=np.cumsum([0] + [len(g.points) for g in glyphs]),
+            fill_rgbas=np.array([g.get_fill_rgbas()[0] for g in glyphs]).reshape(-1, 4),
+            stroke_rgbas=np.array([g.get_stroke_rgbas()[0] for g in glyphs]).reshape(-1, 4),
+            stroke_width=np.array([g.get_stroke_width() for g in glyphs], dtype=float),
+            build_time=build_time,
+        )
+
+    @staticmethod
+    def _build(outlines):
+        points, offsets = outlines["points"], outlines["offsets"]
+        fill, stroke, stroke_width = outlines["fill_rgbas"], outlines["stroke_rgbas"], outlines["stroke_width"]
+        glyphs = []
+        for i in range(len(offsets) - 1):
+            glyph = VMobject()
+            glyph.points = points[offsets[i]:offsets[i + 1]].copy()
+            glyph.fill_rgbas = fill[i:i + 1].copy()
+            glyph.stroke_rgbas = stroke[i:i + 1].copy()
+            glyph.stroke_width = float(stroke_width[i])
+            glyphs.append(glyph)
+        return VGroup(*glyphs)
+
+    def _load(self, path):
+        try:
+            with np.load(path) as data:
+                outlines = {name: data[name] for name in (
+                    "points", "offsets", "fill_rgbas", "stroke_rgbas", "stroke_width", "build_time",
+                )}
+            os.utime(path)  # mark as recently used
+        except (OSError, KeyError, ValueError):
+            return None
+        return outlines
+
+    def _store(self, path, outlines):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".npz.tmp")   # not matched by _evict's *.npz
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **outlines)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _evict(self):
+        files = []
+        for p in self.cache_dir.glob("*.npz"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue  # removed by another process
+            files.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                pass
+            total -= size
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+        self.time_saved = self.time_spent = 0.0
+
+    def report(self):
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            time_saved_s=round(self.time_saved, 4),
+            time_spent_s=round(self.time_spent, 4),
+        )
+
+
+# Shared by every scene rendered in this interpreter (and, via the directory, across processes)
+TEXT_CACHE = TextCache()
@@ -0,0 +1,210 @@
+# theme_batch.py
+# Manim CE 0.19.x compatible
+# Colorways in one pass: geometry, motion and depth order once per frame, each THEME applied at rasterization
+#
+#   python theme_batch.py agent_inference_tools_v2.py InceptionToolUse3D themes.json -q h
+#   python theme_batch.py agent_inference_tools_v2.py InceptionToolUse3D themes.json -q l --no-compare
+#
+# themes.json: {"teal": {"block_fill": "#0f3d3e", ...}, "amber": {...}} (or a list of dicts with a "name");
+# every theme overrides the scene's `theme` class attribute key by key.
+
+from pathlib import Path
+import argparse
+import json
+import os
+import time
+
+from manim import ManimColor, config, logger
+from manim.constants import QUALITIES
+import numpy as np
+
+from multi_res_render import render_multi_res
+
+
+# ======================= PALETTES =======================
+def _flatten(theme):
+    for key, value in theme.items():
+        if isinstance(value, (list, tuple)):
+            for i, v in enumerate(value):
+                yield f"{key}[{i}]", v
+        else:
+            yield key, value
+
+
+class ColorRemap:
+    """
+    Maps the colors of a base THEME to those of another theme, on RGBA arrays.
+
+    A color equal to a base theme color becomes the theme's color for that key. A color on
+    the segment between two base colors (what interpolate_color produces mid-animation)
+    becomes the same blend of their theme colors. Anything else (colors the scene hardcodes
+    outside THEME) is left as is. Alpha is never touched; 3D shading is applied afterwards by
+    the camera, to the remapped color. Results are memoized per distinct RGB, so fades
+    (changing alpha only) reuse them.
+    """
+
+    tolerance = 1.5 / 255
+
+    def __init__(self, name, base, theme):
+        self.name = name
+        base_rgb, theme_rgb = [], []
+        unknown = set(theme) - set(base)
+        if unknown:
+            raise ValueError(f"theme {name!r}: unknown keys {sorted(unknown)}")
+        theme = dict(base, **theme)
+        flat_theme = dict(_flatten(theme))
+        self.ambiguous = []
+        for key, value in _flatten(base):
+            if key not in flat_theme:
+                raise ValueError(f"theme {name!r}: {key} is missing (lists must keep the base length)")
+            rgb = ManimColor(value).to_rgb()
+            target = ManimColor(flat_theme[key]).to_rgb()
+            match = [i for i, b in enumerate(base_rgb) if np.allclose(b, rgb)]
+            if match:
+                # the same base color under two keys can only map one way
+                if not np.allclose(theme_rgb[match[0]], target):
+                    self.ambiguous.append(key)
+                continue
+            base_rgb.append(rgb)
+            theme_rgb.append(target)
+        self.theme = theme
+        self.base_rgb = np.array(base_rgb)
+        self.theme_rgb = np.array(theme_rgb)
+        self.identity = np.allclose(self.base_rgb, self.theme_rgb)
+        self._memo = {}
+        self.exact = self.blended = self.unmapped = 0
+        if self.ambiguous:
+            logger.warning("Theme %s: %s share a base color with an earlier key; using the earlier mapping.",
+                           name, ", ".join(self.ambiguous))
+
+    def _remap_rgb(self, rgb):
+        diff = np.abs(self.base_rgb - rgb).max(axis=1)
+        i = int(np.argmin(diff))
+        if diff[i] <= self.tolerance:
+            self.exact += 1
+            return self.theme_rgb[i] + (rgb - self.base_rgb[i])
+        # closest point on every segment between two base colors
+        a, b = self.base_rgb[:, None, :], self.base_rgb[None, :, :]
+        d = b - a
+        dd = np.einsum("ijk,ijk->ij", d, d)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.clip(np.einsum("ijk,ijk->ij", rgb - a, d) / dd, 0.0, 1.0)
+        t = np.where(dd > 0, t, 0.0)
+        dist = np.abs(a + t[..., None] * d - rgb).max(axis=2)
+        i, j = np.unravel_index(np.argmin(dist), dist.shape)
+        if dist[i, j] <= self.tolerance:
+            self.blended += 1
+            return self.theme_rgb[i] + t[i, j] * (self.theme_rgb[j] - self.theme_rgb[i])
+        self.unmapped += 1
+        return rgb
+
+    def remap(self, rgbas):
+        if self.identity:
+            return rgbas
+        out = np.array(rgbas, dtype=float)   # alpha is copied through
+        for row in out:
+            key = row[:3].tobytes()
+            rgb = self._memo.get(key)
+            if rgb is None:
+                rgb = self._memo[key] = np.clip(self._remap_rgb(row[:3].copy()), 0.0, 1.0)
+            row[:3] = rgb
+        return out
+
+    def remap_color(self, color):
+        color = ManimColor(color)
+        return ManimColor(self.remap(np.array([color.to_rgba()]))[0])
+
+    def stats(self):
+        # counted once per distinct color (results are memoized)
+        return dict(distinct_colors=len(self._memo), exact=self.exact, blended=self.blended,
+                    unmapped=self.unmapped, ambiguous_keys=self.ambiguous)
+
+
+def load_themes(path):
+    """[(name, overrides)] from a themes file: {name: overrides} or [{"name": ..., **overrides}]."""
+    data = json.loads(Path(path).read_text())
+    if isinstance(data, dict):
+        return list(data.items())
+    themes = []
+    for i, entry in enumerate(data):
+        entry = dict(entry)
+        themes.append((entry.pop("name", f"theme{i}"), entry))
+    return themes
+
+
+# ======================= RENDERING =======================
+def render_sequential(file, scene, themes, quality, backend="auto", media_dir=None):
+    """One ordinary streaming render per theme (the baseline the batch is compared with)."""
+    from parallel_render import apply_settings, default_camera_class, load_scene_class
+    from stream_writer import StreamingRenderer
+
+    apply_settings(dict(file=str(Path(file).absolute()), quality=quality, media_dir=media_dir))
+    config.disable_caching = True
+    scene_cls = load_scene_class(file, scene)
+    runs = {}
+    t0 = time.perf_counter()
+    for name, overrides in themes:
+        themed = type(f"{scene}_{name}_sequential", (scene_cls,), dict(theme=dict(scene_cls.theme, **overrides)))
+        renderer = StreamingRenderer(backend=backend, camera_class=default_camera_class(scene_cls))
+        t1 = time.perf_counter()
+        themed(renderer=renderer).render()
+        runs[name] = dict(wall_s=round(time.perf_counter() - t1, 3), frames=renderer.file_writer.frames_written)
+    return dict(wall_s=round(time.perf_counter() - t0, 3), runs=runs)
+
+
+def render_theme_batch(file, scene, themes, quality="high_quality", backend="auto", media_dir=None, compare=True):
+    os.environ["AGENT_SECTION_CACHE"] = "0"   # every run renders every frame
+    palettes = []
+
+    def make_palettes(scene_cls):
+        base = getattr(scene_cls, "theme", None)
+        if base is None:
+            raise ValueError(f"{scene_cls.__name__} has no `theme` class attribute to recolor")
+        palettes.extend(ColorRemap(name, base, overrides) for name, overrides in themes)
+        return palettes
+
+    tier = f"{QUALITIES[quality]['pixel_height']}p{QUALITIES[quality]['frame_rate']}"
+    batch = render_multi_res(
+        file, scene, tier, quality=quality, backend=backend, media_dir=media_dir, make_palettes=make_palettes,
+    )
+    report = dict(
+        scene=scene, quality=quality, themes=len(themes), frames=batch["timeline_frames"],
+        batch_wall_s=batch["wall_s"], batch_cpu_s=batch["cpu_s"],
+        outputs={p.name: out["path"] for p, out in zip(palettes, batch["outputs"].values())},
+        remap={p.name: p.stats() for p in palettes},
+    )
+    if compare:
+        sequential = render_sequential(file, scene, themes, quality, backend, media_dir)
+        report["sequential_wall_s"] = sequential["wall_s"]
+        report["sequential_runs"] = sequential["runs"]
+        report["speedup"] = round(sequential["wall_s"] / batch["wall_s"], 2) if batch["wall_s"] else None
+        report["batch_frames_per_s"] = round(len(themes) * batch["timeline_frames"] / batch["wall_s"], 2)
+        report["sequential_frames_per_s"] = round(
+            sum(r["frames"] for r in sequential["runs"].values()) / sequential["wall_s"], 2,
+        )
+    return report
+
+
+def main(argv=None):
+    from parallel_render import QUALITY_FLAGS
+
+    parser = argparse.ArgumentParser(description="Render colorways of a scene in one pass and compare with sequential runs.")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("themes", help="JSON file of theme overrides")
+    parser.add_argument("-q", "--quality", default="h", help="l, m, h, p or k (as in manim -q)")
+    parser.add_argument("--backend", choices=["auto", "ffmpeg", "pyav"], default="auto")
+    parser.add_argument("--media-dir")
+    parser.add_argument("--no-compare", action="store_true", help="skip the sequential baseline renders")
+    args = parser.parse_args(argv)
+
+    quality = next(q for q, v in QUALITY_FLAGS.items() if v == args.quality)
+    report = render_theme_batch(
+        args.file, args.scene, load_themes(args.themes), quality, args.backend, args.media_dir,
+        compare=not args.no_compare,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
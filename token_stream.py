@@ -0,0 +1,204 @@
+# token_stream.py
+# Manim CE 0.19.x compatible
+# Array-backed token stream: closed-form motion, evaluated for the whole stream in one vectorized seek
+
+from manim import VGroup, Sphere, WHITE, TAU
+import numpy as np
+import random
+
+from geometry_cache import GEOMETRY_CACHE
+
+
+def bind_face_points(surfaces, buffer, copy_in=True):
+    """Point every face's `points` of surfaces[i] at its slice of buffer[i] (n, n_points, 3)."""
+    for i, surface in enumerate(surfaces):
+        a = 0
+        for face in surface.submobjects:
+            b = a + len(face.points)
+            if copy_in:
+                buffer[i, a:b] = face.points
+            face.points = buffer[i, a:b]
+            a = b
+
+
+class TokenStream(VGroup):
+    """
+    A row of Sphere tokens flowing along +x with per-token speed/y/z jitter and wrap-around.
+
+    Positions, speeds, phases and jitter amplitudes live in contiguous NumPy arrays.
+    Every token is a copy of ONE shared Sphere template, and the face points of every
+    token are views into a single (n_tokens, n_points, 3) buffer. A frame update is
+    therefore one in-place add on that buffer, independent of the number of Python
+    objects in the stream.
+
+    Motion is closed-form in scene time: the rate is declared ahead of time (start_motion/
+    stop_motion/schedule) and seek(t) moves the stream to any timestamp in O(tokens). Its
+    updater should only call seek(scene.time); the stream is marked `time_driven` so range
+    renderers may skip it while fast-forwarding and seek once (parallel_render).
+
+    Note: Mobject.shift/scale and Transform-style animations replace `points` arrays
+    instead of writing into them. Animate colors (set_fill/set_stroke) freely, but call
+    `rebind_points()` after moving individual tokens by other means.
+    """
+
+    time_driven = True   # state is a function of scene time: updaters only seek()
+
+    def __init__(
+        self,
+        n_tokens,
+        x_start,
+        spacing,
+        x_wrap,
+        total_span,
+        y_base=-0.25,
+        z_base=0.0,
+        radius=0.06,
+        color="#34d399",
+        resolution=(16, 16),
+        rng=None,
+        **kwargs,
+    ):
+        rng = rng if rng is not None else random.Random(42)
+        self.x_wrap = x_wrap
+        self.total_span = total_span
+        self.y_base = y_base
+        self.z_base = z_base
+
+        # Same draw order as the per-token dict version, so a seeded rng gives the same stream
+        radii, start, speed, yjit, zjit, phase = [], [], [], [], [], []
+        for k in range(n_tokens):
+            radii.append(radius * rng.uniform(0.95, 1.05))
+            start.append([
+                x_start - k * spacing,
+                y_base + rng.uniform(-0.01, 0.01),   # tiny y jitter
+                z_base + rng.uniform(-0.02, 0.02),   # tiny z jitter
+            ])
+            speed.append(rng.uniform(1.45, 1.75))    # slight velocity differences
+            yjit.append(rng.uniform(0.002, 0.006))
+            zjit.append(rng.uniform(0.002, 0.006))
+            phase.append(rng.uniform(0, TAU))
+
+        self.radii = np.array(radii, dtype=float)
+        self.positions = np.array(start, dtype=float).reshape(n_tokens, 3)
+        self.speed = np.array(speed, dtype=float)
+        self.yjit = np.array(yjit, dtype=float)
+        self.zjit = np.array(zjit, dtype=float)
+        self.phase = np.array(phase, dtype=float)
+        self._x0 = self.positions[:, 0].copy()
+        self._cos_phase = np.cos(self.phase)
+        self._sin_phase = np.sin(self.phase)
+        self._knots = np.zeros(0)   # rate changes (scene time), see schedule()
+        self._rates = np.zeros(0)
+        self._sums = np.zeros((0, 3))
+        self._t = 0.0               # scene time of the last seek
+
+        # One unit-radius template; tokens are cheap copies of it
+        self.template = GEOMETRY_CACHE.get(
+            Sphere,
+            radius=1.0,
+            resolution=resolution,
+            fill_opacity=1,
+            fill_color=color,
+            stroke_width=0.5,
+            stroke_color=WHITE,
+        )
+        tokens = [self.template.copy() for _ in range(n_tokens)]
+        super().__init__(*tokens, **kwargs)
+
+        unit = np.concatenate([f.points for f in self.template], axis=0)
+        self._buffer = (
+            unit[None, :, :] * self.radii[:, None, None] + self.positions[:, None, :]
+        )
+        self._bind_points(copy_in=False)
+
+    def _bind_points(self, copy_in=True):
+        bind_face_points(self.submobjects, self._buffer, copy_in)
+
+    def rebind_points(self):
+        """Re-attach face points to the buffer after something replaced them."""
+        self._bind_points(copy_in=True)
+        self.positions[:] = [token.get_center() for token in self.submobjects]
+        # the moved tokens become the new origin of the closed-form motion
+        self._x0 += self.positions[:, 0] - self.x_at(self._t)
+        return self
+
+    def __deepcopy__(self, clone_from_id):
+        # ndarray deepcopy does not keep views, so reattach the copy to its own buffer
+        result = super().__deepcopy__(clone_from_id)
+        result._bind_points(copy_in=True)
+        return result
+
+    # ---------- closed-form motion ----------
+    # Speed is rate(t) * speed_i * (1 + 0.04 sin(0.9 t + phase_i)) with a piecewise-constant
+    # rate(t) declared ahead of time (start_motion/stop_motion/schedule). Expanding
+    # cos(0.9 t + phase) = cos(0.9 t) cos(phase) - sin(0.9 t) sin(phase), the distance covered
+    # up to t only needs three scalar prefix sums per rate change, so evaluating the stream at
+    # any scene time is O(tokens) and the schedule costs O(rate changes), not O(frames).
+
+    def schedule(self, times, rates):
+        """Declare the rate from each times[i] until the next; the last rate holds until a later declaration."""
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        rates = np.atleast_1d(np.asarray(rates, dtype=float))
+        knots, old = self._knots, self._rates
+        if len(knots) and times[0] < knots[-1] - 1e-9:
+            raise ValueError(f"TokenStream motion must be declared in time order ({times[0]} < {knots[-1]})")
+        if len(knots) and times[0] <= knots[-1] + 1e-9:
+            knots, old = knots[:-1], old[:-1]   # same instant: the new rate replaces the last one
+        knots = np.concatenate([knots, times])
+        rates = np.concatenate([old, rates])
+        keep = np.concatenate([[True], rates[1:] != rates[:-1]])   # drop knots that don't change the rate
+        self._knots, self._rates = knots[keep], rates[keep]
+
+        # R, C, S at each knot: sums of rate * (b - a), rate * d cos(0.9 t), rate * d sin(0.9 t)
+        k, r = self._knots, self._rates[:-1]
+        self._sums = np.zeros((len(k), 3))
+        self._sums[1:, 0] = np.cumsum(r * np.diff(k))
+        self._sums[1:, 1] = np.cumsum(r * np.diff(np.cos(0.9 * k)))
+        self._sums[1:, 2] = np.cumsum(r * np.diff(np.sin(0.9 * k)))
+        return self
+
+    def start_motion(self, t, rate=1.0):
+        """Declare that the stream moves from scene time t on (until stop_motion)."""
+        return self.schedule([t], [rate])
+
+    def stop_motion(self, t):
+        """Declare that the stream stands still from scene time t on."""
+        return self.schedule([t], [0.0])
+
+    def distance(self, t):
+        """Distance every token has covered by scene time t, as an (n,) array."""
+        i = int(np.searchsorted(self._knots, t, side="right")) - 1
+        if i < 0:
+            return np.zeros(len(self.speed))
+        a, rate = self._knots[i], self._rates[i]
+        R, C, S = self._sums[i]
+        R += rate * (t - a)
+        C += rate * (np.cos(0.9 * t) - np.cos(0.9 * a))
+        S += rate * (np.sin(0.9 * t) - np.sin(0.9 * a))
+        return self.speed * (R - (0.04 / 0.9) * (C * self._cos_phase - S * self._sin_phase))
+
+    def wrap(self, x):
+        """Wrap-around: a token past x_wrap re-enters total_span earlier, however far it went."""
+        over = np.maximum(np.ceil((x - self.x_wrap) / self.total_span), 0.0)
+        return x - over * self.total_span
+
+    def x_at(self, t):
+        """Unwrapped-then-wrapped x of every token at scene time t."""
+        return self.wrap(self._x0 + self.distance(t))
+
+    def positions_at(self, t):
+        """(n, 3) token centers at scene time t, for all tokens at once."""
+        positions = np.empty_like(self.positions)
+        positions[:, 0] = self.x_at(t)
+        # gentle y/z oscillation
+        positions[:, 1] = self.y_base + self.yjit * np.sin(t * 2.0 + self.phase)
+        positions[:, 2] = self.z_base + self.zjit * np.cos(t * 1.7 + self.phase)
+        return positions
+
+    def seek(self, t):
+        """Move every token to where it is at scene time t (one vectorized update)."""
+        new_positions = self.positions_at(t)
+        self._buffer += (new_positions - self.positions)[:, None, :]
+        self.positions[:] = new_positions
+        self._t = t
+        return self
@@ -0,0 +1,304 @@
+# trace_replay.py
+# Manim CE 0.19.x compatible
+# Stream agent-inference JSONL traces into a fixed-size, per-frame timeline for the trace scene
+#
+#   python trace_replay.py synth trace.jsonl --events 5000000
+#   python trace_replay.py summary trace.jsonl --duration 20 --fps 15
+#   AGENT_TRACE=trace.jsonl manim -ql agent_inference_trace.py InceptionTraceReplay3D
+#
+# One event per line, e.g.
+#   {"t": 12.031, "type": "token"}                       (optional "count" for batched tokens)
+#   {"t": 12.5, "type": "pause"}   {"t": 13.9, "type": "resume"}
+#   {"t": 12.6, "type": "tool_call", "tool": "search"}   {"t": 13.7, "type": "tool_result", "tool": "search"}
+
+from datetime import datetime
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import tempfile
+
+import numpy as np
+
+TRACE_CACHE_VERSION = 1
+TIME_KEYS = ("t", "ts", "time", "timestamp")
+KIND_KEYS = ("type", "event", "kind")
+TOOL_KEYS = ("tool", "name")
+KINDS = {
+    "token": "token",
+    "tok": "token",
+    "pause": "pause",
+    "resume": "resume",
+    "tool_call": "tool_call",
+    "call": "tool_call",
+    "tool_result": "tool_result",
+    "result": "tool_result",
+}
+
+
+def _first(ev, keys):
+    for k in keys:
+        if k in ev:
+            return ev[k]
+    return None
+
+
+def _seconds(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    return None
+
+
+def iter_events(path, stats=None):
+    """
+    Yield (t_seconds, kind, tool, count) for every usable line of a JSONL trace.
+    Reads one line at a time; malformed lines and unknown event types are skipped
+    (and counted in stats["skipped"] when a dict is passed).
+    """
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                ev = json.loads(line)
+                t = _seconds(_first(ev, TIME_KEYS))
+                kind = KINDS.get(str(_first(ev, KIND_KEYS)).lower())
+                count = int(ev.get("count", 1))
+            except (ValueError, TypeError, AttributeError):
+                t = kind = None
+            if t is None or kind is None or not math.isfinite(t):
+                if stats is not None:
+                    stats["skipped"] = stats.get("skipped", 0) + 1
+                continue
+            tool = _first(ev, TOOL_KEYS)
+            yield t, kind, (str(tool) if tool is not None else None), count
+
+
+class TraceTimeline:
+    """
+    A trace aggregated onto the scene's time base: one bin per output frame.
+
+    The trace's [first, last] event time is mapped linearly onto [0, duration] scene
+    seconds. Per bin it holds the token count, the fraction of the bin spent paused and
+    tool calls / results per tool. Memory is O(frames x tools), whatever the trace size.
+    Tools beyond `max_tools` distinct names share one "other" slot.
+    """
+
+    def __init__(self, duration, fps, tools, tokens, paused, calls, results, stats):
+        self.duration = duration
+        self.fps = fps
+        self.bin_s = 1.0 / fps
+        self.tools = list(tools)
+        self.tokens = tokens
+        self.paused = paused
+        self.calls = calls
+        self.results = results
+        self.stats = stats
+        mean = tokens[tokens > 0].mean() if np.any(tokens > 0) else 0.0
+        self._token_norm = 1.0 / mean if mean else 0.0
+
+    @property
+    def n_bins(self):
+        return len(self.tokens)
+
+    def bin_at(self, t):
+        return int(min(max(t * self.fps, 0), self.n_bins - 1))
+
+    def token_rate(self, t, cap=4.0):
+        """Token throughput at scene time t relative to the trace's average (0 when idle)."""
+        return min(self.tokens[self.bin_at(t)] * self._token_norm, cap)
+
+    def token_rates(self, cap=4.0):
+        """token_rate of every bin at once, as an (n_bins,) array."""
+        return np.minimum(self.tokens * self._token_norm, cap)
+
+    def paused_at(self, t):
+        return float(self.paused[self.bin_at(t)])
+
+    def frame_events(self, k):
+        """Tool calls and results (each an (n_tools,) array) in output frame k."""
+        k = min(max(k, 0), self.n_bins - 1)
+        return self.calls[k], self.results[k]
+
+    def summary(self):
+        return dict(
+            self.stats,
+            frames=self.n_bins,
+            tools=self.tools,
+            tokens=int(self.tokens.sum()),
+            tool_calls=int(self.calls.sum()),
+            paused_s=round(float(self.paused.sum() * self.bin_s), 3),
+        )
+
+    # ---------- loading ----------
+    @classmethod
+    def from_jsonl(cls, path, duration, fps, max_tools=6, cache=True):
+        path = Path(path)
+        cache_path = _cache_path(path, duration, fps, max_tools) if cache else None
+        if cache_path is not None and cache_path.exists():
+            try:
+                return cls._load(cache_path)
+            except (OSError, KeyError, ValueError):
+                pass
+        timeline = cls._scan(path, duration, fps, max_tools)
+        if cache_path is not None:
+            timeline._store(cache_path)
+        return timeline
+
+    @classmethod
+    def _scan(cls, path, duration, fps, max_tools):
+        # pass 1: time range and tool names (bounded)
+        stats = dict(events=0, skipped=0)
+        t0, t1 = math.inf, -math.inf
+        tools = []
+        overflow = False
+        for t, kind, tool, _ in iter_events(path, stats):
+            stats["events"] += 1
+            t0, t1 = min(t0, t), max(t1, t)
+            if kind in ("tool_call", "tool_result") and tool not in tools:
+                if tool is not None and len(tools) < max_tools:
+                    tools.append(tool)
+                else:
+                    overflow = True
+        if stats["events"] == 0:
+            raise ValueError(f"no usable events in {path}")
+        if overflow or not tools:
+            tools.append("other")
+        slot = {name: i for i, name in enumerate(tools)}
+        other = len(tools) - 1
+
+        # pass 2: accumulate into per-frame bins
+        n_bins = max(int(math.ceil(duration * fps)), 1)
+        span = max(t1 - t0, 1e-9)
+        scale = n_bins / span   # bins per trace second
+        tokens = np.zeros(n_bins, dtype=np.int64)
+        paused = np.zeros(n_bins)
+        calls = np.zeros((n_bins, len(tools)), dtype=np.int64)
+        results = np.zeros((n_bins, len(tools)), dtype=np.int64)
+        pause_start = None
+        for t, kind, tool, count in iter_events(path):
+            x = (t - t0) * scale
+            b = min(int(x), n_bins - 1)
+            if kind == "token":
+                tokens[b] += count
+            elif kind == "tool_call":
+                calls[b, slot.get(tool, other)] += count
+            elif kind == "tool_result":
+                results[b, slot.get(tool, other)] += count
+            elif kind == "pause":
+                if pause_start is None:
+                    pause_start = x
+            elif kind == "resume" and pause_start is not None:
+                _add_interval(paused, pause_start, x)
+                pause_start = None
+        if pause_start is not None:
+            _add_interval(paused, pause_start, n_bins)
+
+        stats.update(trace_start=t0, trace_end=t1, trace_s=round(span, 3), source=str(path))
+        return cls(duration, fps, tools, tokens, paused, calls, results, stats)
+
+    def _store(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp.npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    tokens=self.tokens, paused=self.paused, calls=self.calls, results=self.results,
+                    meta=json.dumps(dict(duration=self.duration, fps=self.fps, tools=self.tools, stats=self.stats)),
+                )
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    @classmethod
+    def _load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(
+                meta["duration"], meta["fps"], meta["tools"],
+                data["tokens"], data["paused"], data["calls"], data["results"], meta["stats"],
+            )
+
+
+def _add_interval(paused, a, b):
+    """Add the covered fraction of each bin for the interval [a, b) (in bin units)."""
+    a, b = max(a, 0.0), min(b, len(paused))
+    i = int(a)
+    while i < b and i < len(paused):
+        paused[i] += min(b, i + 1) - max(a, i)
+        i += 1
+
+
+def _cache_path(path, duration, fps, max_tools):
+    """Binned timelines are cached by file identity (path, size, mtime) and binning."""
+    st = path.stat()
+    key = json.dumps([
+        TRACE_CACHE_VERSION, str(path.resolve()), st.st_size, st.st_mtime_ns,
+        float(duration), float(fps), max_tools,
+    ])
+    cache_dir = Path(os.environ.get(
+        "AGENT_TRACE_CACHE", Path.home() / ".cache" / "agent_inference" / "traces"
+    ))
+    return cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.npz"
+
+
+# ======================= CLI =======================
+def synthesize(path, n_events, tools=("search", "db_query", "code_exec"), seed=0):
+    """Write a synthetic trace: token bursts separated by pause -> tool calls -> results -> resume."""
+    rng = random.Random(seed)
+    t = 0.0
+    written = 0
+    with open(path, "w") as f:
+        while written < n_events:
+            for _ in range(rng.randint(50, 400)):
+                t += rng.expovariate(40.0)
+                f.write(f'{{"t": {t:.6f}, "type": "token"}}\n')
+                written += 1
+            f.write(f'{{"t": {t:.6f}, "type": "pause"}}\n')
+            picked = rng.sample(tools, rng.randint(1, len(tools)))
+            for tool in picked:
+                f.write(f'{{"t": {t + 0.01:.6f}, "type": "tool_call", "tool": "{tool}"}}\n')
+            t += rng.uniform(0.3, 2.0)
+            for tool in picked:
+                f.write(f'{{"t": {t:.6f}, "type": "tool_result", "tool": "{tool}"}}\n')
+            f.write(f'{{"t": {t + 0.01:.6f}, "type": "resume"}}\n')
+            written += 2 + 2 * len(picked)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agent-inference trace tools.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_synth = sub.add_parser("synth", help="write a synthetic JSONL trace")
+    p_synth.add_argument("path")
+    p_synth.add_argument("--events", type=int, default=1_000_000)
+    p_synth.add_argument("--seed", type=int, default=0)
+    p_sum = sub.add_parser("summary", help="bin a trace and print its summary")
+    p_sum.add_argument("path")
+    p_sum.add_argument("--duration", type=float, default=20.0)
+    p_sum.add_argument("--fps", type=float, default=15.0)
+    p_sum.add_argument("--max-tools", type=int, default=6)
+    p_sum.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "synth":
+        print(f"{synthesize(args.path, args.events, seed=args.seed)} events -> {args.path}")
+    else:
+        timeline = TraceTimeline.from_jsonl(
+            args.path, args.duration, args.fps, args.max_tools, cache=not args.no_cache
+        )
+        print(json.dumps(timeline.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()